@@ -0,0 +1,91 @@
+"""
+Compares request latency of the direct database path with the
+in-memory leaderboard cache (LEADERBOARD_CACHE=1).
+
+Both paths are called in-process on a scratch database, so the numbers
+do not include HTTP overhead:
+
+    python3 benchmark_cache.py --players 100000 --requests 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def measure(name, func, nrequests):
+    samples = []
+    for i in range(nrequests):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    print("  %-12s p50 %8.3f ms   p99 %8.3f ms" % (
+        name, percentile(samples, 0.50) * 1000,
+        percentile(samples, 0.99) * 1000))
+
+
+def run(label, page, get, update, nplayers, nrequests):
+    rnd = random.Random(1)
+
+    def player():
+        return "player-%d" % rnd.randrange(nplayers)
+
+    print(label)
+    measure("top page", lambda i: page(0, 20, None), nrequests)
+    measure("deep page", lambda i: page(rnd.randrange(nplayers), 20, None),
+            nrequests)
+    measure("around", lambda i: page(0, 20, player()), nrequests)
+    measure("get player", lambda i: get(player()), nrequests)
+    measure("update",
+            lambda i: update([(player(), rnd.randrange(2 * nplayers))]),
+            nrequests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard cache benchmark")
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="leaderboard-bench-")
+    os.chdir(workdir)
+    os.mkdir("data")
+    from cache import LeaderboardCache
+    from database import SyncStore, page_offset, player_id
+
+    store = SyncStore()
+    store.create_schema()
+    store.upsert([("player-%d" % i, random.randrange(args.players))
+                  for i in range(args.players)])
+
+    run("direct database (%d players)" % args.players,
+        store.page, store.get, store.upsert, args.players, args.requests)
+
+    start = time.perf_counter()
+    cache = LeaderboardCache("./data/scores.journal", store.upsert, player_id)
+    cache.warm_up(store.all_scores())
+    print("cache warm-up: %.2f s" % (time.perf_counter() - start))
+
+    def cache_page(offset, limit, around):
+        # like get_all_players()
+        if around is not None:
+            offset = page_offset(cache.position(around), limit)
+        return cache.page(offset, limit)
+
+    run("in-memory cache (%d players)" % args.players,
+        cache_page, cache.get, cache.update, args.players, args.requests)
+    cache.close()
+    print("data left in %s" % workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Concurrency benchmark of the sync and async database modes.
+
+For each mode a local server is started with uvicorn on a scratch
+database, seeded with players, and then hit by many simultaneous
+clients (see loadtest.py):
+
+    python3 benchmark_concurrency.py --clients 128 --mode mixed
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from loadtest import print_report, run_load
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def wait_for_server(url, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + "/api/leaderboard?limit=1").read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server at %s did not start" % url)
+
+
+def bench_mode(db_mode, args, port):
+    workdir = tempfile.mkdtemp(prefix="leaderboard-%s-" % db_mode)
+    os.mkdir(os.path.join(workdir, "data"))
+    env = dict(os.environ, LEADERBOARD_DB_MODE=db_mode)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", HERE,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env)
+    url = "http://127.0.0.1:%d" % port
+    try:
+        wait_for_server(url)
+        # seed the players table
+        run_load(url, "batch", 1, args.players // 50 + 1, 50, args.players)
+        report = run_load(url, args.mode, args.clients, args.requests,
+                          players=args.players)
+        print("== LEADERBOARD_DB_MODE=%s" % db_mode)
+        print_report(report)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Leaderboard concurrency benchmark")
+    parser.add_argument("--mode", choices=("single", "read", "mixed"),
+                        default="mixed")
+    parser.add_argument("--clients", type=int, default=128)
+    parser.add_argument("--requests", type=int, default=50,
+                        help="requests per client")
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for i, db_mode in enumerate(("sync", "async")):
+        bench_mode(db_mode, args, args.port + i)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardCache:
+    """
+    An in-memory leaderboard kept sorted by score.
+
+    Reads (a page, a player, a rank) never touch the database and cost
+    O(log n). Writes update the index at once, are appended to a journal
+    file and are written to the database in batches by flush(), which
+    run_flusher() calls periodically from a background thread.
+
+    The journal makes this crash-safe: every accepted write is in the
+    journal before the request returns, and the journal is only removed
+    once its scores have been committed to the database. Anything left
+    over is replayed by warm_up() on the next start.
+    """
+
+    def __init__(self, journal_path: str, persist: Callable,
+                 player_id: Callable):
+        # persist(list of (player, score)) writes scores to the database
+        # in one transaction, player_id(name) returns the primary key.
+        self.journal_path = journal_path
+        self.persist = persist
+        self.player_id = player_id
+        self.lock = threading.RLock()
+        # id -> (name, score)
+        self.players = {}
+        # (-score, id), so that iteration gives the best score first and
+        # ties are ordered by id like the database index
+        self.order = SortedList()
+        # id -> (name, score) not yet in the database
+        self.dirty = {}
+        self.journal = None
+        self.stop_event = threading.Event()
+        self.flusher = None
+
+    #
+    # startup / shutdown
+    #
+
+    def warm_up(self, rows: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        Loads (id, name, score) rows from the database, then replays
+        journals left over by a previous run and persists them. If the
+        database fails, the replayed scores are left to the flusher.
+        """
+
+        with self.lock:
+            players = {key: (name, score) for key, name, score in rows}
+            self.players = players
+            self.order = SortedList(
+                (-score, key) for key, (_, score) in players.items())
+            for path in (self.journal_path + ".flushing", self.journal_path):
+                if os.path.exists(path):
+                    for player, score in self._read_journal(path):
+                        self._set(player, score)
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("leaderboard flush failed at startup")
+
+    def run_flusher(self, interval: float) -> None:
+        def loop():
+            while not self.stop_event.wait(interval):
+                try:
+                    self.flush()
+                except Exception:
+                    # the scores are still pending, try again next time
+                    logger.exception("leaderboard flush failed")
+
+        self.flusher = threading.Thread(
+            target=loop, name="leaderboard-flusher", daemon=True)
+        self.flusher.start()
+
+    def close(self) -> None:
+        self.stop_event.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        self.flush()
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+    #
+    # writes
+    #
+
+    def update(self, scores: Iterable[Tuple[str, int]]) -> None:
+        """
+        Raises the score of many (player, score) pairs.
+        A score never goes down.
+        """
+
+        with self.lock:
+            lines = []
+            for player, score in scores:
+                if self._set(player, score):
+                    lines.append(json.dumps(
+                        {"player": player, "score": score}) + "\n")
+            if lines:
+                self.journal.write("".join(lines))
+                self.journal.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the pending scores to the database in one batch.
+        """
+
+        with self.lock:
+            if not self.dirty:
+                return
+            dirty, self.dirty = self.dirty, {}
+            if os.path.exists(self.journal_path + ".flushing"):
+                # left over by a crash during a flush, keep its scores
+                self._merge_journal()
+            # rotate the journal, new writes go to a fresh file
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self.journal.close()
+            os.replace(self.journal_path, self.journal_path + ".flushing")
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+        try:
+            self.persist(list(dirty.values()))
+        except Exception:
+            # keep the scores pending (newer ones win) and the
+            # rotated journal, the next flush will try again
+            with self.lock:
+                for key, (name, score) in dirty.items():
+                    if key not in self.dirty:
+                        self.dirty[key] = (name, score)
+                self._merge_journal()
+            raise
+        with self.lock:
+            os.remove(self.journal_path + ".flushing")
+
+    def _set(self, player: str, score: int) -> bool:
+        key = self.player_id(player)
+        old = self.players.get(key)
+        if old is not None:
+            if old[1] >= score:
+                return False
+            self.order.remove((-old[1], key))
+        self.players[key] = (player, score)
+        self.order.add((-score, key))
+        self.dirty[key] = (player, score)
+        return True
+
+    def _read_journal(self, path: str) -> List[Tuple[str, int]]:
+        scores = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # a torn last line from a crash
+                    continue
+                scores.append((entry["player"], entry["score"]))
+        return scores
+
+    def _merge_journal(self) -> None:
+        # put the rotated journal back in front of the current one
+        flushing = self.journal_path + ".flushing"
+        self.journal.close()
+        with open(flushing, "a", encoding="utf-8") as f:
+            with open(self.journal_path, encoding="utf-8") as current:
+                f.write(current.read())
+        os.replace(flushing, self.journal_path)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+
+    #
+    # reads
+    #
+
+    def get(self, player: str) -> Optional[int]:
+        with self.lock:
+            found = self.players.get(self.player_id(player))
+        return None if found is None else found[1]
+
+    def rank(self, score: int) -> int:
+        # competition rank: 1 + number of better scores
+        return 1 + self.order.bisect_left((-score, ""))
+
+    def position(self, player: str) -> Optional[int]:
+        with self.lock:
+            key = self.player_id(player)
+            found = self.players.get(key)
+            if found is None:
+                return None
+            return self.order.index((-found[1], key))
+
+    def page(self, offset: int, limit: int) -> List[Tuple[str, int, int, int]]:
+        """
+        Returns (name, score, rank, position) rows, best score first.
+        """
+
+        with self.lock:
+            rows = []
+            rank = prev_score = None
+            entries = self.order.islice(offset, offset + limit)
+            for i, (neg_score, key) in enumerate(entries):
+                score = -neg_score
+                if rank is None or score < prev_score:
+                    rank = self.rank(score)
+                prev_score = score
+                rows.append((self.players[key][0], score, rank, offset + i))
+            return rows
@@ -0,0 +1,279 @@
+"""
+Database access for the leaderboard server.
+
+Two interchangeable stores are provided:
+
+* SyncStore uses blocking SQLAlchemy sessions. The server runs its
+  methods in the worker threadpool.
+* AsyncStore uses the SQLAlchemy asyncio extension with aiosqlite, so a
+  request waiting on disk does not hold a worker thread.
+
+Both share the same statements and open SQLite in WAL mode, so readers
+do not wait for the single writer.
+"""
+
+import hashlib
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, Index, Integer, String, create_engine, event, func, select)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+# Source https://fastapi.tiangolo.com/tutorial/sql-databases/?h=sql
+DATABASE_PATH = "./data/sql_app.db"
+
+# Connection pool, tuned with LEADERBOARD_POOL_SIZE / LEADERBOARD_POOL_OVERFLOW
+POOL_SIZE = int(os.environ.get("LEADERBOARD_POOL_SIZE", "10"))
+POOL_OVERFLOW = int(os.environ.get("LEADERBOARD_POOL_OVERFLOW", "20"))
+
+# Used as the database root
+Base = declarative_base()
+
+
+# Player scores table
+class PlayerTable(Base):
+    """
+    A SQL table to hold player scores
+    """
+
+    __tablename__ = "players"
+
+    id = Column(String, primary_key=True, index=True)
+    name = Column(String)
+    score = Column(Integer)
+
+    # Leaderboard pages and ranks are read from this index, in the same
+    # order as they are shown: best score first, ties by id.
+    __table_args__ = (Index("ix_players_score_id", score.desc(), id),)
+
+
+def player_id(name: str) -> str:
+    """
+    Returns a "unique" key given a player name.
+    This should deal with chinese characters.
+    """
+
+    # Source https://docs.python.org/3/library/hashlib.html
+    m = hashlib.sha256()
+    m.update(name.encode("utf-8"))
+    return m.hexdigest()
+
+
+def enable_wal(engine) -> None:
+    """
+    Switches every new SQLite connection of a (sync) engine to WAL mode.
+    """
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # with WAL, NORMAL only risks the last transactions on power loss
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+
+#
+# statements shared by both stores
+#
+
+# SQLite allows at most 32766 bound parameters per statement
+# (999 before 3.32), each row uses 3 of them.
+UPSERT_CHUNK_SIZE = 300
+
+
+def upsert_statements(scores) -> Iterator:
+    """
+    Yields INSERT ... ON CONFLICT DO UPDATE statements that insert or
+    raise the score of many (player, score) pairs. A stored score never
+    goes down.
+    """
+
+    # Keep only the best score per player, a single statement may not
+    # touch the same row twice.
+    best = {}
+    for player, score in scores:
+        if player not in best or best[player] < score:
+            best[player] = score
+
+    rows = [{"id": player_id(player), "name": player, "score": score}
+            for player, score in best.items()]
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = sqlite_insert(PlayerTable).values(rows[i:i + UPSERT_CHUNK_SIZE])
+        yield stmt.on_conflict_do_update(
+            index_elements=[PlayerTable.id],
+            set_={"score": func.max(PlayerTable.score, stmt.excluded.score)},
+        )
+
+
+def player_statement(player: str):
+    return select(PlayerTable.name, PlayerTable.score).where(
+        PlayerTable.id == player_id(player))
+
+
+def count_better_statement(score: int):
+    # number of players ranked above a score
+    return select(func.count(PlayerTable.id)).where(PlayerTable.score > score)
+
+
+def count_tied_before_statement(score: int, key: str):
+    # number of players with the same score ordered before key
+    return select(func.count(PlayerTable.id)).where(
+        PlayerTable.score == score, PlayerTable.id < key)
+
+
+def page_statement(offset: int, limit: int):
+    return (select(PlayerTable.name, PlayerTable.score)
+            .order_by(PlayerTable.score.desc(), PlayerTable.id)
+            .offset(offset)
+            .limit(limit))
+
+
+def rank_rows(rows, offset: int,
+              first_rank: int) -> List[Tuple[str, int, int, int]]:
+    """
+    Turns (name, score) rows of a page into (name, score, rank, position)
+    rows. Players with the same score share the same rank.
+    """
+
+    response = []
+    rank = prev_score = None
+    for i, (name, score) in enumerate(rows):
+        if rank is None:
+            rank = first_rank
+        elif score < prev_score:
+            rank = offset + i + 1
+        prev_score = score
+        response.append((name, score, rank, offset + i))
+    return response
+
+
+def page_offset(position: int, limit: int) -> int:
+    # the offset of a page centered on position
+    return max(0, position - limit // 2)
+
+
+# ************************************************************************
+# * Blocking store
+# ************************************************************************
+
+class SyncStore:
+    def __init__(self, path: str = DATABASE_PATH):
+        self.engine = create_engine(
+            "sqlite:///" + path,
+            connect_args={"check_same_thread": False},
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_OVERFLOW,
+        )
+        enable_wal(self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False,
+                                    bind=self.engine)
+
+    def create_schema(self) -> None:
+        Base.metadata.create_all(bind=self.engine)
+        # create_all() skips tables that exist already, so add indexes
+        # that were introduced later to existing databases too.
+        for index in PlayerTable.__table__.indexes:
+            index.create(bind=self.engine, checkfirst=True)
+
+    def upsert(self, scores) -> None:
+        """
+        Writes many (player, score) pairs in a single transaction.
+        """
+
+        with self.Session() as db:
+            for stmt in upsert_statements(scores):
+                db.execute(stmt)
+            db.commit()
+
+    def get(self, player: str) -> Optional[Tuple[str, int]]:
+        with self.Session() as db:
+            return db.execute(player_statement(player)).first()
+
+    def page(self, offset: int, limit: int, around: Optional[str] = None
+             ) -> Optional[List[Tuple[str, int, int, int]]]:
+        """
+        Returns a page of (name, score, rank, position) rows, best score
+        first, or None if the around player does not exist.
+        """
+
+        with self.Session() as db:
+            if around is not None:
+                found = db.execute(player_statement(around)).first()
+                if not found:
+                    return None
+                position = db.execute(
+                    count_better_statement(found.score)).scalar()
+                position += db.execute(
+                    count_tied_before_statement(
+                        found.score, player_id(around))).scalar()
+                offset = page_offset(position, limit)
+            rows = db.execute(page_statement(offset, limit)).all()
+            if not rows:
+                return []
+            first_rank = 1 + db.execute(
+                count_better_statement(rows[0].score)).scalar()
+            return rank_rows(rows, offset, first_rank)
+
+    def all_scores(self) -> Iterator[Tuple[str, str, int]]:
+        # (id, name, score) for every player, used to warm up the cache
+        with self.Session() as db:
+            stmt = select(PlayerTable.id, PlayerTable.name, PlayerTable.score)
+            for row in db.execute(stmt.execution_options(yield_per=10000)):
+                yield tuple(row)
+
+
+# ************************************************************************
+# * Asyncio store
+# ************************************************************************
+
+class AsyncStore:
+    def __init__(self, path: str = DATABASE_PATH):
+        # imported here, so that the sync mode does not need aiosqlite
+        from sqlalchemy.ext.asyncio import (
+            async_sessionmaker, create_async_engine)
+
+        self.engine = create_async_engine(
+            "sqlite+aiosqlite:///" + path,
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_OVERFLOW,
+        )
+        enable_wal(self.engine.sync_engine)
+        self.Session = async_sessionmaker(self.engine, autoflush=False,
+                                          expire_on_commit=False)
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    async def upsert(self, scores) -> None:
+        async with self.Session() as db:
+            for stmt in upsert_statements(scores):
+                await db.execute(stmt)
+            await db.commit()
+
+    async def get(self, player: str) -> Optional[Tuple[str, int]]:
+        async with self.Session() as db:
+            return (await db.execute(player_statement(player))).first()
+
+    async def page(self, offset: int, limit: int, around: Optional[str] = None
+                   ) -> Optional[List[Tuple[str, int, int, int]]]:
+        async with self.Session() as db:
+            if around is not None:
+                found = (await db.execute(player_statement(around))).first()
+                if not found:
+                    return None
+                position = (await db.execute(
+                    count_better_statement(found.score))).scalar()
+                position += (await db.execute(
+                    count_tied_before_statement(
+                        found.score, player_id(around)))).scalar()
+                offset = page_offset(position, limit)
+            rows = (await db.execute(page_statement(offset, limit))).all()
+            if not rows:
+                return []
+            first_rank = 1 + (await db.execute(
+                count_better_statement(rows[0].score))).scalar()
+            return rank_rows(rows, offset, first_rank)
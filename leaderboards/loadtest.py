@@ -0,0 +1,134 @@
+"""
+A small load test for the leaderboard server.
+
+Start a server on the SQLite file in ./data/ first, for example:
+
+    python3 -m uvicorn main:app --host 127.0.0.1 --port 8000
+
+then run:
+
+    python3 loadtest.py --url http://127.0.0.1:8000 --mode single
+    python3 loadtest.py --url http://127.0.0.1:8000 --mode batch
+
+"single" sends one PUT /api/leaderboard/{player} per score, which is what
+a game client does for every move. "batch" sends the same scores through
+PUT /api/leaderboard/batch. Running "single" against an older server
+gives the "before" numbers. "read" only fetches leaderboard pages, and
+"mixed" sends one score update for every four page reads.
+
+Only the standard library is used, so this can run from any Python 3.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+
+
+def run_client(url, mode, nrequests, batch_size, players, client_id, results):
+    parts = urllib.parse.urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    headers = {"Content-Type": "application/json"}
+    errors = 0
+    latencies = []
+    for i in range(nrequests):
+        player = "loadtest-%d" % ((client_id * nrequests + i) % players)
+        method = "PUT"
+        body = None
+        if mode == "single" or (mode == "mixed" and i % 5 == 0):
+            path = "/api/leaderboard/%s" % urllib.parse.quote(player)
+            body = {"score": i}
+        elif mode == "batch":
+            path = "/api/leaderboard/batch"
+            body = {"scores": [
+                {"player": "loadtest-%d" % (
+                    (client_id * batch_size + j) % players),
+                 "score": i}
+                for j in range(batch_size)
+            ]}
+        else:
+            # reads: a leaderboard page, or the page around a player
+            method = "GET"
+            if i % 2:
+                path = "/api/leaderboard?offset=%d" % (i * 20 % players)
+            else:
+                path = "/api/leaderboard?around=%s" % \
+                    urllib.parse.quote(player)
+        start = time.perf_counter()
+        conn.request(method, path, headers=headers,
+                     body=None if body is None else json.dumps(body))
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status not in (200, 204, 404):
+            errors += 1
+    conn.close()
+    results[client_id] = (latencies, errors)
+
+
+def run_load(url, mode, clients, nrequests, batch_size=50, players=1000):
+    """
+    Runs clients simultaneous connections and returns a report dict.
+    """
+
+    results = {}
+    threads = [
+        threading.Thread(target=run_client, args=(
+            url, mode, nrequests, batch_size, players, i, results))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(x for lat, _ in results.values() for x in lat)
+    count = len(latencies)
+    return {
+        "mode": mode,
+        "clients": clients,
+        "requests": count,
+        "errors": sum(e for _, e in results.values()),
+        "elapsed": elapsed,
+        "scores": count * (batch_size if mode == "batch" else 1),
+        "p50": latencies[count // 2] if latencies else 0.0,
+        "p99": latencies[int(count * 0.99)] if latencies else 0.0,
+    }
+
+
+def print_report(report):
+    print("mode:          %s (%d clients)" % (
+        report["mode"], report["clients"]))
+    print("requests:      %d (%d errors)" % (
+        report["requests"], report["errors"]))
+    print("elapsed:       %.2f s" % report["elapsed"])
+    print("requests/sec:  %.1f" % (report["requests"] / report["elapsed"]))
+    if report["mode"] in ("single", "batch"):
+        print("scores/sec:    %.1f" % (report["scores"] / report["elapsed"]))
+    print("p50 latency:   %.2f ms" % (report["p50"] * 1000))
+    print("p99 latency:   %.2f ms" % (report["p99"] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Leaderboard server load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mode", choices=("single", "batch", "read", "mixed"),
+                        default="single")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200,
+                        help="requests per client")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--players", type=int, default=1000)
+    args = parser.parse_args()
+
+    print_report(run_load(args.url, args.mode, args.clients, args.requests,
+                          args.batch_size, args.players))
+
+
+if __name__ == "__main__":
+    main()
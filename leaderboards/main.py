@@ -1,35 +1,16 @@
-from typing import Union, Optional, List
-import hashlib
-from fastapi import FastAPI, Depends, Body
-from pydantic import BaseModel
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import sessionmaker, Session
-
-# Source https://fastapi.tiangolo.com/tutorial/sql-databases/?h=sql
-SQLALCHEMY_DATABASE_URL = "sqlite:///./data/sql_app.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+import os
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
-# Used as the database root
-Base = declarative_base()
+from cache import LeaderboardCache
 
+from database import AsyncStore, SyncStore, page_offset, player_id
 
-# Player scores table
-class PlayerTable(Base):
-    """
-    A SQL table to hold player scores
-    """
+from fastapi import Body, FastAPI, HTTPException, Query
 
-    __tablename__ = "players"
+from pydantic import BaseModel
 
-    id = Column(String, primary_key=True, index=True)
-    name = Column(String)
-    score = Column(Integer)
+from starlette.concurrency import run_in_threadpool
 
 
 class PlayerScore(BaseModel):
@@ -41,6 +22,17 @@ class PlayerScore(BaseModel):
     score: int
 
 
+class RankedPlayerScore(PlayerScore):
+    """
+    A leaderboard row, rank 1 is the best score.
+    Equal scores share a rank, position is the 0-based index of the
+    row in the leaderboard order (usable as an offset).
+    """
+
+    rank: int
+    position: int
+
+
 class UpdateScoreBody(BaseModel):
     """
     A body to be sent when updating some player's score
@@ -49,79 +41,145 @@ class UpdateScoreBody(BaseModel):
     score: int
 
 
-Base.metadata.create_all(bind=engine)
+class BatchUpdateBody(BaseModel):
+    """
+    A body to be sent when updating the scores of many players at once
+    """
+
+    scores: List[PlayerScore]
+
 
+# Leaderboard page sizes
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
-# The server we will be running
-app = FastAPI()
+# LEADERBOARD_DB_MODE=async serves requests through aiosqlite, the
+# default "sync" mode runs blocking sessions in the threadpool.
+DB_MODE = os.environ.get("LEADERBOARD_DB_MODE", "sync")
+
+# The blocking store always exists: it creates the schema and is used
+# by the cache for warm-up and write-behind.
+sync_store = SyncStore()
+sync_store.create_schema()
+async_store: Optional[AsyncStore] = None
 
+# Optional in-memory leaderboard with write-behind to the database,
+# enabled with LEADERBOARD_CACHE=1 (see cache.py)
+CACHE_JOURNAL_PATH = "./data/scores.journal"
+cache: Optional[LeaderboardCache] = None
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
 
+def persist_scores(scores) -> None:
+    """
+    Writes (player, score) pairs to the database, used by the cache.
+    """
+
+    sync_store.upsert(scores)
 
 
-def player_id(name: str) -> str:
+async def db_call(name: str, *args):
     """
-    Returns a "unique" key given a player name.
-    This should deal with chinese characters.
+    Calls a store method without blocking the event loop.
     """
-    
-    # Source https://docs.python.org/3/library/hashlib.html
-    m = hashlib.sha256()
-    m.update(name.encode("utf-8"))
-    return m.hexdigest()
+
+    if async_store is not None:
+        return await getattr(async_store, name)(*args)
+    return await run_in_threadpool(getattr(sync_store, name), *args)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global async_store, cache
+    if DB_MODE == "async":
+        async_store = AsyncStore()
+    if os.environ.get("LEADERBOARD_CACHE", "0") == "1":
+        cache = LeaderboardCache(CACHE_JOURNAL_PATH, persist_scores, player_id)
+        cache.warm_up(sync_store.all_scores())
+        cache.run_flusher(
+            float(os.environ.get("LEADERBOARD_FLUSH_INTERVAL", "2")))
+    yield
+    if cache is not None:
+        cache.close()
+        cache = None
+    if async_store is not None:
+        await async_store.close()
+        async_store = None
+
+
+# The server we will be running
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/api/leaderboard")
-def get_all_players(db: Session = Depends(get_db)) -> List[PlayerScore]:
+async def get_all_players(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    around: Optional[str] = None,
+) -> List[RankedPlayerScore]:
     """
-    Returns score for all players.
+    Returns one page of the leaderboard, best score first.
+    With ?around=<player> the page is centered on that player.
     """
-    all_players = db.query(PlayerTable).all()
-    response = []
-    for player in all_players:
-        response.append(PlayerScore(player=player.name, score=player.score))
-    return response
+
+    if cache is not None:
+        rows = None
+        if around is not None:
+            position = cache.position(around)
+            if position is not None:
+                rows = cache.page(page_offset(position, limit), limit)
+        else:
+            rows = cache.page(offset, limit)
+    else:
+        rows = await db_call("page", offset, limit, around)
+    if rows is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return [RankedPlayerScore(player=name, score=score, rank=rank,
+                              position=position)
+            for name, score, rank, position in rows]
 
 
 @app.get("/api/leaderboard/{player}")
-def get_player(player: str, db: Session = Depends(get_db)) -> Optional[PlayerScore]:
+async def get_player(player: str) -> Optional[PlayerScore]:
     """
     Returns score for some specific player
     """
 
-    key = player_id(player)
-    found = db.query(PlayerTable).filter(PlayerTable.id == key).first()
+    if cache is not None:
+        return PlayerScore(player=player, score=cache.get(player) or 0)
+
+    found = await db_call("get", player)
     if found:
         return PlayerScore(player=found.name, score=found.score)
     else:
         return PlayerScore(player=player, score=0)
 
 
+# Must be declared before "/api/leaderboard/{player}" which would
+# otherwise match it.
+@app.put("/api/leaderboard/batch")
+async def update_players(body: BatchUpdateBody = Body(...)) -> None:
+    """
+    Updates scores for many players in a single transaction
+    """
+
+    scores = [(s.player, s.score) for s in body.scores]
+    if cache is not None:
+        cache.update(scores)
+    else:
+        await db_call("upsert", scores)
+
+
 @app.put("/api/leaderboard/{player}")
-def update_player(player: str, body: UpdateScoreBody = Body(...), db: Session = Depends(get_db)) -> None:
+async def update_player(player: str,
+                        body: UpdateScoreBody = Body(...)) -> None:
     """
     Updates score for some specific player
     """
 
     # TODO: How do we deal with verification that the request came from the correct player?
 
-    key = player_id(player)
-    found = db.query(PlayerTable).filter(PlayerTable.id == key).first()
-    
-    # Player is not in the database and we must create it
-    if not found:
-        new_player = PlayerTable(id=key, name=player, score=body.score)
-        db.add(new_player)
-        db.commit()
-    
-    # Only update if the new score is higher
-    elif found.score < body.score:
-        setattr(found, 'score', body.score)
-        db.commit()
+    # Only updates if the new score is higher
+    if cache is not None:
+        cache.update([(player, body.score)])
+    else:
+        await db_call("upsert", [(player, body.score)])
@@ -6,4 +6,10 @@ cd /server
 
 . ./venv/bin/activate
 
+# Database access mode: "sync" (blocking sessions in the threadpool) or
+# "async" (aiosqlite on the event loop).
+export LEADERBOARD_DB_MODE="${LEADERBOARD_DB_MODE:-sync}"
+# Set to 1 for the in-memory leaderboard with write-behind (see cache.py)
+export LEADERBOARD_CACHE="${LEADERBOARD_CACHE:-0}"
+
 python3 -m uvicorn main:app --reload --host "0.0.0.0" --port 80
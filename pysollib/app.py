@@ -33,10 +33,14 @@ from pysollib.actions import PysolMenubar
 from pysollib.actions import PysolToolbar
 from pysollib.app_stat_result import GameStatResult
 from pysollib.app_statistics import Statistics
+from pysollib.app_statstore import StatisticsStore
 from pysollib.cardsetparser import read_cardset_config
+from pysollib.filecache import FileCache
 from pysollib.gamedb import GAME_DB, GI, loadGame
 from pysollib.help import destroy_help_html, help_about
+from pysollib.hint import solution_cache
 from pysollib.images import Images, SubsampledImages
+from pysollib.leaderboard import LeaderboardUploader
 from pysollib.mfxutil import Struct, destruct
 from pysollib.mfxutil import USE_PIL
 from pysollib.mfxutil import getprefdir, getusername
@@ -133,6 +137,7 @@ class Application:
             config=config,
             plugins=os.path.join(config, "plugins"),
             savegames=os.path.join(config, "savegames"),
+            cache=os.path.join(config, "cache"),
             maint=os.path.join(config, "maint"),          # debug
         )
         for k, v in self.dn.__dict__.items():
@@ -145,14 +150,24 @@ class Application:
             opt=os.path.join(self.dn.config, "options.dat"),
             opt_cfg=os.path.join(self.dn.config, "options.cfg"),
             stats=os.path.join(self.dn.config, "statistics.dat"),
+            stats_db=os.path.join(self.dn.config, "statistics.db"),
             holdgame=os.path.join(self.dn.config, "holdgame.dat"),
             comments=os.path.join(self.dn.config, "comments.dat"),
+            solutions=os.path.join(self.dn.cache, "solutions.json"),
         )
         for k, v in self.dn.__dict__.items():
             if os.name == "nt":
                 v = os.path.normcase(v)
             v = os.path.normpath(v)
             self.fn.__dict__[k] = v
+        # the results of the solvers (see Base_Solver_Hint)
+        solution_cache.filename = self.fn.solutions
+        # the resized cardset images (see Images.resize)
+        self.scaled_images_cache = None
+        if USE_PIL and TOOLKIT != 'kivy':
+            self.scaled_images_cache = FileCache(
+                os.path.join(self.dn.cache, "scaled"), 128 * 1024 * 1024,
+                ".rgba")
         # random generators
         self.gamerandom = PysolRandom()
         self.miscrandom = PysolRandom()
@@ -179,6 +194,8 @@ class Application:
             deal=None,
         )
         self.demo_counter = 0
+        # background leaderboard score uploads
+        self.leaderboard = LeaderboardUploader()
 
     # the PySol mainloop
     def mainloop(self):
@@ -292,6 +309,18 @@ class Application:
             except Exception:
                 traceback.print_exc()
                 pass
+            # save the results of the solvers
+            try:
+                solution_cache.save()
+            except Exception:
+                traceback.print_exc()
+                pass
+            # send pending leaderboard scores
+            try:
+                self.leaderboard.close()
+            except Exception:
+                traceback.print_exc()
+                pass
             # shut down audio
             try:
                 self.audio.destroy()
@@ -709,6 +738,7 @@ class Application:
                                         images=self.progress_images)
         images = Images(self.dataloader, cs)
         images.cardset_bottoms = self.opt.use_cardset_bottoms
+        images.scaled_cache = self.scaled_images_cache
         try:
             if not images.load(app=self, progress=progress):
                 raise Exception("Invalid or damaged cardset")
@@ -925,13 +955,22 @@ class Application:
         self.opt.setConstants()
 
     def loadStatistics(self):
-        if not os.path.exists(self.fn.stats):
-            return
-        stats = unpickle(self.fn.stats)
-        if stats:
-            # print "loaded:", stats.__dict__
-            self.stats.__dict__.update(stats.__dict__)
+        if StatisticsStore.isAvailable():
+            store = StatisticsStore(self.fn.stats_db)
+            if not store.isImported() and os.path.exists(self.fn.stats):
+                # one-time migration, statistics.dat is left as it is
+                stats = unpickle(self.fn.stats)
+                if stats:
+                    store.importStatistics(stats)
+            self.stats.setStore(store)
+        elif os.path.exists(self.fn.stats):
+            stats = unpickle(self.fn.stats)
+            if stats:
+                # print "loaded:", stats.__dict__
+                self.stats.__dict__.update(stats.__dict__)
         # start a new session
+        self.stats.indexes = {}
+        self.stats.gamelogs = {}
         self.stats.session_games = {}
         self.stats.session_balance = {}
         self.stats.gameid_balance = 0
@@ -945,7 +984,13 @@ class Application:
         self.opt.save(self.fn.opt_cfg)
 
     def saveStatistics(self):
-        self.__saveObject(self.stats, self.fn.stats)
+        if self.stats.store:
+            # the games are saved when they end, see Statistics
+            self.stats.version_tuple = VERSION_TUPLE
+            self.stats.saved += 1
+            self.stats.save()
+        else:
+            self.__saveObject(self.stats, self.fn.stats)
 
     #
     # access games database
@@ -965,70 +1010,28 @@ class Application:
 
     ##
     def getGamesIdSortedByPlayed(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return wa+la
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self._getGamesIdSortedByStats(player, 'played')
 
     def getGamesIdSortedByWon(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return wa
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self._getGamesIdSortedByStats(player, 'won')
 
     def getGamesIdSortedByLost(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return la
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self._getGamesIdSortedByStats(player, 'lost')
 
     def getGamesIdSortedByPercent(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return float(wa)/(1 if wa+la == 0 else wa+la)
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self._getGamesIdSortedByStats(player, 'percent')
 
     def getGamesIdSortedByPlayingTime(self, player=''):
-        if player == '':
-            player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return ta
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self._getGamesIdSortedByStats(player, 'time')
 
     def getGamesIdSortedByMoves(self, player=''):
+        return self._getGamesIdSortedByStats(player, 'moves')
+
+    def _getGamesIdSortedByStats(self, player, sort_by):
         if player == '':
             player = self.opt.player
-
-        def _key(a):
-            wa, la, ta, ma = self.stats.getFullStats(player, a)
-            return ma
-        games = list(self.gdb.getGamesIdSortedByName())
-        games.sort(key=_key)
-        return games[::-1]
+        return self.stats.getGamesIdSorted(
+            player, sort_by, self.gdb.getGamesIdSortedByName())
 
     def getGameInfo(self, id):
         return self.gdb.get(id)
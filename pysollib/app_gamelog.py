@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import calendar
+import time
+from array import array
+from bisect import bisect_right
+from itertools import compress
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# ************************************************************************
+# * The log of finished games of a player (Statistics.prev_games) as
+# * columns, for the progression graph:
+# *
+# *   gameid      game id
+# *   status      0 lost, 1 won, 2 perfect
+# *   start_time  time.time() when the game was started
+# *   elapsed     playing time in seconds
+# *   score       game score or NaN
+# *
+# * The log tuples have several lengths (older versions wrote less
+# * fields), the first five fields are always there.
+# ************************************************************************
+
+NO_SCORE = float('nan')
+
+
+class GameLog:
+    def __init__(self):
+        self.gameid = array('l')
+        self.status = array('b')
+        self.start_time = array('d')
+        self.elapsed = array('d')
+        self.score = array('d')
+
+    @classmethod
+    def fromLogs(cls, logs):
+        # logs: a list of log tuples, see Statistics.updateStats
+        gamelog = cls()
+        for log in logs:
+            gamelog.append(log)
+        return gamelog
+
+    @classmethod
+    def fromRows(cls, rows):
+        # rows: (gameid, status, start_time, elapsed, score)
+        gamelog = cls()
+        for row in rows:
+            gamelog.appendRow(*row)
+        return gamelog
+
+    def __len__(self):
+        return len(self.gameid)
+
+    def append(self, log):
+        if not isinstance(log, tuple) or len(log) < 5 or \
+                not isinstance(log[0], int):
+            return
+        score = log[6] if len(log) > 6 else None
+        self.appendRow(log[0], log[2], log[3], log[4], score)
+
+    def appendRow(self, gameid, status, start_time, elapsed, score):
+        self.gameid.append(gameid)
+        self.status.append(status)
+        self.start_time.append(start_time)
+        self.elapsed.append(elapsed or 0)
+        self.score.append(NO_SCORE if score is None else score)
+
+    #
+    # group by day
+    #
+
+    def getDailyResults(self, gameid=None):
+        # returned {(year, month, day): [played, won]} of all games or
+        # of the games with gameid
+        if not len(self):
+            return {}
+        if numpy is not None:
+            days, played, won = self._countDaysNumpy(gameid)
+        else:
+            days, played, won = self._countDays(gameid)
+        results = {}
+        for i, day in enumerate(days):
+            if played[i]:
+                results[day] = [int(played[i]), int(won[i])]
+        return results
+
+    def _getMidnights(self):
+        # the local midnights and the days from the first month with a
+        # game to the last one; time.mktime() is only called per day in
+        # the months where daylight saving time starts or ends
+        first, last = min(self.start_time), max(self.start_time)
+        year, month = time.localtime(first)[:2]
+        start = time.mktime((year, month, 1, 0, 0, 0, 0, 0, -1))
+        midnights, days = [], []
+        while start <= last:
+            if month == 12:
+                next_year, next_month = year + 1, 1
+            else:
+                next_year, next_month = year, month + 1
+            end = time.mktime((next_year, next_month, 1, 0, 0, 0, 0, 0, -1))
+            ndays = calendar.monthrange(year, month)[1]
+            if end - start == ndays * 86400:
+                midnights.extend(start + i * 86400 for i in range(ndays))
+            else:
+                midnights.extend(
+                    time.mktime((year, month, i + 1, 0, 0, 0, 0, 0, -1))
+                    for i in range(ndays))
+            days.extend((year, month, i + 1) for i in range(ndays))
+            year, month, start = next_year, next_month, end
+        return midnights, days
+
+    def _countDays(self, gameid):
+        midnights, days = self._getMidnights()
+        start_time, status = self.start_time, self.status
+        if gameid is not None:
+            selected = [g == gameid for g in self.gameid]
+            start_time = compress(start_time, selected)
+            status = compress(status, selected)
+        played = [0] * len(days)
+        won = [0] * len(days)
+        for t, s in zip(start_time, status):
+            i = bisect_right(midnights, t) - 1
+            played[i] += 1
+            if s > 0:
+                won[i] += 1
+        return days, played, won
+
+    def _countDaysNumpy(self, gameid):
+        midnights, days = self._getMidnights()
+        start_time = self._column(self.start_time)
+        won = self._column(self.status) > 0
+        if gameid is not None:
+            selected = self._column(self.gameid) == gameid
+            start_time, won = start_time[selected], won[selected]
+        day = numpy.searchsorted(midnights, start_time, side='right') - 1
+        return (days,
+                numpy.bincount(day, minlength=len(days)),
+                numpy.bincount(day, weights=won, minlength=len(days)))
+
+    @staticmethod
+    def _column(a):
+        # a numpy view of an array without copying
+        return numpy.frombuffer(a, dtype=a.typecode)
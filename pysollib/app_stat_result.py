@@ -15,19 +15,54 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from pysollib.mfxutil import Struct
+import heapq
+
 from pysollib.settings import TOP_SIZE
 
 
+class TopEntry:
+    __slots__ = ('gameid', 'value', 'game_number', 'game_start_time')
+
+    def __init__(self, gameid, value, game_number, game_start_time):
+        self.gameid = gameid
+        self.value = value
+        self.game_number = game_number
+        self.game_start_time = game_start_time
+
+    def __repr__(self):
+        return "TopEntry(%r, %r, %r, %r)" % self.astuple()
+
+    def astuple(self):
+        return (self.gameid, self.value, self.game_number,
+                self.game_start_time)
+
+
+# ************************************************************************
+# * min, max, average and the TOP_SIZE best (lowest) values of a result.
+# *
+# * The top list is a heap of (-value, -count, entry), so the entry that
+# * goes first when the list is full (the highest value, the newest of
+# * equal values) is at heap[0]. The pickled state is a dict as in older
+# * versions, with tuples instead of Struct objects in 'top'; both forms
+# * are read by __setstate__.
+# ************************************************************************
+
 class GameStatResult:
+    __slots__ = ('min', 'max', 'num', 'total', 'average', '_heap')
+
     def __init__(self):
         self.min = 0
         self.max = 0
-        self.top = []
+        self._heap = []
         self.num = 0
         self.total = 0  # sum of all values
         self.average = 0
 
+    @property
+    def top(self):
+        # sorted by value, equal values in the order they were added
+        return [item[2] for item in sorted(self._heap, reverse=True)]
+
     def update(self, gameid, value, game_number, game_start_time):
         # update min & max
         if not self.min or value < self.min:
@@ -36,27 +71,42 @@ class GameStatResult:
             self.max = value
         # calculate position & update top
         position = None
-        n = 0
-        for i in self.top:
-            if value < i.value:
-                position = n+1
-                v = Struct(gameid=gameid,
-                           value=value,
-                           game_number=game_number,
-                           game_start_time=game_start_time)
-                self.top.insert(n, v)
-                del self.top[TOP_SIZE:]
-                break
-            n += 1
-        if not position and len(self.top) < TOP_SIZE:
-            v = Struct(gameid=gameid,
-                       value=value,
-                       game_number=game_number,
-                       game_start_time=game_start_time)
-            self.top.append(v)
-            position = len(self.top)
+        heap = self._heap
+        if len(heap) < TOP_SIZE or value < -heap[0][0]:
+            position = 1 + sum(1 for item in heap if -item[0] <= value)
+            item = (-value, -self.num,
+                    TopEntry(gameid, value, game_number, game_start_time))
+            if len(heap) < TOP_SIZE:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heapreplace(heap, item)
         # update average
         self.total += value
         self.num += 1
         self.average = float(self.total)/self.num
         return position
+
+    def __getstate__(self):
+        return {'min': self.min,
+                'max': self.max,
+                'top': [e.astuple() for e in self.top],
+                'num': self.num,
+                'total': self.total,
+                'average': self.average}
+
+    def __setstate__(self, state):
+        self.min = state.get('min', 0)
+        self.max = state.get('max', 0)
+        self.num = state.get('num', 0)
+        self.total = state.get('total', 0)
+        self.average = state.get('average', 0)
+        top = state.get('top', [])
+        self._heap = []
+        for i, e in enumerate(top):
+            if not isinstance(e, tuple):
+                # Struct in older versions
+                e = (e.gameid, e.value, e.game_number, e.game_start_time)
+            entry = TopEntry(*e)
+            # above the -count of the games added later
+            self._heap.append((-entry.value, len(top) - i, entry))
+        heapq.heapify(self._heap)
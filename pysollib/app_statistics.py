@@ -21,7 +21,9 @@
 #
 # ---------------------------------------------------------------------------##
 
+from pysollib.app_gamelog import GameLog
 from pysollib.app_stat import GameStat
+from pysollib.app_statstore import LazyMap
 from pysollib.settings import VERSION_TUPLE
 
 
@@ -39,17 +41,58 @@ class Statistics:
         self.total_balance = {}     # a dictionary of integers
         self.session_balance = {}   # reset per session
         self.gameid_balance = 0     # reset when changing the gameid
+        # StatisticsStore or None (everything is in memory and pickled)
+        self.store = None
+        # PlayerStatsIndex (key: player), built when needed
+        self.indexes = {}
+        # GameLog of prev_games (key: player), built when needed
+        self.gamelogs = {}
 
     def new(self):
         return Statistics()
 
+    def setStore(self, store):
+        # keep games_stats, prev_games and all_prev_games in the
+        # store, and read them per player when needed
+        self.store = store
+        self.indexes = {}
+        self.gamelogs = {}
+        self.games_stats = LazyMap(self.__loadPlayerStats, store.getPlayers)
+        self.prev_games = LazyMap(store.loadLog, store.getLogPlayers)
+        self.all_prev_games = LazyMap(
+            lambda player: store.loadLog(player, all_games=True),
+            store.getLogPlayers)
+        self.total_balance = store.getMeta('total_balance', {})
+        self.saved = store.getMeta('saved', 0)
+
+    def __loadPlayerStats(self, player):
+        store = self.store
+        return LazyMap(lambda gameid: store.loadGameStat(player, gameid),
+                       lambda: store.getGameIds(player))
+
+    def save(self):
+        # write the values that are not saved per game to the store
+        store = self.store
+        store.setMeta('version_tuple', self.version_tuple)
+        store.setMeta('saved', self.saved)
+        store.setMeta('total_balance', self.total_balance)
+        store.commit()
+
     #
     # player & demo statistics
     #
 
     def resetStats(self, player, gameid):
-        self.__resetPrevGames(player, self.prev_games, gameid)
+        if self.store:
+            self.store.resetLog(player, gameid)
+            self.store.deleteGameStats(player, gameid)
+            self.store.commit()
+            self.prev_games.invalidate(player)
+        else:
+            self.__resetPrevGames(player, self.prev_games, gameid)
         self.__resetPrevGames(player, self.session_games, gameid)
+        self.indexes.pop(player, None)
+        self.gamelogs.pop(player, None)
         if player not in self.games_stats:
             return
         if gameid == 0:
@@ -78,14 +121,41 @@ class Statistics:
 
     def getFullStats(self, player, gameid):
         # returned (won, lost, playing time, moves)
-        stats = self.games_stats
-        if player in stats and gameid in stats[player]:
-            s = self.games_stats[player][gameid]
-            return (s.num_won+s.num_perfect,
-                    s.num_lost,
-                    s.time_result.average,
-                    s.moves_result.average,)
-        return (0, 0, 0, 0)
+        return self.getIndex(player).getFullStats(gameid)
+
+    def getIndex(self, player):
+        index = self.indexes.get(player)
+        if index is None:
+            if self.store:
+                full_stats = self.store.loadFullStats(player)
+            else:
+                full_stats = dict(
+                    (gameid, getGameStatResults(s))
+                    for gameid, s in self.games_stats.get(player, {}).items())
+            index = self.indexes[player] = PlayerStatsIndex(full_stats)
+        return index
+
+    def getGamesIdSorted(self, player, sort_by, games):
+        # games (a tuple of game ids) sorted by a column of the
+        # statistics, see PlayerStatsIndex
+        return self.getIndex(player).getSorted(sort_by, games)
+
+    def getGameLog(self, player):
+        gamelog = self.gamelogs.get(player)
+        if gamelog is None:
+            if self.store:
+                gamelog = GameLog.fromRows(self.store.loadLogColumns(player))
+            else:
+                gamelog = GameLog.fromLogs(self.prev_games.get(player, []))
+            self.gamelogs[player] = gamelog
+        return gamelog
+
+    def iterPrevGames(self, player):
+        # the log tuples of prev_games, without reading the whole log
+        # from the store
+        if self.store:
+            return self.store.iterLog(player)
+        return iter(self.prev_games.get(player, []))
 
     def getSessionStats(self, player, gameid):
         games = self.session_games.get(player, [])
@@ -107,12 +177,19 @@ class Statistics:
                 ret = self.updateGameStat(player, game, status)
             else:
                 # player
-                if player not in self.prev_games:
-                    self.prev_games[player] = []
-                self.prev_games[player].append(log)
-                if player not in self.all_prev_games:
-                    self.all_prev_games[player] = []
-                self.all_prev_games[player].append(log)
+                if self.store:
+                    self.store.appendLog(player, log)
+                    self.prev_games.invalidate(player)
+                    self.all_prev_games.invalidate(player)
+                else:
+                    if player not in self.prev_games:
+                        self.prev_games[player] = []
+                    self.prev_games[player].append(log)
+                    if player not in self.all_prev_games:
+                        self.all_prev_games[player] = []
+                    self.all_prev_games[player].append(log)
+                if player in self.gamelogs:
+                    self.gamelogs[player].append(log)
                 ret = self.updateGameStat(player, game, status)
         # session log
         if player not in self.session_games:
@@ -135,9 +212,67 @@ class Statistics:
         else:
             all_games_stat = self.games_stats[player]['all']
         all_games_stat.update(game, status)
-        return game_stat.update(game, status)
+        ret = game_stat.update(game, status)
+        if player in self.indexes:
+            self.indexes[player].update(game_stat)
+            self.indexes[player].update(all_games_stat)
+        if self.store:
+            self.store.saveGameStat(player, game_stat)
+            self.store.saveGameStat(player, all_games_stat)
+            self.store.commit()
+        return ret
 
 #      def __setstate__(self, state):      # for backward compatible
 #          if 'gameid' not in state:
 #              self.gameid = None
 #          self.__dict__.update(state)
+
+
+def getGameStatResults(game_stat):
+    # (won, lost, playing time, moves) of a GameStat
+    s = game_stat
+    return (s.num_won + s.num_perfect,
+            s.num_lost,
+            s.time_result.average,
+            s.moves_result.average,)
+
+
+# ************************************************************************
+# * The results of all games of a player, for the statistics dialog,
+# * with the sort orders of the dialog cached until a result changes.
+# ************************************************************************
+
+class PlayerStatsIndex:
+    NO_STATS = (0, 0, 0, 0)
+
+    SORT_KEYS = {
+        'played': lambda r: r[0] + r[1],
+        'won': lambda r: r[0],
+        'lost': lambda r: r[1],
+        'percent': lambda r: float(r[0]) / (r[0] + r[1] or 1),
+        'time': lambda r: r[2],
+        'moves': lambda r: r[3],
+    }
+
+    def __init__(self, full_stats):
+        self.full_stats = full_stats
+        self.sorted = {}
+
+    def getFullStats(self, gameid):
+        return self.full_stats.get(gameid, self.NO_STATS)
+
+    def update(self, game_stat):
+        self.full_stats[game_stat.gameid] = getGameStatResults(game_stat)
+        self.sorted.clear()
+
+    def getSorted(self, sort_by, games):
+        # most first, games with the same value in reverse order of games
+        cached = self.sorted.get(sort_by)
+        if cached is None or cached[0] is not games:
+            key = self.SORT_KEYS[sort_by]
+            full_stats, no_stats = self.full_stats, self.NO_STATS
+            result = sorted(
+                games, key=lambda a: key(full_stats.get(a, no_stats)))
+            result.reverse()
+            cached = self.sorted[sort_by] = (games, tuple(result))
+        return list(cached[1])
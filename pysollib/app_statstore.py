@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import pickle
+from collections.abc import MutableMapping
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+
+# ************************************************************************
+# * The statistics in an SQLite database instead of a single pickle:
+# *
+# *   log         one row per finished game, appended when the game ends
+# *               (the prev_games and all_prev_games lists)
+# *   game_stats  one GameStat per (player, gameid), replaced when the
+# *               game ends
+# *   meta        small values (total_balance, ...)
+# *
+# * Nothing is read at startup. Statistics reads each GameStat and the
+# * log of a player when they are first needed (see LazyMap).
+# *
+# * The player of demo games is None, which is NULL in the database,
+# * so rows are looked up with "IS" instead of "=".
+# ************************************************************************
+
+def _dumps(obj):
+    return sqlite3.Binary(pickle.dumps(obj, -1))
+
+
+class StatisticsStore:
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS log ("
+        " player TEXT, gameid INTEGER, in_prev INTEGER, status INTEGER,"
+        " start_time REAL, elapsed REAL, score REAL, data BLOB)",
+        "CREATE INDEX IF NOT EXISTS log_player ON log (player, in_prev)",
+        "CREATE TABLE IF NOT EXISTS game_stats ("
+        " player TEXT, gameid, won INTEGER, lost INTEGER,"
+        " time REAL, moves REAL, data BLOB)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS game_stats_key"
+        " ON game_stats (player, gameid)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, data BLOB)",
+    )
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.conn = sqlite3.connect(filename)
+        for sql in self.SCHEMA:
+            self.conn.execute(sql)
+        self.conn.commit()
+
+    @staticmethod
+    def isAvailable():
+        return sqlite3 is not None
+
+    def close(self):
+        self.conn.close()
+
+    def commit(self):
+        self.conn.commit()
+
+    #
+    # small values
+    #
+
+    def getMeta(self, key, default=None):
+        row = self.conn.execute(
+            "SELECT data FROM meta WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        return pickle.loads(row[0])
+
+    def setMeta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, data) VALUES (?, ?)",
+            (key, _dumps(value)))
+
+    #
+    # per (player, gameid) records
+    #
+
+    def getPlayers(self):
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT player FROM game_stats")]
+
+    def getGameIds(self, player):
+        return [row[0] for row in self.conn.execute(
+            "SELECT gameid FROM game_stats WHERE player IS ?", (player,))]
+
+    def loadGameStat(self, player, gameid):
+        row = self.conn.execute(
+            "SELECT data FROM game_stats WHERE player IS ? AND gameid IS ?",
+            (player, gameid)).fetchone()
+        if row is None:
+            raise KeyError(gameid)
+        return pickle.loads(row[0])
+
+    def loadFullStats(self, player):
+        # (won, lost, playing time, moves) of all games of player,
+        # without reading the GameStat objects
+        return dict((row[0], tuple(row[1:])) for row in self.conn.execute(
+            "SELECT gameid, won, lost, time, moves FROM game_stats"
+            " WHERE player IS ?", (player,)))
+
+    def saveGameStat(self, player, game_stat):
+        s = game_stat
+        self.conn.execute(
+            "DELETE FROM game_stats WHERE player IS ? AND gameid IS ?",
+            (player, s.gameid))
+        self.conn.execute(
+            "INSERT INTO game_stats"
+            " (player, gameid, won, lost, time, moves, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (player, s.gameid, s.num_won + s.num_perfect, s.num_lost,
+             s.time_result.average, s.moves_result.average, _dumps(s)))
+
+    def deleteGameStats(self, player, gameid):
+        # gameid 0 means all games
+        if gameid == 0:
+            self.conn.execute(
+                "DELETE FROM game_stats WHERE player IS ?", (player,))
+        else:
+            self.conn.execute(
+                "DELETE FROM game_stats WHERE player IS ? AND gameid IS ?",
+                (player, gameid))
+
+    #
+    # the log of finished games
+    #
+
+    def getLogPlayers(self):
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT player FROM log")]
+
+    def appendLog(self, player, log, in_prev=1):
+        # the columns are NULL for malformed entries of old logs
+        if isinstance(log, tuple) and len(log) >= 5:
+            columns = (log[0],) + log[2:5] + (
+                log[6] if len(log) > 6 else None,)
+        else:
+            columns = (None,) * 5
+        self.conn.execute(
+            "INSERT INTO log (player, in_prev, gameid, status, start_time,"
+            " elapsed, score, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (player, in_prev) + columns + (_dumps(log),))
+
+    def loadLog(self, player, all_games=False):
+        # the prev_games list of player, or all_prev_games
+        return list(self.iterLog(player, all_games))
+
+    def iterLog(self, player, all_games=False, chunk_size=1000):
+        # like loadLog(), but reads chunk_size rows at a time
+        sql = "SELECT data FROM log WHERE player IS ?"
+        if not all_games:
+            sql += " AND in_prev = 1"
+        cursor = self.conn.execute(sql + " ORDER BY rowid", (player,))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield pickle.loads(row[0])
+
+    def loadLogColumns(self, player):
+        # (gameid, status, start_time, elapsed, score) of the games in
+        # prev_games, without reading the log tuples
+        return self.conn.execute(
+            "SELECT gameid, status, start_time, elapsed, score FROM log"
+            " WHERE player IS ? AND in_prev = 1 AND typeof(gameid) ="
+            " 'integer' ORDER BY rowid", (player,))
+
+    def resetLog(self, player, gameid):
+        # remove games from prev_games (they stay in all_prev_games)
+        if gameid == 0:
+            self.conn.execute(
+                "UPDATE log SET in_prev = 0 WHERE player IS ?", (player,))
+        else:
+            self.conn.execute(
+                "UPDATE log SET in_prev = 0 WHERE player IS ? AND gameid = ?",
+                (player, gameid))
+
+    #
+    # migration from statistics.dat
+    #
+
+    def isImported(self):
+        return self.getMeta('imported', False)
+
+    def importStatistics(self, stats):
+        # copy a Statistics object loaded from the old pickle, in a
+        # single transaction
+        with self.conn:
+            for player, games in stats.games_stats.items():
+                for game_stat in games.values():
+                    self.saveGameStat(player, game_stat)
+            all_prev_games = getattr(stats, 'all_prev_games', {})
+            for player in set(stats.prev_games) | set(all_prev_games):
+                # prev_games is all_prev_games without the games
+                # removed by "Reset statistics", but older versions
+                # only have prev_games
+                prev = {}
+                for log in stats.prev_games.get(player, []):
+                    prev[log] = prev.get(log, 0) + 1
+                for log in all_prev_games.get(player, []):
+                    in_prev = int(prev.get(log, 0) > 0)
+                    if in_prev:
+                        prev[log] -= 1
+                    self.appendLog(player, log, in_prev)
+                for log in stats.prev_games.get(player, []):
+                    if prev.get(log, 0) > 0:
+                        prev[log] -= 1
+                        self.appendLog(player, log)
+            self.setMeta('total_balance', getattr(stats, 'total_balance', {}))
+            self.setMeta('saved', getattr(stats, 'saved', 0))
+            self.setMeta('imported', True)
+
+
+# ************************************************************************
+# * A dictionary (key: player or gameid) that reads a value from the
+# * store when it is first used. The keys are only read when a missing
+# * key is looked up or all keys are needed.
+# ************************************************************************
+
+class LazyMap(MutableMapping):
+    def __init__(self, load, keys):
+        self._load = load
+        self._get_keys = keys
+        self._keys = None
+        self._loaded = {}
+
+    def _getKeys(self):
+        if self._keys is None:
+            self._keys = set(self._get_keys())
+            self._keys.update(self._loaded)
+        return self._keys
+
+    def __getitem__(self, key):
+        try:
+            return self._loaded[key]
+        except KeyError:
+            if key not in self._getKeys():
+                raise
+        value = self._loaded[key] = self._load(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._loaded[key] = value
+        if self._keys is not None:
+            self._keys.add(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._loaded.pop(key, None)
+        self._getKeys().discard(key)
+
+    def __contains__(self, key):
+        return key in self._loaded or key in self._getKeys()
+
+    def __iter__(self):
+        return iter(list(self._getKeys()))
+
+    def __len__(self):
+        return len(self._getKeys())
+
+    def invalidate(self, key):
+        # the value of key has changed in the store
+        self._loaded.pop(key, None)
+        if self._keys is not None:
+            self._keys.add(key)
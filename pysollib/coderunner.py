@@ -0,0 +1,477 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import multiprocessing
+import time
+import traceback
+from enum import Enum
+from types import MethodType
+
+from pysollib.acard import AbstractCard
+from pysollib.codestate import TopCardsHash
+
+
+class Suit(Enum):
+    ANY = -1
+    CLUB = 0
+    SPADE = 1
+    HEART = 2
+    DIAMOND = 3
+
+
+# ************************************************************************
+# * The player script API of the code region.
+# *
+# * CodeRunner implements the functions a player script can call
+# * (move, check_move, tableau, deal_cards...) against self.game, which
+# * is either the live game (see pysollib/tile/coderegion.py) or the
+# * Klondike of a HeadlessCodeRunner below.
+# ************************************************************************
+
+class CodeRunner:
+    def __init__(self):
+        self.game = None
+        # A simple step count to prevent infinite loop per player
+        # code execution
+        self.step_count = 0
+        # In average, players makes 45 moves in a single game
+        self.step_max = 150
+        # Dealing is not a move, but the talon can be redealt for ever
+        self.deal_count = 0
+        self.deal_max = 1000
+        # The hashes of the states the player code has been in
+        self.state_set = set()
+        self.state_hash = None
+
+    def connectGame(self, game):
+        self.game = game
+        self.state_hash = None
+
+    #
+    # console, overridden by the code region
+    #
+
+    def reset_console_log(self):
+        pass
+
+    def add_console_log(self, value: str):
+        pass
+
+    #
+    # states
+    #
+
+    # The stacks whose top cards make up a state: the tableau, the
+    # foundations and the waste
+    def _state_stacks(self):
+        return (tuple(self.tableau()) + tuple(self.foundation()) +
+                (self.waste(),))
+
+    # The incremental hash of the current top cards of all card stacks
+    # in the game (see pysollib/codestate.py). It has to be resynced
+    # whenever the game changes under us (a new deal, undo, restore...)
+    def _get_state_hash(self):
+        if self.state_hash is None:
+            self.state_hash = TopCardsHash(self._state_stacks())
+        return self.state_hash
+
+    # Calculate a state represented by a single int for the current
+    # top cards of all card stacks in the game
+    def _get_current_state(self):
+        return self._get_state_hash().resync()
+
+    # Calculate a state represented by a single int for the future
+    # top cards of all cards after a move is performed
+    def _get_future_state(self, from_stack, ncards, to_stack):
+        return self._get_state_hash().probe(from_stack, ncards, to_stack)
+
+    # Update the state after from_stack moved cards to to_stack
+    def _update_state(self, from_stack, to_stack):
+        state_hash = self._get_state_hash()
+        state_hash.update(from_stack)
+        return state_hash.update(to_stack)
+
+    #
+    # the script API
+    #
+
+    def action_deal_cards(self):
+        if self.deal_count >= self.deal_max:
+            raise Exception(
+                f"You have dealt more cards than allowed {self.deal_max}\n"
+                "Is there an infinite loop in your code?")
+        self.deal_count += 1
+        num_cards = self.game.dealCards()
+        # the autoplay after the deal may have moved more than the
+        # waste (see Game.dealCards)
+        self._get_state_hash().resync()
+        self.add_console_log(f"Dealed {num_cards} cards from Stock\n")
+
+    def action_print(self, text: any):
+        self.add_console_log(str(text) + "\n")
+
+    # function that returns stack or stacks
+    def waste(self):
+        # single stack (pysollib.stack.WasteStack)
+        return self.game.s.waste
+
+    def foundation(self):
+        # multiple stacks (tuple)
+        return self.game.s.foundations
+
+    def tableau(self):
+        # multiple stacks (tuple)
+        return self.game.s.rows
+
+    def column(self, index: int):
+        if index < 0 or index > 6:
+            raise Exception(f"Index {index} out of range for columns.\n"
+                            "Tip: valid column index is from 0 to 6")
+        # single stack (pysollib.stack.KingAC_RowStack)
+        return self.game.s.rows[index]
+
+    def check_move(self, from_stacks, to_stacks):
+        # first convert to_stacks to a tuple list that canDropCards accepts
+        if not isinstance(to_stacks, tuple):
+            to_stacks = (to_stacks,)
+
+        canMove = False
+        # handle from_stacks if it is a tuple list
+        if isinstance(from_stacks, tuple):
+            for s in from_stacks:
+                toStack, ncards = s.canDropCards(to_stacks)
+                if toStack:
+                    # check the state after the move, if future state has
+                    # occured before, it isn't the best strategy
+                    future_state = self._get_future_state(s, ncards, toStack)
+                    if future_state in self.state_set:
+                        continue
+                    canMove = True
+                    break
+        # handle from_stacks if it is a single stack
+        else:
+            toStack, ncards = from_stacks.canDropCards(to_stacks)
+            if toStack:
+                canMove = True
+        return canMove
+
+    def _count_move(self):
+        self.game.update_moves_by_code(1)
+
+    def _do_move(self, from_stack, ncards, to_stack):
+        # each single drop is undo-able (note that this call
+        # is before the actual move)
+        self.game.finishMove()
+        self._count_move()
+        from_stack.moveMove(ncards, to_stack)
+        self.game.checkForWin()
+        if from_stack.canFlipCard():
+            from_stack.flipMove(animation=True)
+        self.add_console_log(
+            f"Move {ncards} cards from {from_stack} to {to_stack}\n")
+        self.step_count += 1
+        self.state_set.add(self._update_state(from_stack, to_stack))
+
+    def action_move(self, from_stacks, to_stacks):
+        # First check if we have reached the maximum steps
+        if self.step_count >= self.step_max:
+            raise Exception(
+                f"You have made more moves than allowed {self.step_max}\n"
+                "Is there an infinite loop in your code?")
+
+        # first convert to_stacks to a tuple list that canDropCards accepts
+        if not isinstance(to_stacks, tuple):
+            to_stacks = (to_stacks,)
+
+        # handle from_stacks if it is a tuple list
+        if isinstance(from_stacks, tuple):
+            for s in from_stacks:
+                to_stack, ncards = s.canDropCards(to_stacks)
+                if to_stack:
+                    # check the state after the move, if future state has
+                    # occured before, it isn't the best strategy
+                    future_state = self._get_future_state(s, ncards, to_stack)
+                    if future_state in self.state_set:
+                        continue
+                    self._do_move(s, ncards, to_stack)
+                    return
+            # raise an exception if we end up not moving. It forces
+            # the player to check before move
+            raise Exception(f"Can't move from {s} to {to_stack}\n")
+        # handle from_stacks if it is a single stack
+        else:
+            # note: we don't check state duplication if moving from a
+            # single stack
+            to_stack, ncards = from_stacks.canDropCards(to_stacks)
+            if to_stack:
+                self._do_move(from_stacks, ncards, to_stack)
+            # raise an exception if we end up not moving. It forces
+            # the player to check before move
+            else:
+                raise Exception(
+                    f"Can't move from {from_stacks} to {to_stack}\n")
+
+    def action_undo(self):
+        self.game.finishMove()
+        self.game.undo()
+        self._get_state_hash().resync()
+
+    def check_size(self, index: int):
+        return len(self.column(index).cards)
+
+    def check_face_up_size(self, index: int):
+        num_face_up = len([c for c in self.column(index).cards if c.face_up])
+        return num_face_up
+
+    def check_face_down_size(self, index: int):
+        num_face_down = self.check_size(index) - self.check_face_up_size(index)
+        return num_face_down
+
+    def check_face_up_exists(self, index: int, rank: int, suit: Suit):
+        """
+        Returns true if any of the cards facing up in the column match
+        the criteria.
+        """
+
+        if not isinstance(suit, Suit):
+            raise Exception("suit must be one of the following: "
+                            "ANY, SPADE, HEART, DIAMOND, CLUB")
+
+        # convert from 1-based index to 0-based index
+        rank -= 1
+
+        def predicate(card: AbstractCard) -> bool:
+            return (card.rank == rank and
+                    (card.suit == suit.value or suit == Suit.ANY) and
+                    card.face_up)
+
+        return any([predicate(card) for card in self.column(index).cards])
+
+    def check_top(self, index: int, rank: int, suit: Suit):
+        """
+        Returns true if the top card in the column matches the criteria.
+        """
+
+        if not isinstance(suit, Suit):
+            raise Exception("suit must be one of the following: "
+                            "ANY, SPADE, HEART, DIAMOND, CLUB")
+
+        # convert from 1-based index to 0-based index
+        rank -= 1
+
+        def predicate(card: AbstractCard) -> bool:
+            return (card.rank == rank and
+                    (card.suit == suit.value or suit == Suit.ANY))
+
+        cards = self.column(index).cards
+        return len(cards) > 0 and predicate(cards[-1])
+
+    #
+    # running player code
+    #
+
+    def get_globals(self):
+        # A function decorator to check if the game has finished before
+        # executing the function.
+        def check_for_win_wrapper(func):
+            def wrapper(*args, **kwargs):
+                if self.game.finished:
+                    raise Exception("Execution stop, the game has finished!")
+                return func(*args, **kwargs)
+            return wrapper
+
+        exec_globals = {
+            "waste": self.waste,
+            "foundation": self.foundation,
+            "tableau": self.tableau,
+            "column": self.column,
+            "deal_cards": self.action_deal_cards,
+            "print": self.action_print,
+            "check_move": self.check_move,
+            "check_size": self.check_size,
+            "check_face_up_size": self.check_face_up_size,
+            "check_face_down_size": self.check_face_down_size,
+            "check_face_up_exists": self.check_face_up_exists,
+            "check_top": self.check_top,
+            "move": self.action_move,
+            "undo": self.action_undo,
+            "ANY": Suit.ANY,
+            "SPADE": Suit.SPADE,
+            "HEART": Suit.HEART,
+            "DIAMOND": Suit.DIAMOND,
+            "CLUB": Suit.CLUB,
+        }
+
+        # Wraps all functions in the exec_globals with the function decorator
+        for key, item in exec_globals.items():
+            if isinstance(item, MethodType):
+                exec_globals[key] = check_for_win_wrapper(item)
+        return exec_globals
+
+    def run_code(self, code):
+        # Runs player code (a string or a code object compiled with
+        # filename "<string>"), returns the error message or None
+        # Reset step count every time we execute the code
+        self.step_count = 0
+        self.deal_count = 0
+        # The player may have moved cards by hand since the last run
+        self._get_current_state()
+
+        try:
+            exec(code, self.get_globals())
+        except SyntaxError as e:
+            error = f"Error at line {e.lineno}: {str(e.msg)}"
+        except Exception as e:
+            # Find the correct traceback frame for the "exec"
+            # and print the error for that line.
+            frames = traceback.extract_tb(e.__traceback__)
+            lineno = None
+            for frame in frames:
+                if frame.filename == "<string>":
+                    lineno = frame.lineno
+            if lineno is not None:
+                error = f"Error at line {lineno}: {str(e)}"
+            else:
+                error = str(e)
+        else:
+            return None
+        self.add_console_log(error)
+        return error
+
+
+# ************************************************************************
+# * The player script API on a Klondike without a GUI, for running
+# * player scripts in batches.
+# *
+# * The game is the real Klondike of a headless app (see
+# * pysollib/headless.py): the same stacks, rules, autoplay and deals as
+# * the live game for the same game number, but no canvas, no
+# * animations, no statistics and no leaderboard updates.
+# ************************************************************************
+
+class HeadlessCodeRunner(CodeRunner):
+    KLONDIKE_ID = 2
+
+    def __init__(self):
+        # not at the top: pysollib.headless imports the toolkit, which
+        # imports the code region
+        from pysollib.headless import createGame
+        CodeRunner.__init__(self)
+        game = createGame(self.KLONDIKE_ID)
+        # the stuck check only shows the player a message
+        game.Stuck_Class = None
+        self.connectGame(game)
+        self.moves_by_code = 0
+
+    def _count_move(self):
+        # no leaderboard
+        self.moves_by_code += 1
+
+    def _check_for_win(self):
+        # a preview game does not finish (see Game.checkForWin)
+        if self.game.isGameWon():
+            self.game.finished = True
+
+    def _do_move(self, from_stack, ncards, to_stack):
+        CodeRunner._do_move(self, from_stack, ncards, to_stack)
+        self._check_for_win()
+
+    def action_deal_cards(self):
+        # the autoplay after a deal may win the game
+        CodeRunner.action_deal_cards(self)
+        self._check_for_win()
+
+    def play(self, code, seed):
+        # Deals game seed and runs the code on it, returns a
+        # (won, moves, error) tuple
+        from pysollib.headless import dealGame
+        dealGame(self.game, seed)
+        self.game.finished = False
+        self.moves_by_code = 0
+        self.state_hash = None
+        self.state_set = set()
+        error = self.run_code(code)
+        return bool(self.game.isGameWon()), self.moves_by_code, error
+
+
+# ************************************************************************
+# * Batch runs
+# ************************************************************************
+
+def _playDeals(args):
+    code, seeds = args
+    code = compile(code, "<string>", "exec")
+    runner = HeadlessCodeRunner()
+    return [runner.play(code, seed) for seed in seeds]
+
+
+def runDeals(code, seeds, processes=0, chunksize=None):
+    """
+    Runs player code on every deal of seeds and returns a report
+    dict: the number of games, wins and errors, the win rate, the
+    number of moves per game (mean, min, max, and the mean of the
+    won games), the first error message and the deals per second.
+    Runs in a pool of that many processes if processes > 1, the
+    deals are given to the workers in chunks of chunksize deals.
+
+    The games are real Klondike games, so a deal costs what it costs
+    in the live game without the GUI: on one core about 300 deals per
+    second for the deal alone, about 100 for a script of 60 steps and
+    less than 10 for a script that runs into the move or deal limits.
+    Thousands of deals per second need as many cores.
+    """
+
+    # fail early on syntax errors
+    compile(code, "<string>", "exec")
+    seeds = list(seeds)
+    if chunksize is None:
+        if processes > 1:
+            # see dealscan.scanDeals
+            chunksize = max(1, min(100, len(seeds) // (processes * 4)))
+        else:
+            chunksize = max(1, len(seeds))
+    chunks = [(code, seeds[i:i+chunksize])
+              for i in range(0, len(seeds), chunksize)]
+    start = time.time()
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(_playDeals, chunks, 1)
+    else:
+        results = [_playDeals(chunk) for chunk in chunks]
+    elapsed = time.time() - start
+    results = [r for chunk in results for r in chunk]
+
+    games = len(results)
+    moves = [r[1] for r in results]
+    won_moves = [r[1] for r in results if r[0]]
+    errors = [r[2] for r in results if r[2] is not None]
+    return {
+        "games": games,
+        "wins": len(won_moves),
+        "win_rate": len(won_moves) / games if games else 0.0,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "moves_mean": sum(moves) / games if games else 0.0,
+        "moves_min": min(moves) if moves else 0,
+        "moves_max": max(moves) if moves else 0,
+        "won_moves_mean": (sum(won_moves) / len(won_moves)
+                           if won_moves else 0.0),
+        "elapsed": elapsed,
+        "deals_per_second": games / elapsed if elapsed else 0.0,
+    }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import random
+
+
+# ************************************************************************
+# * Zobrist hash of the top cards of a fixed list of stacks.
+# *
+# * Every (stack position, top card) pair has a random 64-bit key and
+# * the hash is the xor of the keys of the current tops, so a move
+# * changes it by xoring out the old and in the new top of the two
+# * stacks involved. This is used by the code region to remember the
+# * positions a player script has been in without building strings.
+# ************************************************************************
+
+# the keys are indexed with 1 + (suit << RANK_BITS) + rank, 0 is an
+# empty stack
+RANK_BITS = 5
+SUIT_BITS = 4
+KEYS_PER_STACK = 1 + (1 << (RANK_BITS + SUIT_BITS))
+
+# the keys are shared (and stable) for the lifetime of the process,
+# so hashes computed on different stack lists of the same layout
+# can be compared
+_keys = []
+_keys_random = random.Random(0x5eed)
+
+
+def _getKeys(npositions):
+    while len(_keys) < npositions:
+        _keys.append(tuple(_keys_random.getrandbits(64)
+                           for i in range(KEYS_PER_STACK)))
+    return _keys[:npositions]
+
+
+def cardKey(card):
+    if card is None:
+        return 0
+    return 1 + (card.suit << RANK_BITS) + card.rank
+
+
+class TopCardsHash:
+    def __init__(self, stacks):
+        self.stacks = tuple(stacks)
+        self.keys = _getKeys(len(self.stacks))
+        # stack id -> position in self.stacks
+        self.positions = dict((s.id, i) for i, s in enumerate(self.stacks))
+        self.tops = [0] * len(self.stacks)
+        self.value = 0
+        self.resync()
+
+    def resync(self):
+        # recompute from scratch, after an undo or any other change
+        # we did not follow
+        value = 0
+        for i, s in enumerate(self.stacks):
+            top = cardKey(s.cards[-1] if s.cards else None)
+            self.tops[i] = top
+            value ^= self.keys[i][top]
+        self.value = value
+        return value
+
+    def update(self, stack):
+        # the top card of stack has changed
+        i = self.positions.get(stack.id)
+        if i is None:
+            return self.value
+        top = cardKey(stack.cards[-1] if stack.cards else None)
+        keys = self.keys[i]
+        self.value ^= keys[self.tops[i]] ^ keys[top]
+        self.tops[i] = top
+        return self.value
+
+    def probe(self, from_stack, ncards, to_stack):
+        # the hash after moving the top ncards of from_stack to to_stack,
+        # without doing the move
+        value = self.value
+        i = self.positions.get(from_stack.id)
+        if i is not None:
+            cards = from_stack.cards
+            top = cardKey(cards[-ncards-1] if len(cards) > ncards else None)
+            value ^= self.keys[i][self.tops[i]] ^ self.keys[i][top]
+        i = self.positions.get(to_stack.id)
+        if i is not None:
+            top = cardKey(from_stack.cards[-1])
+            value ^= self.keys[i][self.tops[i]] ^ self.keys[i][top]
+        return value
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from array import array
+
+from pysollib.mfxutil import Struct
+
+
+# ************************************************************************
+# * A compact model of a game position, for hinting, demo autoplay and
+# * deal analysis without the canvas.
+# *
+# * A Position stores every stack as an array of small ints, the card
+# * id and face (id << 1 | face_up). A CardTable maps these codes to
+# * shared CompactCard objects which have the model attributes of a
+# * card (id, deck, suit, rank, color, face_up) but no canvas item.
+# *
+# * StackView and GameView run the rules of the real stack and game
+# * classes (acceptsCards(), canDropCards(), getPile(), ...) on other
+# * cards. A StackView is an instance of a subclass of the stack class
+# * with its own cards and game that shares the other attributes (id,
+# * cap, ...) of the real stack. A GameView binds the methods of the
+# * game class to itself and reads other attributes from the real game.
+# ************************************************************************
+
+class CompactCard:
+    __slots__ = ('id', 'deck', 'suit', 'rank', 'color', 'face_up')
+
+    def __init__(self, card, face_up):
+        self.id = card.id
+        self.deck = card.deck
+        self.suit = card.suit
+        self.rank = card.rank
+        self.color = card.color
+        self.face_up = face_up
+
+    def __repr__(self):
+        return "CompactCard(%d, %d, %d, %d)" % \
+               (self.id, self.deck, self.suit, self.rank)
+
+
+def cardCode(card):
+    return card.id << 1 | (card.face_up and 1 or 0)
+
+
+class CardTable:
+    def __init__(self, cards):
+        self.cards = [None] * (2 * len(cards))
+        for card in cards:
+            self.cards[card.id << 1] = CompactCard(card, 0)
+            self.cards[card.id << 1 | 1] = CompactCard(card, 1)
+
+    def decode(self, codes):
+        cards = self.cards
+        return [cards[c] for c in codes]
+
+
+SEPARATOR = array('H', [0xffff]).tobytes()
+
+
+class Position:
+    __slots__ = ('stacks',)
+
+    def __init__(self, stacks):
+        self.stacks = stacks
+
+    @classmethod
+    def fromGame(cls, game):
+        return cls([array('H', [cardCode(c) for c in s.cards])
+                    for s in game.allstacks])
+
+    def copy(self):
+        return Position([array('H', a) for a in self.stacks])
+
+    def key(self):
+        # the whole position as bytes, for dicts of seen positions
+        # and for storing many positions
+        return SEPARATOR.join([a.tobytes() for a in self.stacks])
+
+    @classmethod
+    def fromKey(cls, key):
+        codes = array('H', key)
+        stacks, start = [], 0
+        for i, code in enumerate(codes):
+            if code == 0xffff:
+                stacks.append(codes[start:i])
+                start = i + 1
+        stacks.append(codes[start:])
+        return cls(stacks)
+
+    def moveCards(self, ncards, from_id, to_id):
+        from_cards = self.stacks[from_id]
+        self.stacks[to_id].extend(from_cards[-ncards:])
+        del from_cards[-ncards:]
+
+    def flipCard(self, stack_id):
+        self.stacks[stack_id][-1] ^= 1
+
+
+def _lookup(view, obj, name):
+    # an attribute of obj as seen from view: instance attributes are
+    # shared, methods are bound to the view
+    try:
+        return obj.__dict__[name]
+    except KeyError:
+        pass
+    for klass in type(obj).__mro__:
+        if name in klass.__dict__:
+            value = klass.__dict__[name]
+            if hasattr(value, '__get__'):
+                return value.__get__(view, type(obj))
+            return value
+    raise AttributeError(name)
+
+
+class StackView:
+    __slots__ = ('stack', 'game', 'cards')
+
+    def __new__(cls, stack, cards, game=None):
+        if isinstance(stack, StackView):
+            if game is None:
+                game = stack.game
+            stack = stack.stack
+        view = object.__new__(_getViewClass(stack.__class__))
+        # not a copy: the view reads the attributes of the stack from
+        # the stack until it sets one (see __setattr__)
+        object.__setattr__(view, '__dict__', stack.__dict__)
+        object.__setattr__(view, 'stack', stack)
+        object.__setattr__(view, 'game',
+                           stack.game if game is None else game)
+        object.__setattr__(view, 'cards', cards)
+        return view
+
+    def __init__(self, *args):
+        # not the __init__ of the stack class
+        pass
+
+    def __setattr__(self, name, value):
+        if name not in StackView.__slots__ and \
+                self.__dict__ is self.stack.__dict__:
+            # the stack keeps its attributes
+            object.__setattr__(self, '__dict__', dict(self.__dict__))
+        object.__setattr__(self, name, value)
+
+
+# the view classes derive from the stack classes, so the rules run at
+# full speed and isinstance() works as for the real stacks
+_view_classes = {}
+
+
+def _getViewClass(stack_class):
+    try:
+        return _view_classes[stack_class]
+    except KeyError:
+        view_class = type(stack_class.__name__, (StackView, stack_class),
+                          {'__slots__': ()})
+        _view_classes[stack_class] = view_class
+        return view_class
+
+
+class GameView:
+    def __init__(self, game, position, table):
+        self.game = game
+        self.position = position
+        self.table = table
+        views = {}
+        for s, codes in zip(game.allstacks, position.stacks):
+            views[s] = StackView(s, table.decode(codes), self)
+        self.allstacks = tuple(views[s] for s in game.allstacks)
+        self.s = self._mapStacks(game.s, views)
+        self.sg = self._mapStacks(game.sg, views)
+
+    @classmethod
+    def _mapStacks(cls, group, views):
+        # a copy of game.s or game.sg with the stacks replaced by views
+        return Struct(**dict((k, cls._mapValue(v, views))
+                             for k, v in group.__dict__.items()))
+
+    @classmethod
+    def _mapValue(cls, value, views):
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._mapValue(v, views) for v in value)
+        try:
+            return views.get(value, value)
+        except TypeError:
+            # not hashable, so not a stack
+            return value
+
+    def __getattr__(self, name):
+        return _lookup(self, self.game, name)
+
+    def moveCards(self, ncards, from_stack, to_stack):
+        self.position.moveCards(ncards, from_stack.id, to_stack.id)
+        to_stack.cards.extend(from_stack.cards[-ncards:])
+        del from_stack.cards[-ncards:]
+
+    def flipCard(self, stack):
+        self.position.flipCard(stack.id)
+        stack.cards[-1] = self.table.cards[
+            self.position.stacks[stack.id][-1]]
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import multiprocessing
+import os
+import struct
+import time
+
+from pysollib.headless import createGame, dealGame
+
+
+# ************************************************************************
+# * The solvability of the deals of a game, one file per game:
+# *
+# *   "PySolDLS", version, game id          8 bytes, 2 x uint32
+# *   records                               16 bytes each
+# *
+# * A record is the game number (low 64 bits, high 8 bits), the result
+# * (see DEAL_RESULTS), the iterations of the solver and the number of
+# * moves of the solution. Records are appended as the deals are
+# * scanned, a later record of a game number replaces an earlier one.
+# ************************************************************************
+
+DEAL_INDEX_MAGIC = b"PySolDLS"
+DEAL_INDEX_VERSION = 1
+DEAL_RESULTS = ('unsolved', 'solved', 'intractable', 'error')
+
+_HEADER = struct.Struct("<8sII")
+_RECORD = struct.Struct("<QBBIH")
+
+
+class DealIndex:
+    def __init__(self, filename, gameid):
+        self.filename = filename
+        self.gameid = gameid
+        self._deals = None              # game number -> (result, iters, moves)
+        self._file = None
+
+    def _getDeals(self):
+        if self._deals is None:
+            self._deals = {}
+            try:
+                with open(self.filename, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return self._deals
+            if len(data) < _HEADER.size:
+                raise ValueError("invalid deal index: " + self.filename)
+            magic, version, gameid = _HEADER.unpack_from(data)
+            if magic != DEAL_INDEX_MAGIC or version != DEAL_INDEX_VERSION \
+                    or gameid != self.gameid:
+                raise ValueError("invalid deal index: " + self.filename)
+            # a truncated last record is dropped
+            end = len(data) - (len(data) - _HEADER.size) % _RECORD.size
+            for lo, hi, result, iters, moves in _RECORD.iter_unpack(
+                    data[_HEADER.size:end]):
+                self._deals[hi << 64 | lo] = (DEAL_RESULTS[result], iters,
+                                              moves)
+        return self._deals
+
+    def get(self, seed):
+        # returns (result, iterations, solution length) or None
+        return self._getDeals().get(seed)
+
+    def __contains__(self, seed):
+        return seed in self._getDeals()
+
+    def __len__(self):
+        return len(self._getDeals())
+
+    def add(self, seed, result, iters, moves):
+        deals = self._getDeals()
+        if self._file is None:
+            dirname = os.path.dirname(self.filename)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname)
+            self._file = open(self.filename, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_HEADER.pack(
+                    DEAL_INDEX_MAGIC, DEAL_INDEX_VERSION, self.gameid))
+        self._file.write(_RECORD.pack(
+            seed & 0xFFFFFFFFFFFFFFFF, seed >> 64,
+            DEAL_RESULTS.index(result), min(iters, 0xFFFFFFFF),
+            min(moves, 0xFFFF)))
+        deals[seed] = (result, iters, moves)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def getSeeds(self, result='solved'):
+        return sorted(seed for seed, r in self._getDeals().items()
+                      if r[0] == result)
+
+    def chooseDeal(self, random, result='solved'):
+        # a random game number with that result or None (e.g. for
+        # starting a solvable deal)
+        seeds = self.getSeeds(result)
+        if not seeds:
+            return None
+        return random.choice(seeds)
+
+
+# ************************************************************************
+# * Scanning: the deals are dealt by a headless game (see headless.py)
+# * and solved by its Solver_Class, in a pool of worker processes.
+# ************************************************************************
+
+class _ScanDialog:
+    # takes the progress texts of the solver (see Base_Solver_Hint)
+    def __init__(self):
+        self.iters = 0
+
+    def setText(self, **kw):
+        if kw.get('iter'):
+            self.iters = kw['iter']
+
+
+_worker = None
+
+
+def _initWorker(gameid, options):
+    global _worker
+    game = createGame(gameid)
+    if game.Solver_Class is None:
+        raise ValueError('game {} has no solver'.format(gameid))
+    _worker = (game, options)
+
+
+def _scanDeal(seed):
+    # returns (seed, result, iterations, solution length)
+    game, options = _worker
+    dealGame(game, seed)
+    dialog = _ScanDialog()
+    solver = game.Solver_Class(game, dialog)
+    solver.config(progress=False, **options)
+    try:
+        solver.computeHints()
+    except RuntimeError:
+        # the solver is missing
+        raise
+    except Exception:
+        return seed, 'error', 0, 0
+    result = solver.solver_state
+    if result == 'timeout':
+        result = 'intractable'
+    elif result not in DEAL_RESULTS:
+        result = 'error'
+    return seed, result, dialog.iters, len(solver.hints) - 1
+
+
+def scanDeals(gameid, seeds, filename, processes=0, max_iters=100000,
+              preset=None, timeout=None, rescan=False, progress=None):
+    """
+    Solves the deals of seeds (game numbers) of game gameid and appends
+    the results to the DealIndex filename; deals already in it are
+    skipped unless rescan. progress(done, total) is called after every
+    deal. Runs in a pool of that many processes if processes > 1.
+    Returns a dict with the number of deals of each result and the
+    deals per second.
+    """
+
+    index = DealIndex(filename, gameid)
+    if not rescan:
+        seeds = [seed for seed in seeds if seed not in index]
+    else:
+        seeds = list(seeds)
+    options = {'max_iters': max_iters, 'preset': preset, 'timeout': timeout}
+    report = dict.fromkeys(DEAL_RESULTS, 0)
+    start = time.time()
+    try:
+        if processes > 1:
+            chunksize = max(1, min(100, len(seeds) // (processes * 4)))
+            with multiprocessing.Pool(processes, _initWorker,
+                                      (gameid, options)) as pool:
+                for i, r in enumerate(pool.imap_unordered(
+                        _scanDeal, seeds, chunksize)):
+                    index.add(*r)
+                    report[r[1]] += 1
+                    if progress:
+                        progress(i + 1, len(seeds))
+        else:
+            _initWorker(gameid, options)
+            for i, seed in enumerate(seeds):
+                r = _scanDeal(seed)
+                index.add(*r)
+                report[r[1]] += 1
+                if progress:
+                    progress(i + 1, len(seeds))
+    finally:
+        index.close()
+    elapsed = time.time() - start
+    report['deals'] = len(seeds)
+    report['elapsed'] = elapsed
+    report['deals_per_second'] = len(seeds) / elapsed if elapsed else 0.0
+    return report
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import hashlib
+import os
+from collections import OrderedDict
+
+
+# ************************************************************************
+# * A directory of generated files (previews, ...) with a size limit.
+# *
+# * A file is found by a key (a tuple of strings and numbers), its name
+# * is a hash of the key. When the files are larger than max_size the
+# * least recently used ones are removed; the modification time of a
+# * file is its last use, so the order survives a restart. A file may
+# * have a short text (e.g. the seed of a preview) in a sidecar file
+# * with the suffix INFO_SUFFIX, removed with it.
+# ************************************************************************
+
+class FileCache:
+    INFO_SUFFIX = ".info"
+
+    def __init__(self, dirname, max_size, suffix=""):
+        self.dirname = dirname
+        self.max_size = max_size
+        self.suffix = suffix
+        self._files = None              # name -> size, least recent first
+        self._size = 0
+
+    def _getFiles(self):
+        # the directory is read at the first use
+        if self._files is None:
+            entries = []
+            try:
+                for entry in os.scandir(self.dirname):
+                    if entry.is_file() and entry.name.endswith(self.suffix) \
+                            and not entry.name.endswith(".tmp"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, entry.name, st.st_size))
+            except OSError:
+                pass
+            entries.sort()
+            self._files = OrderedDict((name, size)
+                                      for mtime, name, size in entries)
+            self._size = sum(self._files.values())
+        return self._files
+
+    def _getName(self, key):
+        return hashlib.md5(repr(key).encode("utf-8")).hexdigest() + \
+            self.suffix
+
+    def get(self, key):
+        # returns the filename of key or None
+        name = self._getName(key)
+        files = self._getFiles()
+        if name not in files:
+            return None
+        filename = os.path.join(self.dirname, name)
+        try:
+            os.utime(filename, None)
+        except OSError:
+            # removed by another process
+            self._size -= files.pop(name)
+            return None
+        files.move_to_end(name)
+        return filename
+
+    def getInfo(self, key):
+        # returns the text of key's file or None
+        filename = os.path.join(self.dirname, self._getName(key))
+        try:
+            with open(filename + self.INFO_SUFFIX, encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key, write, info=None):
+        # write(filename) writes the file of key; returns its filename
+        name = self._getName(key)
+        files = self._getFiles()
+        filename = os.path.join(self.dirname, name)
+        tmpname = filename + ".tmp"
+        if not os.path.exists(self.dirname):
+            os.makedirs(self.dirname)
+        infoname = filename + self.INFO_SUFFIX
+        if os.path.exists(infoname):
+            # of the old file
+            os.remove(infoname)
+        try:
+            write(tmpname)
+            size = os.path.getsize(tmpname)
+            os.replace(tmpname, filename)
+        finally:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+        if info is not None:
+            # after the file: a file without its info is incomplete
+            with open(infoname, "w", encoding="utf-8") as f:
+                f.write(info)
+        self._size += size - files.pop(name, 0)
+        files[name] = size
+        self._evict()
+        return filename
+
+    def _evict(self):
+        files = self._files
+        while self._size > self.max_size and len(files) > 1:
+            name, size = files.popitem(last=False)
+            self._size -= size
+            self._remove(name)
+
+    def _remove(self, name):
+        filename = os.path.join(self.dirname, name)
+        for filename in (filename, filename + self.INFO_SUFFIX):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def getSize(self):
+        self._getFiles()
+        return self._size
+
+    def clear(self):
+        for name in list(self._getFiles()):
+            self._remove(name)
+        self._files.clear()
+        self._size = 0
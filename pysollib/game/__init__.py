@@ -25,9 +25,6 @@
 import math
 import time
 import traceback
-import urllib.parse
-import requests
-import json
 from pickle import Pickler, Unpickler, UnpicklingError
 
 import attr
@@ -36,9 +33,13 @@ from pysol_cards.cards import ms_rearrange
 from pysol_cards.random import random__int2str
 
 from pysollib.game.dump import pysolDumpGame
+from pysollib.game.hintcache import HintCache
+from pysollib.game.snapshots import SnapshotHash, SnapshotStore
 from pysollib.gamedb import GI
 from pysollib.help import help_about
 from pysollib.hint import DefaultHint
+from pysollib.hintsearch import searchHintClass
+from pysollib.leaderboard import LEADERBOARD_SERVER_BASE_URL
 from pysollib.mfxutil import Image, ImageTk, USE_PIL
 from pysollib.mfxutil import Struct, SubclassResponsibility, destruct
 from pysollib.mfxutil import format_time, print_err
@@ -72,6 +73,8 @@ from pysollib.struct_new import NewStruct
 
 import random2
 
+import requests
+
 import six
 from six import BytesIO
 from six.moves import range
@@ -89,7 +92,6 @@ assert getattr(attr, '__version_info__', (0, 0, 0)) >= (18, 2, 0), (
 
 PLAY_TIME_TIMEOUT = 200
 S_PLAY = 0x40
-LEADERBOARD_SERVER_BASE_URL = "http://ec2-3-249-19-236.eu-west-1.compute.amazonaws.com"
 
 # ************************************************************************
 # * Base class for all solitaire games
@@ -551,8 +553,9 @@ class Game(object):
         self.stackmap = {}              # dict with (x,y) tuples as key
         self.allstacks = []
         self.sn_groups = []  # snapshot groups; list of list of similar stacks
-        self.snapshots = []
-        self.failed_snapshots = []
+        self.snapshots = self.createSnapshotStore()
+        self.failed_snapshots = self.createSnapshotStore()
+        self.snapshot_hash = None
         self.stackdesc_list = []
         self.demo_logo = None
         self.pause_logo = None
@@ -584,6 +587,7 @@ class Game(object):
         self.allstacks = tuple(self.allstacks)
         self.sg.to_tuples()
         self.s.to_tuples()
+        self.snapshot_hash = SnapshotHash(self.allstacks)
         # init the stack view
         for stack in self.allstacks:
             stack.prepareStack()
@@ -652,9 +656,10 @@ class Game(object):
         #
         self.stats.update_time = time.time()
         self.showHelp()                 # just in case
-        hint_class = self.getHintClass()
-        if hint_class is not None:
-            self.Stuck_Class = hint_class(self, 0)
+        # the stuck check only needs to know whether there is a hint, so
+        # it does without the search hints (see getHintClass)
+        if self.Hint_Class is not None:
+            self.Stuck_Class = self.Hint_Class(self, 0)
         self.busy = old_busy
 
     def _checkGame(self):
@@ -739,6 +744,7 @@ class Game(object):
         self.preview = max(1, self.canvas.preview)
         # create game
         self.createGame()
+        self.snapshot_hash = SnapshotHash(self.allstacks)
         # set some defaults
         self.sg.openstacks = [s for s in self.sg.openstacks
                               if s.cap.max_accept >= s.cap.min_accept]
@@ -771,8 +777,10 @@ class Game(object):
         self.hints = GameHints()
         self.saveinfo = GameSaveInfo()
         self.loadinfo = GameLoadInfo()
-        self.snapshots = []
-        self.failed_snapshots = []
+        self.snapshots = self.createSnapshotStore()
+        self.failed_snapshots = self.createSnapshotStore()
+        self.snapshot_strings = {}      # for checkSnapshotHash()
+        self.hint_cache = HintCache(self.HINT_CACHE_SIZE)
         # local statistics are reset on each game restart
         self.stats = GameStatsStruct()
         self.startMoves()
@@ -855,6 +863,7 @@ class Game(object):
         self.startMoves()
         for stack in self.allstacks:
             stack.updateText()
+        self.snapshot_hash.resync()
         self.updateSnapshots()
         self.updateText()
         self.updateStatus(moves=(0, 0))
@@ -909,6 +918,7 @@ class Game(object):
             self.allstacks[stack_id].cap.update(cap.__dict__)
         # 5) subclass settings
         self._restoreGameHook(game)
+        self.snapshot_hash.resync()
         # 6) update view
         for stack in self.allstacks:
             stack.updateText()
@@ -995,6 +1005,7 @@ class Game(object):
         if self.preview:
             return
         self.app.wm_save_state()
+        self.app.leaderboard.flush()
         if self.pause:
             self.doPause()
         if holdgame:
@@ -1154,10 +1165,33 @@ class Game(object):
         sn = '-'.join(sn)
         return sn
 
+    # compare the snapshot hash kept by the atomic moves with a full
+    # recomputation after every move (slow, for debugging)
+    CHECK_SNAPSHOT_HASH = DEBUG >= 2
+
     def getSnapshot(self):
-        # optimisation
-        sn = hash(self.getSnapshotHash())
-        return sn
+        # games that add more state in getSnapshotHash() cannot use
+        # the hash kept by the atomic moves
+        if self.__class__.getSnapshotHash is not Game.getSnapshotHash:
+            return hash(self.getSnapshotHash())
+        if self.CHECK_SNAPSHOT_HASH:
+            self.checkSnapshotHash()
+        return self.snapshot_hash.value
+
+    def checkSnapshotHash(self):
+        sh = self.snapshot_hash
+        value = sh.value
+        if sh.resync() != value:
+            print_err('snapshot hash out of sync: %d != %d' %
+                      (value, sh.value))
+            return False
+        # different positions with the same hash would look like
+        # repeated positions
+        sn = self.getSnapshotHash()
+        if self.snapshot_strings.setdefault(sh.value, sn) != sn:
+            print_err('snapshot hash collision: %d' % sh.value)
+            return False
+        return True
 
     def createSnGroups(self):
         # group stacks by class and cap
@@ -1175,14 +1209,15 @@ class Game(object):
         sg = list(sg.values())
         self.sn_groups = sg
 
+    # the maximum number of snapshots kept, the least recently seen
+    # ones are dropped (None means no limit)
+    MAX_SNAPSHOTS = None
+
+    def createSnapshotStore(self, snapshots=()):
+        return SnapshotStore(snapshots, maxlen=self.MAX_SNAPSHOTS)
+
     def updateSnapshots(self):
-        sn = self.getSnapshot()
-        if sn in self.snapshots:
-            # self.updateStatus(snapshot=True)
-            pass
-        else:
-            self.snapshots.append(sn)
-            # self.updateStatus(snapshot=False)
+        self.snapshots.visit(self.getSnapshot())
 
     # Create all cards for the game.
     def createCards(self, progress=None):
@@ -1982,6 +2017,8 @@ class Game(object):
     Stuck_Class = None
 
     def getHintClass(self):
+        if self.app.opt.search_hints:
+            return searchHintClass(self.Hint_Class)
         return self.Hint_Class
 
     def getStrictness(self):
@@ -2491,8 +2528,27 @@ class Game(object):
         hint_class = self.getHintClass()
         if hint_class is None:
             return None
-        hint = hint_class(self, level)      # call constructor
-        return hint.getHints(taken_hint)    # and return all hints
+        if taken_hint and taken_hint[6]:
+            # the forced move of the taken hint
+            hint = hint_class(self, level)
+            return hint.getHints(taken_hint)
+        key = self.getHintKey(hint_class, level)
+        hints = self.hint_cache.get(key)
+        if hints is None:
+            hint = hint_class(self, level)      # call constructor
+            hints = hint.getHints()             # and return all hints
+            self.hint_cache.put(key, hints)
+        return hints
+
+    # the number of positions of hint_cache
+    HINT_CACHE_SIZE = 100
+
+    def getHintKey(self, hint_class, level):
+        # the hints depend on the cards, the talon round and the
+        # saved vars of the game (see getState)
+        talon = self.s.talon
+        return (hint_class, level, self.getSnapshot(),
+                talon and talon.round, repr(self.getState()))
 
     # give a hint
     def showHint(self, level=0, sleep=1.5, taken_hint=None):
@@ -2605,7 +2661,7 @@ class Game(object):
             mixed=mixed,
             sleep=self.app.opt.timeouts['demo'],
             last_deal=[],
-            snapshots=[],
+            snapshots=self.createSnapshotStore(),
             hint=None,
             keypress=None,
             start_demo_moves=self.stats.demo_moves,
@@ -2776,11 +2832,9 @@ class Game(object):
                 demo.last_deal.append(c)
             else:                       # new version, based on snapshots
                 # check snapshot
-                sn = self.getSnapshot()
-                if sn in demo.snapshots:
+                if demo.snapshots.visit(self.getSnapshot()):
                     # not unique
                     return 1
-                demo.snapshots.append(sn)
         elif from_stack == to_stack:
             # a flip-move
             from_stack.flipMove(animation=True)
@@ -2870,17 +2924,19 @@ class Game(object):
         self.canvas.setTopImage(self.demo_logo)
 
     def getStuck(self):
-        h = self.Stuck_Class.getHints(None)
+        key = self.getHintKey(self.Stuck_Class.__class__, 0)
+        h = self.hint_cache.get(key)
+        if h is None:
+            h = self.Stuck_Class.getHints(None)
+            self.hint_cache.put(key, h)
         if h:
-            self.failed_snapshots = []
+            self.failed_snapshots.clear()
             return True
         if not self.canDealCards():
             return False
         # can deal cards: do we have any hints in previous deals ?
-        sn = self.getSnapshot()
-        if sn in self.failed_snapshots:
+        if self.failed_snapshots.visit(self.getSnapshot()):
             return False
-        self.failed_snapshots.append(sn)
         return True
 
     def updateStuck(self):
@@ -3121,7 +3177,7 @@ class Game(object):
         self.updateStatus(moves=(self.moves.index, self.stats.total_moves))
         self.updateMenus()
         self.updateStatus(stuck='')
-        self.failed_snapshots = []
+        self.failed_snapshots.clear()
         reset_solver_dialog()
 
     def redo(self):
@@ -3380,8 +3436,9 @@ class Game(object):
             game.gsaveinfo.__dict__.update(gsaveinfo.__dict__)
         moves = pload(GameMoves)
         game.moves.__dict__.update(moves.__dict__)
+        # saved as a plain list
         snapshots = pload(list)
-        game.snapshots = snapshots
+        game.snapshots = game.createSnapshotStore(snapshots)
         if 0 <= bookmark <= 1:
             gstats = pload(GameGlobalStatsStruct)
             game.gstats.__dict__.update(gstats.__dict__)
@@ -3535,39 +3592,29 @@ class Game(object):
 
     def _update_leaderboard(self, score: int):
         """
-        Updates the leaderboard score with the current player.
-        This does not throw an exception if something goes wrong!
+        Queues a leaderboard score update for the current player.
+        The upload happens in the background (see LeaderboardUploader),
+        so this never blocks and never throws.
         """
-        
-        player = self.app.opt.player
-        path = f"/api/leaderboard/{urllib.parse.quote(player)}"
-        url = f"{LEADERBOARD_SERVER_BASE_URL}{path}"
-        body = {
-            "score": score,
-        }
-        headers = {
-            "Content-Type": "application/json",
-        }
-        try:
-            r = requests.put(url, data=json.dumps(body), headers=headers)
-            if r.status_code != 200 and r.status_code != 204:
-                print(r.text)
-        except Exception as e:
-            # Do not crash the game if the score can not be updated
-            print(e)
-
-    def get_leaderboard(self):
+        self.app.leaderboard.submit(self.app.opt.player, score)
+
+    def get_leaderboard(self, limit=20, offset=0, around=None):
         """
-        Returns leaderboard scores for all players.
+        Returns one page of leaderboard scores (dicts with player, score
+        and rank), best score first. If around is a player name, the
+        page is centered on that player instead of starting at offset.
         This may throw if something goes wrong!
         """
-        
-        path = f"/api/leaderboard"
+
+        path = "/api/leaderboard"
         url = f"{LEADERBOARD_SERVER_BASE_URL}{path}"
         headers = {
             "Accept": "application/json",
         }
-        r = requests.get(url, headers=headers)
+        params = {"limit": limit, "offset": offset}
+        if around is not None:
+            params["around"] = around
+        r = requests.get(url, headers=headers, params=params, timeout=10)
         if r.status_code != 200 and r.status_code != 204:
             raise Exception(r.text)
         return r.json()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from collections import OrderedDict
+
+
+# ************************************************************************
+# * The hints of the positions of a game (see Game.getHints and
+# * Game.getStuck), so that a position is not hinted again by the hint,
+# * the stuck check and the demo.
+# *
+# * A key is the hint class, the hint level and the position (see
+# * Game.getHintKey), so a cached result is valid as long as the game
+# * object is; a real move changes the key. Only maxlen results are
+# * kept, the least recently used ones are dropped.
+# ************************************************************************
+
+class HintCache:
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._hints = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        # returns the hints or None
+        hints = self._hints.get(key)
+        if hints is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._hints.move_to_end(key)
+        return hints
+
+    def put(self, key, hints):
+        if self.maxlen <= 0:
+            return
+        self._hints[key] = hints
+        self._hints.move_to_end(key)
+        if len(self._hints) > self.maxlen:
+            self._hints.popitem(last=False)
+
+    def clear(self):
+        self._hints.clear()
+
+    def __len__(self):
+        return len(self._hints)
+
+    def getHitRate(self):
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import random
+from collections import OrderedDict
+
+
+# ************************************************************************
+# * The positions (snapshot hashes, see Game.getSnapshot) a game has
+# * been in, with O(1) membership tests.
+# *
+# * Snapshots are kept in insertion order, so that savegames still store
+# * them as a plain list (see pysolDumpGame). With maxlen, the least
+# * recently seen snapshots are dropped once there are more than that.
+# ************************************************************************
+
+class SnapshotStore:
+    def __init__(self, snapshots=(), maxlen=None):
+        self.maxlen = maxlen
+        self._snapshots = OrderedDict()
+        for sn in snapshots:
+            self.add(sn)
+
+    def __contains__(self, sn):
+        return sn in self._snapshots
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def __iter__(self):
+        return iter(self._snapshots)
+
+    def __repr__(self):
+        return "SnapshotStore(%r)" % (list(self._snapshots),)
+
+    def add(self, sn):
+        # add a snapshot, or refresh it if there is a limit
+        snapshots = self._snapshots
+        if sn in snapshots:
+            if self.maxlen is not None:
+                snapshots.move_to_end(sn)
+            return
+        snapshots[sn] = None
+        if self.maxlen is not None and len(snapshots) > self.maxlen:
+            snapshots.popitem(last=False)
+
+    def visit(self, sn):
+        # add a snapshot, return True if it was already there
+        seen = sn in self._snapshots
+        self.add(sn)
+        return seen
+
+    def clear(self):
+        self._snapshots.clear()
+
+    def toList(self):
+        return list(self._snapshots)
+
+
+# ************************************************************************
+# * A hash of all cards of a game (suit, rank and face of every card in
+# * every stack), kept up to date by the atomic moves (see move.py), so
+# * that Game.getSnapshot() doesn't have to walk all stacks after
+# * every move.
+# *
+# * Each stack has a polynomial hash of its cards, sum(code * BASE**i)
+# * with i the position in the stack, so adding or removing the top
+# * cards or flipping a card only changes a few terms. The game value is
+# * the sum of the stack hashes times a random key per stack.
+# ************************************************************************
+
+MODULUS = (1 << 61) - 1
+BASE = 1000003
+
+# the stack keys are shared for the lifetime of the process
+_stack_keys = []
+_stack_keys_random = random.Random(0x5eed)
+
+
+def _getStackKeys(nstacks):
+    while len(_stack_keys) < nstacks:
+        _stack_keys.append(_stack_keys_random.randrange(1, MODULUS))
+    return _stack_keys[:nstacks]
+
+
+def cardCode(card):
+    # 0 is never used, so that trailing cards always count
+    return (card.suit << 9 | card.rank << 1 | card.face_up) + 1
+
+
+class SnapshotHash:
+    def __init__(self, stacks):
+        self.stacks = stacks
+        self.keys = _getStackKeys(len(stacks))
+        self.powers = [1]
+        self.hashes = [0] * len(stacks)
+        self.value = 0
+        self.resync()
+
+    def _getPowers(self, n):
+        powers = self.powers
+        while len(powers) < n:
+            powers.append(powers[-1] * BASE % MODULUS)
+        return powers
+
+    def _setHash(self, stack_id, h):
+        h %= MODULUS
+        self.value = (self.value +
+                      (h - self.hashes[stack_id]) * self.keys[stack_id]
+                      ) % MODULUS
+        self.hashes[stack_id] = h
+
+    def computeStack(self, stack):
+        powers = self._getPowers(len(stack.cards))
+        h = 0
+        for i, card in enumerate(stack.cards):
+            h += cardCode(card) * powers[i]
+        return h % MODULUS
+
+    def compute(self):
+        # the value from scratch, for resync() and consistency checks
+        value = 0
+        for stack, key in zip(self.stacks, self.keys):
+            value += self.computeStack(stack) * key
+        return value % MODULUS
+
+    def resync(self):
+        # after changes the atomic moves did not follow (a new deal,
+        # a loaded game)
+        self.hashes = [self.computeStack(s) for s in self.stacks]
+        self.value = sum(h * k for h, k in zip(self.hashes, self.keys)
+                         ) % MODULUS
+        return self.value
+
+    def updateStack(self, stack):
+        # any change to the cards of a single stack
+        self._setHash(stack.id, self.computeStack(stack))
+
+    def moveCards(self, from_stack, to_stack, cards):
+        # cards were removed from the top of from_stack and are about
+        # to be added to to_stack (adding them can start other moves,
+        # see Stack.closeStack)
+        n = len(cards)
+        i, j = len(from_stack.cards), len(to_stack.cards)
+        powers = self._getPowers(max(i, j) + n)
+        removed = added = 0
+        for k, card in enumerate(cards):
+            code = cardCode(card)
+            removed += code * powers[i + k]
+            added += code * powers[j + k]
+        self._setHash(from_stack.id, self.hashes[from_stack.id] - removed)
+        self._setHash(to_stack.id, self.hashes[to_stack.id] + added)
+
+    def flipCard(self, stack, pos=-1):
+        # the card at pos was flipped
+        pos %= len(stack.cards)
+        card = stack.cards[pos]
+        delta = card.face_up and 1 or -1
+        h = self.hashes[stack.id] + delta * self._getPowers(pos + 1)[pos]
+        self._setHash(stack.id, h)
+
+    def flipAndMoveCard(self, from_stack, to_stack, card):
+        # card was flipped and removed from the top of from_stack and
+        # is about to be added to to_stack
+        i, j = len(from_stack.cards), len(to_stack.cards)
+        powers = self._getPowers(max(i, j) + 1)
+        code = cardCode(card)
+        old_code = code - (card.face_up and 1 or -1)
+        self._setHash(from_stack.id,
+                      self.hashes[from_stack.id] - old_code * powers[i])
+        self._setHash(to_stack.id,
+                      self.hashes[to_stack.id] + code * powers[j])
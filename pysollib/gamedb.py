@@ -21,6 +21,9 @@
 #
 # ---------------------------------------------------------------------------##
 
+import importlib
+from contextlib import contextmanager
+
 import pysollib.settings
 from pysollib.mfxutil import Struct, print_err
 from pysollib.mygettext import _, n_
@@ -698,6 +701,34 @@ class GameInfo(Struct):
                         si=gi_si, rules_filename=rules_filename)
 
 
+# ************************************************************************
+# * A GameInfo read from the game manifest (see gamemanifest.py). The
+# * game module is imported when the game class is first needed; it
+# * registers its games again, which sets the gameclass of the
+# * LazyGameInfo objects.
+# ************************************************************************
+
+class LazyGameInfo(GameInfo):
+    def __init__(self, module, has_solver, **kw):
+        Struct.__init__(self, module=module, has_solver=has_solver, **kw)
+
+    def __getattr__(self, name):
+        # only called for missing attributes
+        if name != 'gameclass':
+            raise AttributeError(name)
+        GAME_DB.loadGameModule(self.module)
+        if 'gameclass' not in self.__dict__:
+            raise GameInfoException("game %s not found in module %s" %
+                                    (self.id, self.module))
+        return self.__dict__['gameclass']
+
+    def isLoaded(self):
+        return 'gameclass' in self.__dict__
+
+    def setGameClass(self, gameclass):
+        self.__dict__['gameclass'] = gameclass
+
+
 class GameManager:
     def __init__(self):
         self.__selected_key = -1
@@ -709,12 +740,14 @@ class GameManager:
         self.__games_by_altname = None
         self.__all_games = {}           # includes hidden games
         self.__all_gamenames = {}       # includes hidden games
+        self.__all_gameclasses = {}     # includes hidden games
         self.__games_for_solver = []
         self.check_game = True
         self.current_filename = None
         self.registered_game_types = {}
         self.callback = None            # update progress-bar (see main.py)
         self._num_games = 0             # for callback only
+        self.__loading_modules = 0      # see loadGameModule
 
     def setCallback(self, func):
         self.callback = func
@@ -740,12 +773,11 @@ class GameManager:
             raise GameInfoException("duplicate game name %s: %s and %s" %
                                     (gi.name, str(gi.gameclass),
                                      str(gameclass)))
-        if 1:
-            for id, game in self.__all_games.items():
-                if gi.gameclass is game.gameclass:
-                    raise GameInfoException(
-                        "duplicate game class %s: %s and %s" %
-                        (gi.id, str(gi.gameclass), str(game.gameclass)))
+        if gi.gameclass in self.__all_gameclasses:
+            game = self.__all_gameclasses[gi.gameclass]
+            raise GameInfoException(
+                "duplicate game class %s: %s and %s" %
+                (gi.id, str(gi.gameclass), str(game.gameclass)))
         for n in gi.altnames:
             if n in self.__all_gamenames:
                 raise GameInfoException("duplicate game altname %s: %s" %
@@ -755,13 +787,34 @@ class GameManager:
         # print gi.id, gi.short_name.encode('utf-8')
         if not isinstance(gi, GameInfo):
             raise GameInfoException("wrong GameInfo class")
-        if self.check_game and pysollib.settings.CHECK_GAMES:
+        lazy = isinstance(gi, LazyGameInfo)
+        old_gi = self.__all_games.get(gi.id)
+        if self.__loading_modules:
+            # a game module imported for a LazyGameInfo
+            if isinstance(old_gi, LazyGameInfo) and not old_gi.isLoaded():
+                old_gi.setGameClass(gi.gameclass)
+                self.__all_gameclasses.setdefault(gi.gameclass, old_gi)
+                return
+            if old_gi is not None:
+                # replaced by a plugin
+                return
+        elif isinstance(old_gi, LazyGameInfo) and not old_gi.isLoaded():
+            # a plugin replaces a game or imports a game module
+            self._unregister(old_gi)
+            old_gi = None
+        if self.check_game and pysollib.settings.CHECK_GAMES and not lazy:
             self._check_game(gi)
         # if 0 and gi.si.game_flags & GI.GT_XORIGINAL:
         #     return
         # print gi.id, gi.name
         gi.altnames = sorted(gi.altnames)
+        if old_gi is not None and \
+                self.__all_gameclasses.get(old_gi.gameclass) is old_gi:
+            # a custom game saved again
+            del self.__all_gameclasses[old_gi.gameclass]
         self.__all_games[gi.id] = gi
+        if not lazy:
+            self.__all_gameclasses.setdefault(gi.gameclass, gi)
         self.__all_gamenames[gi.name] = gi
         for n in gi.altnames:
             self.__all_gamenames[n] = gi
@@ -782,8 +835,11 @@ class GameManager:
 #                      if gi.id in k: break
 #                  else:
 #                      print gi.id
-            if hasattr(gi.gameclass, 'Solver_Class') and \
-               gi.gameclass.Solver_Class is not None:
+            if lazy:
+                if gi.has_solver:
+                    self.__games_for_solver.append(gi.id)
+            elif hasattr(gi.gameclass, 'Solver_Class') and \
+                    gi.gameclass.Solver_Class is not None:
                 self.__games_for_solver.append(gi.id)
         if self.current_filename is not None:
             gi.gameclass.MODULE_FILENAME = self.current_filename
@@ -792,6 +848,36 @@ class GameManager:
             self.callback()
         self._num_games += 1
 
+    def _unregister(self, gi):
+        del self.__all_games[gi.id]
+        for names in (self.__all_gamenames, self.__gamenames):
+            for n in [gi.name] + list(gi.altnames):
+                if names.get(n) is gi:
+                    del names[n]
+        if self.__games.get(gi.id) is gi:
+            del self.__games[gi.id]
+            self.__games_by_id = None
+            self.__games_by_name = None
+            self.registered_game_types[gi.si.game_type] -= 1
+            if gi.id in self.__games_for_solver:
+                self.__games_for_solver.remove(gi.id)
+
+    def loadGameModule(self, modname):
+        # import the module of a LazyGameInfo
+        self.__loading_modules += 1
+        try:
+            importlib.import_module(modname)
+        finally:
+            self.__loading_modules -= 1
+
+    @contextmanager
+    def bulkRegistration(self):
+        # register many games (importing the game modules at startup)
+        # and build the sorted lists once at the end
+        yield self
+        self.getGamesIdSortedById()
+        self.getGamesIdSortedByName()
+
     #
     # access games database - we do not expose hidden games
     #
@@ -800,6 +886,10 @@ class GameManager:
         # return self.__all_games
         return list(self.__games.values())
 
+    def getAllGameInfos(self):
+        # includes hidden games
+        return list(self.__all_games.values())
+
     def getGamesIdSortedById(self):
         if self.__games_by_id is None:
             lst = list(self.__games.keys())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import importlib.util
+import json
+import os
+import sys
+import zlib
+
+import pysollib
+import pysollib.settings
+from pysollib.gamedb import GAME_DB, GI, LazyGameInfo
+from pysollib.mfxutil import Struct
+from pysollib.mygettext import _
+
+
+# ************************************************************************
+# * The game manifest (games.json in the data dir) lists the GameInfo
+# * of every game of the game packages together with the module that
+# * registers it, so that the games can be registered at startup without
+# * importing the game modules (see LazyGameInfo).
+# *
+# * It is written by scripts/build_game_manifest.py. The names are
+# * stored untranslated. The manifest is stale (and the modules are
+# * imported as before) when a module file of the game packages was
+# * added, removed or changed, or when PySol was updated.
+# *
+# * The game packages import all their modules in __init__.py, so the
+# * packages are put in sys.modules without running __init__.py before
+# * a single game module is imported.
+# ************************************************************************
+
+MANIFEST_VERSION = 1
+
+GAME_PACKAGES = (
+    'pysollib.games',
+    'pysollib.games.ultra',
+    'pysollib.games.mahjongg',
+    'pysollib.games.special',
+)
+
+
+def _getPackageDir(package):
+    return os.path.join(os.path.dirname(pysollib.__file__),
+                        *package.split('.')[1:])
+
+
+def _getFileStamps():
+    # (size, crc32) of the modules and __init__.py of the game packages;
+    # not the mtime, which changes with every checkout or installation
+    stamps = {}
+    for package in GAME_PACKAGES:
+        dirname = _getPackageDir(package)
+        for name in os.listdir(dirname):
+            if name.endswith('.py'):
+                with open(os.path.join(dirname, name), 'rb') as f:
+                    data = f.read()
+                stamps[package + '.' + name[:-3]] = \
+                    [len(data), zlib.crc32(data) & 0xffffffff]
+    return stamps
+
+
+def _installPackages():
+    # the game packages without running their __init__.py
+    for package in GAME_PACKAGES:
+        dirname = _getPackageDir(package)
+        spec = importlib.util.spec_from_file_location(
+            package, os.path.join(dirname, '__init__.py'),
+            submodule_search_locations=[dirname])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[package] = module
+        parent, name = package.rsplit('.', 1)
+        setattr(sys.modules[parent], name, module)
+
+
+def _isImported():
+    return any(package in sys.modules for package in GAME_PACKAGES)
+
+
+# ************************************************************************
+# * build
+# ************************************************************************
+
+def buildManifest():
+    # import the game packages as main.py does and record the module
+    # that registers each game; this needs an interpreter where no game
+    # module was imported
+    assert not _isImported()
+    pysollib.settings.TRANSLATE_GAME_NAMES = False
+    modules = {}
+    register = GAME_DB.register
+
+    def recordModule(gi):
+        modules[gi.id] = _getImportingModule()
+        register(gi)
+    GAME_DB.register = recordModule
+    try:
+        for package in GAME_PACKAGES:
+            importlib.import_module(package)
+    finally:
+        del GAME_DB.register
+    return {
+        'version': MANIFEST_VERSION,
+        'pysol_version': pysollib.settings.VERSION,
+        'files': _getFileStamps(),
+        'games': [_getGameEntry(gi, modules[gi.id])
+                  for gi in GAME_DB.getAllGameInfos()],
+    }
+
+
+def _getImportingModule():
+    # the innermost game module that is being imported
+    frame = sys._getframe(1)
+    while frame is not None:
+        name = frame.f_globals.get('__name__', '')
+        if frame.f_code.co_name == '<module>' and \
+                name.startswith('pysollib.games.'):
+            return name
+        frame = frame.f_back
+    raise ValueError("game not registered by a game module")
+
+
+def _getGameEntry(gi, modname):
+    entry = dict((k, v) for k, v in gi.__dict__.items()
+                 if k not in ('gameclass', 'si'))
+    entry['si'] = dict(gi.si.__dict__)
+    entry['module'] = modname
+    entry['has_solver'] = getattr(gi.gameclass, 'Solver_Class',
+                                  None) is not None
+    return entry
+
+
+def writeManifest(filename):
+    manifest = buildManifest()
+    with open(filename, 'w') as f:
+        json.dump(manifest, f, indent=0, sort_keys=True)
+    return len(manifest['games'])
+
+
+# ************************************************************************
+# * load
+# ************************************************************************
+
+def loadManifest(filename, french_only=False):
+    # register the games of the manifest; returns False if the manifest
+    # is missing or stale, or the game modules are already imported
+    try:
+        with open(filename) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return False
+    if manifest.get('version') != MANIFEST_VERSION or \
+            manifest.get('pysol_version') != pysollib.settings.VERSION or \
+            _isImported() or manifest.get('files') != _getFileStamps():
+        return False
+    _installPackages()
+    for entry in manifest['games']:
+        if french_only and entry['module'].count('.') > 2:
+            continue
+        GAME_DB.register(_getLazyGameInfo(entry))
+    return True
+
+
+def _getLazyGameInfo(entry):
+    kw = dict(entry)
+    kw['si'] = Struct(**kw['si'])
+    for key in ('suits', 'ranks', 'trumps', 'altnames'):
+        kw[key] = tuple(kw[key])
+    if pysollib.settings.TRANSLATE_GAME_NAMES:
+        kw['name'] = _(kw['name'])
+        kw['short_name'] = _(kw['short_name'])
+        kw['altnames'] = tuple(_(n) for n in kw['altnames'])
+    # as in GameInfo.__init__
+    for f, games in ((GI.GT_CHILDREN, GI._CHILDREN_GAMES),
+                     (GI.GT_OPEN, GI._OPEN_GAMES),
+                     (GI.GT_POPULAR, GI._POPULAR_GAMES)):
+        if (kw['si'].game_flags & f) and (kw['id'] not in games):
+            games.append(kw['id'])
+    return LazyGameInfo(**kw)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from itertools import compress
+
+from pysollib.gamedb import GI
+from pysollib.resource import CSI
+
+
+# ************************************************************************
+# * The criteria of the game search (the search tab of the select game
+# * dialog and its advanced search dialog)
+# ************************************************************************
+
+class SearchCriteria:
+    def __init__(self):
+        self.name = ""
+        self.usealt = True
+        self.category = ""
+        self.type = ""
+        self.skill = ""
+        self.decks = ""
+        self.redeals = ""
+        self.compat = ""
+        self.inventor = ""
+        self.versioncompare = "New in"
+        self.version = ""
+
+        self.popular = False
+        self.children = False
+        self.scoring = False
+        self.stripped = False
+        self.separate = False
+        self.open = False
+        self.relaxed = False
+        self.original = False
+
+        categoryOptions = {-1: ""}
+        categoryOptions.update(CSI.TYPE_NAME)
+        del categoryOptions[7]  # Navagraha Ganjifa is unused.
+        self.categoryOptions = dict((v, k) for k, v in categoryOptions.items())
+
+        typeOptions = {-1: ""}
+        typeOptions.update(GI.TYPE_NAMES)
+        del typeOptions[29]  # Simple games type is unused.
+        self.typeOptions = dict((v, k) for k, v in typeOptions.items())
+
+        skillOptions = {-1: ""}
+        skillOptions.update(GI.SKILL_LEVELS)
+        self.skillOptions = dict((v, k) for k, v in skillOptions.items())
+
+        self.deckOptions = {"": 0,
+                            "1 deck games": 1,
+                            "2 deck games": 2,
+                            "3 deck games": 3,
+                            "4 deck games": 4}
+
+        self.redealOptions = {"": -3,
+                              "No redeal": 0,
+                              "1 redeal": 1,
+                              "2 redeals": 2,
+                              "3 redeals": 3,
+                              "Unlimited redeals": -1,
+                              "Variable redeals": -2,
+                              "Other number of redeals": 4}
+
+        self.versionCompareOptions = ("New in", "Present in", "New since")
+
+
+# ************************************************************************
+# * An index of the names of the games for the game search, built once
+# * from the game database.
+# *
+# * Every game name and alternate name is an entry; the entries are
+# * sorted as the search results are shown. A set of entries is an int
+# * with one bit per entry, so a search is a few ANDs of precomputed
+# * sets instead of a loop over all games:
+# *
+# *   by_category, by_type, ...   the entries of the games with a value
+# *   by_flag                     the entries of the games with a flag
+# *   compat, inventors           the entries of the games of a group
+# *   ngrams                      the entries whose name (in upper case)
+# *                               contains a string of 1 to 3 characters
+# *
+# * The name matching is the same as App.checkSearchString().
+# ************************************************************************
+
+class GameSearchIndex:
+    NGRAM = 3
+
+    FLAGS = (
+        ('popular', GI.GT_POPULAR),
+        ('children', GI.GT_CHILDREN),
+        ('scoring', GI.GT_SCORE),
+        ('stripped', GI.GT_STRIPPED),
+        ('separate', GI.GT_SEPARATE_DECKS),
+        ('open', GI.GT_OPEN),
+        ('relaxed', GI.GT_RELAXED),
+        ('original', GI.GT_ORIGINAL),
+    )
+
+    def __init__(self, games):
+        # games: the GameInfo of the games to search (gdb.getAllGames())
+        entries = []
+        for gi in games:
+            entries.append((gi.name, gi, False))
+            for altname in gi.altnames:
+                entries.append((altname, gi, True))
+        entries.sort(key=lambda e: e[0].lower())
+        self.names = [e[0] for e in entries]
+        self.upper_names = [name.upper() for name in self.names]
+        self.all = (1 << len(entries)) - 1
+        self.primary = 0
+        self.by_category = {}
+        self.by_type = {}
+        self.by_skill = {}
+        self.by_decks = {}
+        self.by_redeals = {}
+        self.by_flag = {}
+        by_id = {}
+        ngrams = {}
+        for i, (name, gi, alt) in enumerate(entries):
+            if not alt:
+                self.primary |= 1 << i
+            for index, value in ((self.by_category, gi.category),
+                                 (self.by_type, gi.si.game_type),
+                                 (self.by_skill, gi.skill_level),
+                                 (self.by_decks, gi.decks),
+                                 (self.by_redeals, gi.redeals),
+                                 (by_id, gi.id)):
+                index.setdefault(value, []).append(i)
+            for attr, flag in self.FLAGS:
+                if gi.si.game_flags & flag:
+                    self.by_flag.setdefault(attr, []).append(i)
+            upper = self.upper_names[i]
+            for n in range(1, self.NGRAM + 1):
+                for ngram in set(upper[j:j+n]
+                                 for j in range(len(upper) - n + 1)):
+                    ngrams.setdefault(ngram, []).append(i)
+        for index in (self.by_category, self.by_type, self.by_skill,
+                      self.by_decks, self.by_redeals, self.by_flag,
+                      by_id, ngrams):
+            for key, indexes in index.items():
+                index[key] = self._toSet(indexes)
+        self.ngrams = ngrams
+        self.other_redeals = 0
+        for redeals, entries in self.by_redeals.items():
+            if redeals >= 4:
+                self.other_redeals |= entries
+        self.compat = self._getGroups(GI.GAMES_BY_COMPATIBILITY, by_id)
+        self.inventors = self._getGroups(GI.GAMES_BY_INVENTORS, by_id)
+        self.versions = [
+            (name, self._getEntries(gameids, by_id))
+            for name, gameids in GI.GAMES_BY_PYSOL_VERSION]
+
+    @staticmethod
+    def _toSet(entries):
+        s = 0
+        for i in entries:
+            s |= 1 << i
+        return s
+
+    @staticmethod
+    def _getEntries(gameids, by_id):
+        s = 0
+        for gameid in gameids:
+            s |= by_id.get(gameid, 0)
+        return s
+
+    def _getGroups(self, groups, by_id):
+        # a game must be in all the groups with the selected name
+        sets = {}
+        for name, gameids in groups:
+            s = self._getEntries(gameids, by_id)
+            sets[name] = sets.get(name, self.all) & s
+        return sets
+
+    #
+    # search
+    #
+
+    def search(self, criteria):
+        # returns the sorted names that match criteria (a SearchCriteria)
+        c = criteria
+        s = self.all if c.usealt else self.primary
+        if c.category != "":
+            s &= self.by_category.get(c.categoryOptions[c.category], 0)
+        if c.type != "":
+            s &= self.by_type.get(c.typeOptions[c.type], 0)
+        if c.skill != "":
+            s &= self.by_skill.get(c.skillOptions[c.skill], 0)
+        if c.decks != "":
+            s &= self.by_decks.get(c.deckOptions[c.decks], 0)
+        if c.redeals == "Other number of redeals":
+            s &= self.other_redeals
+        elif c.redeals != "":
+            s &= self.by_redeals.get(c.redealOptions[c.redeals], 0)
+        s &= self.compat.get(c.compat, self.all)
+        s &= self.inventors.get(c.inventor, self.all)
+        if c.version != "":
+            s &= self._getVersionSet(c.version, c.versioncompare)
+        for attr, flag in self.FLAGS:
+            if getattr(c, attr):
+                s &= self.by_flag.get(attr, 0)
+        if s:
+            s &= self._matchName(c.name)
+        return [self.names[i] for i in self._getIndexes(s)]
+
+    def _getVersionSet(self, version, compare):
+        found = False
+        s = 0
+        for name, entries in self.versions:
+            if name == version:
+                found = True
+                s |= entries
+            elif ((not found and compare == "Present in") or
+                  (found and compare == "New since")):
+                s |= entries
+        return s
+
+    def _matchName(self, search_string):
+        s = self.all
+        for term in search_string.split():
+            s &= self._matchTerm(term.upper())
+            if not s:
+                break
+        return s
+
+    def _matchTerm(self, term):
+        n = self.NGRAM
+        if len(term) <= n:
+            return self.ngrams.get(term, 0)
+        # the entries with all the ngrams of term, which contain term
+        # or not
+        s = self.all
+        for j in range(len(term) - n + 1):
+            s &= self.ngrams.get(term[j:j+n], 0)
+            if not s:
+                return 0
+        for i in self._getIndexes(s):
+            if term not in self.upper_names[i]:
+                s &= ~(1 << i)
+        return s
+
+    @staticmethod
+    def _getIndexes(s):
+        # the indexes of the bits of s, lowest first
+        return compress(range(s.bit_length()), map(int, bin(s)[:1:-1]))
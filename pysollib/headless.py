@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+from pysollib.acard import AbstractCard
+from pysollib.gamedb import GAME_DB
+from pysollib.mfxutil import Struct
+from pysollib.options import Options
+from pysollib.pysolrandom import construct_random
+
+
+# ************************************************************************
+# * Games without a GUI, for batch jobs like the deal scanner (see
+# * pysollib/dealscan.py).
+# *
+# * The game classes and their stacks are the real ones, created as a
+# * game preview (Game.createPreview) on a canvas that draws nothing;
+# * the cards have no images and the moves are not animated. A deal is
+# * the same as in the game for the same game number.
+# ************************************************************************
+
+class _NullItem:
+    # a canvas item, every method does nothing
+    def _nothing(self, *args, **kw):
+        return None
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self._nothing
+
+
+class NullCanvas(_NullItem):
+    # previews greater than 1 have no texts (see MfxCanvasText)
+    preview = 2
+
+    def __init__(self):
+        self.items = {}
+        self.xmargin = self.ymargin = 0
+        self._text_color = '#000000'
+        self._text_items = []
+        self._last_id = 0
+
+    def _create(self, itemType, args, kw):
+        self._last_id += 1
+        return self._last_id
+
+    def coords(self, *args):
+        return [0, 0]
+
+    def bbox(self, *args):
+        return (0, 0, 0, 0)
+
+
+class HeadlessCard(AbstractCard):
+    def __init__(self, id, deck, suit, rank, game, x=0, y=0):
+        AbstractCard.__init__(self, id, deck, suit, rank, game, x=x, y=y)
+        self.item = _NullItem()
+
+    def showFace(self, unhide=1):
+        self.face_up = 1
+
+    def showBack(self, unhide=1):
+        self.face_up = 0
+
+    def updateCardBackground(self, image):
+        pass
+
+
+class HeadlessImages(_NullItem):
+    # the sizes of the default cardset, for the layouts
+    CARDW, CARDH = 71, 96
+    CARD_XOFFSET, CARD_YOFFSET = 14, 20
+    CARD_DX = CARD_DY = 0
+    SHADOW_XOFFSET = SHADOW_YOFFSET = 0
+
+
+class HeadlessApp:
+    def __init__(self):
+        self.canvas = NullCanvas()
+        self.top = None
+        self.images = HeadlessImages()
+        self.audio = None
+        self.gdb = GAME_DB
+        self.opt = Options()
+        self.opt.animations = 0
+        self.opt.sound = False
+        self.opt.highlight_not_matching = False
+
+    def getFont(self, name):
+        return ('helvetica', 12)
+
+
+def loadGames():
+    # registers the games like pysollib.main.pysol_init
+    if GAME_DB.getAllGames():
+        return
+    with GAME_DB.bulkRegistration():
+        import pysollib.games
+        import pysollib.games.ultra
+        import pysollib.games.mahjongg
+        import pysollib.games.special
+        pysollib.games.special.no_use()
+
+
+def createGame(gameid, app=None):
+    # returns a game of gameid without a GUI
+    loadGames()
+    gi = GAME_DB.get(gameid)
+    if gi is None:
+        raise ValueError('unknown game: {}'.format(gameid))
+    game = gi.gameclass(gi)
+    game._createCard = \
+        lambda id, deck, suit, rank, x, y: \
+        HeadlessCard(id, deck, suit, rank, game, x=x, y=y)
+    game.createPreview(app or HeadlessApp())
+    # the stack groups are tuples like in Game.create
+    game.allstacks = tuple(game.allstacks)
+    game.sg.to_tuples()
+    game.s.to_tuples()
+    # the stuck check only needs to know whether there is a hint, so
+    # it does without the search hints (see getHintClass)
+    if game.Hint_Class is not None:
+        game.Stuck_Class = game.Hint_Class(game, 0)
+    return game
+
+
+def dealGame(game, seed):
+    # deals game number seed (see Game.newGame)
+    game.reset()
+    game.resetGame()
+    game.createRandom(construct_random(str(seed)))
+    game.shuffle()
+    game.moves.state = game.S_INIT
+    game.startGame()
+    game.startMoves()
+    game.snapshot_hash.resync()
+
+
+def playDemo(game, level=2):
+    # plays the dealt game with the demo hints like Game.demoEvent,
+    # without sleeping; returns True if the game is won
+    game.demo = Struct(
+        level=level,
+        mixed=0,
+        sleep=0,
+        last_deal=[],
+        snapshots=game.createSnapshotStore(),
+        hint=None,
+        keypress=None,
+        start_demo_moves=game.stats.demo_moves,
+        info_text=None,
+    )
+    try:
+        while True:
+            finished = game.playOneDemoMove(game.demo)
+            game.finishMove()
+            game.hints.list = None
+            if game.isGameWon():
+                return True
+            if finished:
+                return False
+    finally:
+        game.demo = None
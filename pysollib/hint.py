@@ -23,20 +23,28 @@
 
 
 import os
+import queue
 import re
+import signal
 import subprocess
+import threading
 import time
 from io import BytesIO
 
-from pysollib.mfxutil import destruct
+from pysollib.compactstate import StackView
 from pysollib.pysolrandom import construct_random
-from pysollib.settings import DEBUG, FCS_COMMAND
+from pysollib.settings import DEBUG, FCS_COMMAND, VERSION
+from pysollib.solutioncache import SolutionCache
 from pysollib.util import KING
 
 import six
 
 FCS_VERSION = None
 
+# the results of the solvers; the filename is set by the Application
+SOLUTION_CACHE_SIZE = 1000
+solution_cache = SolutionCache(SOLUTION_CACHE_SIZE)
+
 # ************************************************************************
 # * HintInterface is an abstract class that defines the public
 # * interface - it only consists of the constructor
@@ -89,8 +97,6 @@ class AbstractHint(HintInterface):
             self.score_flatten_value = 10000
         # temporaries within getHints()
         self.bonus_color = None
-        #
-        self.__clones = []
         self.reset()
 
     def __del__(self):
@@ -99,33 +105,15 @@ class AbstractHint(HintInterface):
     def reset(self):
         self.hints = []
         self.max_score = 0
-        self.__destructClones()
         self.solver_state = 'not_started'
 
     #
     # stack cloning
     #
 
-    # Create a shallow copy of a stack.
-    class AClonedStack:
-        def __init__(self, stack, stackcards):
-            # copy class identity
-            self.__class__ = stack.__class__
-            # copy model data (reference copy)
-            stack.copyModel(self)
-            # set new cards (shallow copy of the card list)
-            self.cards = stackcards[:]
-
+    # Create a copy of a stack with other cards (see compactstate.py).
     def ClonedStack(self, stack, stackcards):
-        s = self.AClonedStack(stack, stackcards)
-        self.__clones.append(s)
-        return s
-
-    def __destructClones(self):
-        for s in self.__clones:
-            s.__class__ = self.AClonedStack     # restore orignal class
-            destruct(s)
-        self.__clones = []
+        return StackView(stack, stackcards[:])
 
     # When computing hints for level 0, the scores are flattened
     # (rounded down) to a multiple of score_flatten_value.
@@ -736,9 +724,14 @@ class Base_Solver_Hint:
             'max_iters': 10000,
             'progress': False,
             'preset': None,
+            'timeout': None,            # seconds
             }
         self.hints = []
         self.hints_index = 0
+        # the key of the result in solution_cache and its moves
+        self.solution_board = None
+        self.solution_args = None
+        self.solution_moves = None
 
         # correct cards rank if foundations.base_rank != 0 (Penguin, Opus)
         if 'base_rank' in game_type:    # (Simple Simon)
@@ -773,6 +766,8 @@ class Base_Solver_Hint:
     def getHints(self, taken_hint=None):
         if taken_hint and taken_hint[6]:
             return [taken_hint[6]]
+        if self.hints_index > 0:
+            self._saveSolutionSuffix()
         h = self.hints[self.hints_index]
         if h is None:
             return None
@@ -810,21 +805,231 @@ class Base_Solver_Hint:
             return False
 
     def run_solver(self, command, board):
+        # runs the solver to the end (for short runs like --version)
+        pout, perr = SolverProcess(command, board).communicate()
+        return BytesIO(pout), BytesIO(perr)
+
+    #
+    # computing the hints: startHints() and, while an external solver
+    # is running, pollHints() from the event loop of the solver dialog
+    #
+
+    def startHints(self):
+        # returns True if an external solver was started
+        self.process = None
+        if DEBUG:
+            self.start_time = time.time()
+        self.hints = []
+        self.solver_state = 'unknown'
+        return self._startHints()
+
+    def pollHints(self, timeout=0):
+        # reads the output of the solver so far, waits at most timeout
+        # seconds for it; returns True when the hints are computed
+        process = self.process
+        if process is None:
+            return True
+        for line in process.readLines(timeout):
+            s = six.text_type(line, encoding='utf-8')
+            if DEBUG >= 5:
+                print(s)
+            self._readSolverLine(s)
+        if not process.eof:
+            if not process.isTimedOut():
+                return False
+            self.cancelHints('timeout')
+            return True
+        self.process = None
+        process.wait()
+        self._finishHints(self.hints)
+        return True
+
+    def cancelHints(self, state='cancelled'):
+        if self.process is None:
+            return
+        self.process.kill()
+        self.process = None
+        self.solver_state = state
+        self._finishHints([])
+
+    def computeHints(self):
+        if self.startHints():
+            while not self.pollHints(timeout=0.1):
+                pass
+
+    def _finishHints(self, hints):
+        if DEBUG:
+            print('time:', time.time()-self.start_time)
+        self.hints = hints
+        self.hints.append(None)
+        self._saveSolution()
+
+    #
+    # solution_cache
+    #
+
+    def _loadSolution(self, board, args):
+        # board and args (without the progress options) are the key of
+        # the result; returns True if it is cached, then the hints are
+        # computed
+        self.solution_board = board
+        self.solution_args = tuple(args)
+        result = solution_cache.get(
+            self._getSolutionSolver(), board, self.solution_args)
+        if result is None:
+            return False
+        state, moves = result
+        allstacks = self.game.allstacks
+        nstacks = len(allstacks)
+        for ncards, src, dest in moves:
+            if not 0 <= src < nstacks or \
+                    (dest is not None and not 0 <= dest < nstacks):
+                # not of this layout
+                return False
+        self.solver_state = state
+        self._finishHints(
+            [[ncards, allstacks[src],
+              None if dest is None else allstacks[dest]]
+             for ncards, src, dest in moves])
+        return True
+
+    def _getSolutionSolver(self):
+        # the moves are stack ids of the game, so the game and the
+        # version of its layout are part of the key
+        return '%s:%d:%s' % (self.__class__.__name__,
+                             self.game.gameinfo.id, VERSION)
+
+    def _saveSolution(self):
+        if self.solution_board is None or \
+                self.solver_state not in ('solved', 'intractable', 'unsolved'):
+            return
+        self.solution_moves = [
+            (ncards, src.id, None if dest is None else dest.id)
+            for ncards, src, dest in self.hints[:-1]]
+        solution_cache.put(self._getSolutionSolver(), self.solution_board,
+                           self.solution_args, self.solver_state,
+                           self.solution_moves)
+
+    def _saveSolutionSuffix(self):
+        # the player follows the solution: the rest of it is the
+        # solution of the current position (e.g. after an undo)
+        if not self.solution_moves or \
+                self.hints_index >= len(self.solution_moves):
+            return
+        solution_cache.put(self._getSolutionSolver(), self.calcBoardString(),
+                           self.solution_args, self.solver_state,
+                           self.solution_moves[self.hints_index:])
+
+
+# ************************************************************************
+# * An external solver. The board is written and the output is read by
+# * threads, so that the caller - the event loop of the solver dialog -
+# * is never blocked; the output lines are taken with readLines().
+# ************************************************************************
+
+class SolverProcess:
+    def __init__(self, command, board, timeout=None):
         if DEBUG:
             print(command)
-        kw = {'shell': True,
-              'stdin': subprocess.PIPE,
+        kw = {'stdin': subprocess.PIPE,
               'stdout': subprocess.PIPE,
               'stderr': subprocess.PIPE}
-        if os.name != 'nt':
+        if os.name == 'nt':
+            # no cmd.exe in between, kill() stops the solver itself
+            kw['shell'] = False
+        else:
+            kw['shell'] = True
             kw['close_fds'] = True
-        p = subprocess.Popen(command, **kw)
-        bytes_board = six.binary_type(board, 'utf-8')
-        pout, perr = p.communicate(bytes_board)
-        if p.returncode in (127, 1):
+            # kill() stops the shell and the solver
+            kw['start_new_session'] = True
+        try:
+            self.process = subprocess.Popen(command, **kw)
+        except OSError as err:
+            raise RuntimeError('Solver failed: {}'.format(err))
+        self.deadline = None
+        if timeout:
+            self.deadline = time.time() + timeout
+        self.eof = False
+        self.killed = False
+        self._lines = queue.Queue()
+        self._errors = []
+        self._threads = [
+            threading.Thread(target=self._readOutput,
+                             args=(six.binary_type(board, 'utf-8'),)),
+            threading.Thread(target=self._readErrors),
+            ]
+        for t in self._threads:
+            t.daemon = True
+            t.start()
+
+    def _readOutput(self, bytes_board):
+        try:
+            self.process.stdin.write(bytes_board)
+            self.process.stdin.close()
+        except OSError:
+            # the solver has exited
+            pass
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self.process.stdout.close()
+        self._lines.put(None)
+
+    def _readErrors(self):
+        for line in self.process.stderr:
+            self._errors.append(line)
+        self.process.stderr.close()
+
+    def readLines(self, timeout=0):
+        # returns the output lines read since the last call, waits at
+        # most timeout seconds for the first one; eof is set at the end
+        lines = []
+        if self.eof:
+            return lines
+        try:
+            if timeout:
+                line = self._lines.get(timeout=timeout)
+            else:
+                line = self._lines.get_nowait()
+            while line is not None:
+                lines.append(line)
+                line = self._lines.get_nowait()
+            self.eof = True
+        except queue.Empty:
+            pass
+        return lines
+
+    def isTimedOut(self):
+        return self.deadline is not None and time.time() > self.deadline
+
+    def kill(self):
+        if self.process.poll() is None:
+            try:
+                if os.name == 'nt':
+                    self.process.kill()
+                else:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                # has just exited
+                pass
+        self.killed = True
+        self.process.wait()
+
+    def wait(self):
+        # call after eof
+        returncode = self.process.wait()
+        for t in self._threads:
+            t.join()
+        if returncode in (127, 1) and not self.killed:
             # Linux and Windows return codes for "command not found" error
-            raise RuntimeError('Solver exited with {}'.format(p.returncode))
-        return BytesIO(pout), BytesIO(perr)
+            raise RuntimeError('Solver exited with {}'.format(returncode))
+        return returncode
+
+    def communicate(self):
+        lines = []
+        while not self.eof:
+            lines += self.readLines(timeout=1)
+        self.wait()
+        return b''.join(lines), b''.join(self._errors)
 
 
 use_fc_solve_lib = False
@@ -1006,7 +1211,7 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
 
         return self.board
 
-    def computeHints(self):
+    def _startHints(self):
         game = self.game
         game_type = self.game_type
         global FCS_VERSION
@@ -1035,14 +1240,17 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
             args += ['-m', '-p', '-opt', '-sel']
             if FCS_VERSION >= (4, 20, 0):
                 args += ['-hoi']
+        iter_args = []
+        self.fcs_iter_output_step = None
         if (not use_fc_solve_lib) and progress:
-            args += ['--iter-output']
-            fcs_iter_output_step = None
+            iter_args += ['--iter-output']
             if FCS_VERSION >= (4, 20, 0):
-                fcs_iter_output_step = self.options['iters_step']
-                args += ['--iter-output-step', str(fcs_iter_output_step)]
+                self.fcs_iter_output_step = self.options['iters_step']
+                iter_args += ['--iter-output-step',
+                              str(self.fcs_iter_output_step)]
             if DEBUG:
-                args += ['-s']
+                iter_args += ['-s']
+        iter_index = len(args)
         if self.options['preset'] and self.options['preset'] != 'none':
             args += ['--load-config', self.options['preset']]
         args += ['--max-iters', str(self.options['max_iters']),
@@ -1059,144 +1267,148 @@ class FreeCellSolver_Hint(Base_Solver_Hint):
         if 'esf' in game_type:
             args += ['--empty-stacks-filled-by', game_type['esf']]
 
+        self.iter_output = False
+        self.iter_ = self.depth = self.states = 0
+        self.solution_end = False
+        if self._loadSolution(board, args):
+            return False
         if use_fc_solve_lib:
             fc_solve_lib_obj.input_cmd_line(args)
             status = fc_solve_lib_obj.solve_board(board)
-        else:
-            command = FCS_COMMAND+' '+' '.join(args)
-            pout, perr = self.run_solver(command, board)
-        self.solver_state = 'unknown'
-        stack_types = {
-            'the': game.s.foundations,
-            'stack': game.s.rows,
-            'freecell': game.s.reserves,
-            }
-        if DEBUG:
-            start_time = time.time()
-        if not (use_fc_solve_lib) and progress:
-            iter_ = 0
-            depth = 0
-            states = 0
-
-            for sbytes in pout:
-                s = six.text_type(sbytes, encoding='utf-8')
-                if DEBUG >= 5:
-                    print(s)
-
-                if self.colonPrefixMatch('Iteration', s):
-                    iter_ = self._v
-                elif self.colonPrefixMatch('Depth', s):
-                    depth = self._v
-                elif self.colonPrefixMatch('Stored-States', s):
-                    states = self._v
-                    if iter_ % 100 == 0 or fcs_iter_output_step:
-                        self._setText(iter=iter_, depth=depth, states=states)
-                elif re.search('^(?:-=-=)', s):
-                    break
-                elif self._determineIfSolverState(s):
-                    break
-            self._setText(iter=iter_, depth=depth, states=states)
+            self._readLibSolution(status)
+            return False
 
+        # the --iter-output lines come first, then the solution
+        self.iter_output = progress
+        args[iter_index:iter_index] = iter_args
+        command = FCS_COMMAND+' '+' '.join(args)
+        self.process = SolverProcess(command, board,
+                                     timeout=self.options['timeout'])
+        return True
+
+    def _readLibSolution(self, status):
+        game = self.game
         hints = []
-        if use_fc_solve_lib:
-            self._setText(
-                iter=fc_solve_lib_obj.get_num_times(),
-                depth=0,
-                states=fc_solve_lib_obj.get_num_states_in_collection(),
-            )
-            if status == 0:
+        self._setText(
+            iter=fc_solve_lib_obj.get_num_times(),
+            depth=0,
+            states=fc_solve_lib_obj.get_num_states_in_collection(),
+        )
+        if status == 0:
+            m = fc_solve_lib_obj.get_next_move()
+            while m:
+                type_ = ord(m.s[0])
+                src = ord(m.s[1])
+                dest = ord(m.s[2])
+                hints.append([
+                    (ord(m.s[3]) if type_ == 0
+                     else (13 if type_ == 11 else 1)),
+                    (game.s.rows if (type_ in [0, 1, 4, 11, ])
+                     else game.s.reserves)[src],
+                    (game.s.rows[dest] if (type_ in [0, 2])
+                     else (game.s.reserves[dest]
+                           if (type_ in [1, 3]) else None))])
+
                 m = fc_solve_lib_obj.get_next_move()
-                while m:
-                    type_ = ord(m.s[0])
-                    src = ord(m.s[1])
-                    dest = ord(m.s[2])
-                    hints.append([
-                        (ord(m.s[3]) if type_ == 0
-                         else (13 if type_ == 11 else 1)),
-                        (game.s.rows if (type_ in [0, 1, 4, 11, ])
-                         else game.s.reserves)[src],
-                        (game.s.rows[dest] if (type_ in [0, 2])
-                         else (game.s.reserves[dest]
-                               if (type_ in [1, 3]) else None))])
-
-                    m = fc_solve_lib_obj.get_next_move()
-            else:
-                self.solver_state = 'unsolved'
         else:
-            for sbytes in pout:
-                s = six.text_type(sbytes, encoding='utf-8')
-                if DEBUG:
-                    print(s)
-                if self._determineIfSolverState(s):
-                    break
-                m = re.match(
-                    'Total number of states checked is ([0-9]+)\\.', s)
-                if m:
-                    self._setText(iter=int(m.group(1)))
-
-                m = re.match('This scan generated ([0-9]+) states\\.', s)
-
-                if m:
-                    self._setText(states=int(m.group(1)))
+            self.solver_state = 'unsolved'
+        self._finishHints(hints)
+
+    def _readIterOutputLine(self, s):
+        if self.colonPrefixMatch('Iteration', s):
+            self.iter_ = self._v
+        elif self.colonPrefixMatch('Depth', s):
+            self.depth = self._v
+        elif self.colonPrefixMatch('Stored-States', s):
+            self.states = self._v
+            if self.iter_ % 100 == 0 or self.fcs_iter_output_step:
+                self._setText(iter=self.iter_, depth=self.depth,
+                              states=self.states)
+        elif re.search('^(?:-=-=)', s) or self._determineIfSolverState(s):
+            self._endIterOutput()
+
+    def _endIterOutput(self):
+        self.iter_output = False
+        self._setText(iter=self.iter_, depth=self.depth, states=self.states)
+
+    def _readSolverLine(self, s):
+        if self.iter_output:
+            self._readIterOutputLine(s)
+            return
+        if self.solution_end:
+            return
+        if self._determineIfSolverState(s):
+            self.solution_end = True
+            return
+        m = re.match(
+            'Total number of states checked is ([0-9]+)\\.', s)
+        if m:
+            self._setText(iter=int(m.group(1)))
 
-                m = re.match('Move (.*)', s)
-                if not m:
-                    continue
+        m = re.match('This scan generated ([0-9]+) states\\.', s)
 
-                move_s = m.group(1)
+        if m:
+            self._setText(states=int(m.group(1)))
 
-                m = re.match(
-                    'the sequence on top of Stack ([0-9]+) to the foundations',
-                    move_s)
+        m = re.match('Move (.*)', s)
+        if not m:
+            return
 
-                if m:
-                    ncards = 13
-                    st = stack_types['stack']
-                    sn = int(m.group(1))
-                    src = st[sn]
-                    dest = None
-                else:
-                    m = re.match(
-                        '(?P<ncards>a card|(?P<count>[0-9]+) cards) '
-                        'from (?P<source_type>stack|freecell) '
-                        '(?P<source_idx>[0-9]+) to '
-                        '(?P<dest>the foundations|'
-                        '(?P<dest_type>freecell|stack) '
-                        '(?P<dest_idx>[0-9]+))\\s*', move_s)
-
-                    if not m:
-                        continue
+        stack_types = {
+            'the': self.game.s.foundations,
+            'stack': self.game.s.rows,
+            'freecell': self.game.s.reserves,
+            }
+        move_s = m.group(1)
 
-                    if m.group('ncards') == 'a card':
-                        ncards = 1
-                    else:
-                        ncards = int(m.group('count'))
+        m = re.match(
+            'the sequence on top of Stack ([0-9]+) to the foundations',
+            move_s)
 
-                    st = stack_types[m.group('source_type')]
-                    sn = int(m.group('source_idx'))
-                    src = st[sn]
+        if m:
+            ncards = 13
+            st = stack_types['stack']
+            sn = int(m.group(1))
+            src = st[sn]
+            dest = None
+        else:
+            m = re.match(
+                '(?P<ncards>a card|(?P<count>[0-9]+) cards) '
+                'from (?P<source_type>stack|freecell) '
+                '(?P<source_idx>[0-9]+) to '
+                '(?P<dest>the foundations|'
+                '(?P<dest_type>freecell|stack) '
+                '(?P<dest_idx>[0-9]+))\\s*', move_s)
+
+            if not m:
+                return
+
+            if m.group('ncards') == 'a card':
+                ncards = 1
+            else:
+                ncards = int(m.group('count'))
 
-                    dest_s = m.group('dest')
-                    if dest_s == 'the foundations':
-                        dest = None
-                    else:
-                        dt = stack_types[m.group('dest_type')]
-                        dest = dt[int(m.group('dest_idx'))]
+            st = stack_types[m.group('source_type')]
+            sn = int(m.group('source_idx'))
+            src = st[sn]
 
-                hints.append([ncards, src, dest])
+            dest_s = m.group('dest')
+            if dest_s == 'the foundations':
+                dest = None
+            else:
+                dt = stack_types[m.group('dest_type')]
+                dest = dt[int(m.group('dest_idx'))]
 
-        if DEBUG:
-            print('time:', time.time()-start_time)
+        self.hints.append([ncards, src, dest])
 
-        self.hints = hints
+    def _finishHints(self, hints):
+        if self.iter_output:
+            # the solver exited before the end of the --iter-output lines
+            self._endIterOutput()
         if len(hints) > 0:
             if self.solver_state != 'intractable':
                 self.solver_state = 'solved'
-        self.hints.append(None)
-
-        if not use_fc_solve_lib:
-            pout.close()
-            perr.close()
+        Base_Solver_Hint._finishHints(self, hints)
 
 
 class BlackHoleSolver_Hint(Base_Solver_Hint):
@@ -1226,13 +1438,22 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
 
         return board
 
-    def computeHints(self):
-        game = self.game
+    def _startHints(self):
         game_type = self.game_type
 
         board = self.calcBoardString()
         if DEBUG:
             print('--------------------\n', board, '--------------------')
+        args = []
+        args += ['--game', game_type['preset'], '--rank-reach-prune']
+        args += ['--max-iters', str(self.options['max_iters'])]
+        if 'queens_on_kings' in game_type:
+            args += ['--queens-on-kings']
+        if 'wrap_ranks' in game_type:
+            args += ['--wrap-ranks']
+        if self._loadSolution(board, args):
+            return False
+
         if use_bh_solve_lib:
             # global bh_solve_lib_obj
             # bh_solve_lib_obj = bh_solve_lib_obj.new_bhs_user_handle()
@@ -1248,99 +1469,83 @@ class BlackHoleSolver_Hint(Base_Solver_Hint):
                     if ('wrap_ranks' in game_type) else True),
             )
             bh_solve_lib_obj.limit_iterations(self.options['max_iters'])
-        else:
-            args = []
-            args += ['--game', game_type['preset'], '--rank-reach-prune']
-            args += ['--max-iters', str(self.options['max_iters'])]
-            if 'queens_on_kings' in game_type:
-                args += ['--queens-on-kings']
-            if 'wrap_ranks' in game_type:
-                args += ['--wrap-ranks']
-
-            command = self.BLACK_HOLE_SOLVER_COMMAND + ' ' + ' '.join(args)
-
-        if DEBUG:
-            start_time = time.time()
-
-        result = ''
-
-        if use_bh_solve_lib:
             ret_code = bh_solve_lib_obj.resume_solution()
-        else:
-            pout, perr = self.run_solver(command, board)
-
-            for sbytes in pout:
-                s = six.text_type(sbytes, encoding='utf-8')
-                if DEBUG >= 5:
-                    print(s)
+            self._readLibSolution(ret_code)
+            return False
 
-                m = re.search('^(Intractable|Unsolved|Solved)!', s.rstrip())
-                if m:
-                    result = m.group(1)
-                    break
+        command = self.BLACK_HOLE_SOLVER_COMMAND + ' ' + ' '.join(args)
+        # the result line comes first, then the solution
+        self.result = None
+        self.process = SolverProcess(command, board,
+                                     timeout=self.options['timeout'])
+        return True
 
+    def _readLibSolution(self, ret_code):
+        game = self.game
         self._setText(iter=0, depth=0, states=0)
         hints = []
-        if use_bh_solve_lib:
-            self.solver_state = (
-                'solved' if ret_code == 0 else
-                ('intractable'
-                 if bh_solve_lib_obj.ret_code_is_suspend(ret_code)
-                 else 'unsolved'))
-            self._setText(iter=bh_solve_lib_obj.get_num_times())
-            self._setText(
-                states=bh_solve_lib_obj.get_num_states_in_collection())
-            if self.solver_state == 'solved':
+        self.solver_state = (
+            'solved' if ret_code == 0 else
+            ('intractable'
+             if bh_solve_lib_obj.ret_code_is_suspend(ret_code)
+             else 'unsolved'))
+        self._setText(iter=bh_solve_lib_obj.get_num_times())
+        self._setText(
+            states=bh_solve_lib_obj.get_num_states_in_collection())
+        if self.solver_state == 'solved':
+            m = bh_solve_lib_obj.get_next_move()
+            while m:
+                found_stack_idx = m.get_column_idx()
+                if len(game.s.rows) > found_stack_idx >= 0:
+                    src = game.s.rows[found_stack_idx]
+
+                    hints.append([1, src, None])
+                else:
+                    hints.append([1, game.s.talon, None])
                 m = bh_solve_lib_obj.get_next_move()
-                while m:
-                    found_stack_idx = m.get_column_idx()
-                    if len(game.s.rows) > found_stack_idx >= 0:
-                        src = game.s.rows[found_stack_idx]
-
-                        hints.append([1, src, None])
-                    else:
-                        hints.append([1, game.s.talon, None])
-                    m = bh_solve_lib_obj.get_next_move()
-        else:
-            self.solver_state = result.lower()
-            for sbytes in pout:
-                s = six.text_type(sbytes, encoding='utf-8')
-                if DEBUG:
-                    print(s)
+        self._finishHints(hints)
 
-                if s.strip() == 'Deal talon':
-                    hints.append([1, game.s.talon, None])
-                    continue
+    def _readSolverLine(self, s):
+        if self.result is None:
+            m = re.search('^(Intractable|Unsolved|Solved)!', s.rstrip())
+            if m:
+                self.result = m.group(1)
+                self._setText(iter=0, depth=0, states=0)
+            return
 
-                m = re.match(
-                    'Total number of states checked is ([0-9]+)\\.', s)
-                if m:
-                    self._setText(iter=int(m.group(1)))
-                    continue
+        if s.strip() == 'Deal talon':
+            self.hints.append([1, self.game.s.talon, None])
+            return
 
-                m = re.match('This scan generated ([0-9]+) states\\.', s)
+        m = re.match(
+            'Total number of states checked is ([0-9]+)\\.', s)
+        if m:
+            self._setText(iter=int(m.group(1)))
+            return
 
-                if m:
-                    self._setText(states=int(m.group(1)))
-                    continue
+        m = re.match('This scan generated ([0-9]+) states\\.', s)
 
-                m = re.match(
-                    'Move a card from stack ([0-9]+) to the foundations', s)
-                if not m:
-                    continue
+        if m:
+            self._setText(states=int(m.group(1)))
+            return
 
-                found_stack_idx = int(m.group(1))
-                src = game.s.rows[found_stack_idx]
+        m = re.match(
+            'Move a card from stack ([0-9]+) to the foundations', s)
+        if not m:
+            return
 
-                hints.append([1, src, None])
-            pout.close()
-            perr.close()
+        found_stack_idx = int(m.group(1))
+        src = self.game.s.rows[found_stack_idx]
 
-        if DEBUG:
-            print('time:', time.time()-start_time)
+        self.hints.append([1, src, None])
 
-        hints.append(None)
-        self.hints = hints
+    def _finishHints(self, hints):
+        if self.process is None and self.solver_state == 'unknown':
+            # the external solver has exited
+            if self.result is None:
+                self._setText(iter=0, depth=0, states=0)
+            self.solver_state = (self.result or '').lower()
+        Base_Solver_Hint._finishHints(self, hints)
 
 
 class FreeCellSolverWrapper:
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import heapq
+import time
+from itertools import count
+
+from pysollib.compactstate import CardTable, GameView, Position
+from pysollib.hint import DefaultHint
+
+
+# ************************************************************************
+# * A bounded best-first search over the positions of a game, for
+# * deeper hints and demo moves (see SearchHint).
+# *
+# * The moves are the moves of piles between the stacks, checked by the
+# * rules of the real stack classes (canMoveCards(), acceptsCards()) on
+# * the stack views of compactstate.py. The search does not cheat: a
+# * move that uncovers a face-down card ends its line and dealing is
+# * left to the hint class. A position already reached in as many or
+# * fewer moves is skipped (a transposition table of Position keys).
+# ************************************************************************
+
+class SearchStats:
+    # totals of all searches, for benchmarks
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.searches = 0
+        self.nodes = 0
+        self.positions = 0
+        self.time = 0.0
+
+
+search_stats = SearchStats()
+
+
+class PositionSearch:
+    # position values
+    VALUE_FOUNDATION_CARD = 10
+    VALUE_HIDDEN_CARD = -50
+    VALUE_EMPTY_ROW = 30
+    VALUE_RESERVE_CARD = -5
+    # every move costs this much (prefer short lines)
+    MOVE_COST = 1
+
+    def __init__(self, game, max_nodes=1000, max_time=0.5):
+        self.game = game
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.table = CardTable(game.cards)
+        self.ncards = len(game.cards)
+        self.foundation_ids = [s.id for s in game.s.foundations]
+        self.row_ids = [s.id for s in game.s.rows]
+        self.reserve_ids = [s.id for s in game.sg.reservestacks
+                            if s not in game.s.rows]
+        self.nodes = 0
+
+    def evaluate(self, position):
+        # returns (value, won)
+        stacks = position.stacks
+        n = 0
+        for i in self.foundation_ids:
+            n += len(stacks[i])
+        value = n * self.VALUE_FOUNDATION_CARD
+        for i in self.row_ids:
+            codes = stacks[i]
+            if not codes:
+                value += self.VALUE_EMPTY_ROW
+                continue
+            # a face-down top card is as good as flipped
+            hidden = 0
+            for code in codes[:-1]:
+                if not code & 1:
+                    hidden += 1
+            value += hidden * self.VALUE_HIDDEN_CARD
+        for i in self.reserve_ids:
+            value += len(stacks[i]) * self.VALUE_RESERVE_CARD
+        return value, n == self.ncards
+
+    def getMoves(self, view):
+        # yields (ncards, from_stack, to_stack) of the stack views
+        targets = view.sg.openstacks
+        rows = view.s.rows
+        for r in view.sg.dropstacks:
+            cards = r.cards
+            lr = len(cards)
+            for lp in range(1, lr + 1):
+                pile = cards[-lp:]
+                if not pile[0].face_up:
+                    break
+                if not r.canMoveCards(pile):
+                    continue
+                for t in targets:
+                    if t is r or not t.acceptsCards(r, pile):
+                        continue
+                    if lp == lr and not t.cards and r in rows and t in rows:
+                        # moving a whole row to an empty row
+                        continue
+                    yield lp, r, t
+
+    def search(self):
+        # returns the moves (ncards, from_id, to_id) to the best position
+        # found, an empty list if there is none better than this one
+        start = time.time()
+        game = self.game
+        root = Position.fromGame(game)
+        root_value, won = self.evaluate(root)
+        if won:
+            return []
+        seen = {root.key(): 0}
+        best_value, best_node = root_value, None
+        counter = count()
+        heap = [(-root_value, next(counter), root, None, 0)]
+        self.nodes = 0
+        while heap and self.nodes < self.max_nodes:
+            if self.nodes & 31 == 31 and \
+                    time.time() - start > self.max_time:
+                break
+            f, c, position, node, depth = heapq.heappop(heap)
+            self.nodes += 1
+            view = GameView(game, position, self.table)
+            depth += 1
+            for ncards, r, t in self.getMoves(view):
+                child = position.copy()
+                child.moveCards(ncards, r.id, t.id)
+                key = child.key()
+                if seen.get(key, depth + 1) <= depth:
+                    continue
+                seen[key] = depth
+                value, won = self.evaluate(child)
+                child_node = ((ncards, r.id, t.id), node)
+                if won:
+                    best_value, best_node = value, child_node
+                    heap = []
+                    break
+                if value > best_value:
+                    best_value, best_node = value, child_node
+                codes = child.stacks[r.id]
+                if codes and not codes[-1] & 1:
+                    # uncovers a face-down card
+                    continue
+                heapq.heappush(heap, (depth * self.MOVE_COST - value,
+                                      next(counter), child, child_node,
+                                      depth))
+        search_stats.searches += 1
+        search_stats.nodes += self.nodes
+        search_stats.positions += len(seen)
+        search_stats.time += time.time() - start
+        moves = []
+        while best_node is not None:
+            move, best_node = best_node
+            moves.append(move)
+        moves.reverse()
+        return moves
+
+
+# ************************************************************************
+# * SearchHint puts the first move of the best line found by a
+# * PositionSearch before the hints of a DefaultHint class, with the
+# * rest of the line as forced moves. Flips and deals come from the
+# * hint class.
+# ************************************************************************
+
+class SearchHint:
+    SCORE_SEARCH = 99000        # less than AbstractHint.SCORE_FLIP
+    MAX_NODES = 500
+    MAX_TIME = 0.5              # seconds
+
+    def getHints(self, taken_hint=None):
+        if taken_hint and taken_hint[6] and \
+                taken_hint[6][0] == self.SCORE_SEARCH and \
+                not self._canMove(taken_hint[6]):
+            # the rest of the line is no longer possible (e.g. a stack
+            # was filled), search again
+            taken_hint = None
+        hints = super().getHints(taken_hint)
+        if taken_hint and taken_hint[6]:
+            return hints
+        if hints and hints[0][3] is hints[0][4]:
+            # flip first
+            return hints
+        search = PositionSearch(self.game, self.MAX_NODES, self.MAX_TIME)
+        moves = search.search()
+        if not moves:
+            return hints
+        # the moves of the line are forced moves, so that the demo
+        # plays the whole line
+        hint = None
+        allstacks = self.game.allstacks
+        for ncards, from_id, to_id in reversed(moves):
+            hint = (self.SCORE_SEARCH, 1, ncards, allstacks[from_id],
+                    allstacks[to_id], self.BLUE, hint)
+        return [hint] + [h for h in hints if h[2:5] != hint[2:5]]
+
+    def _canMove(self, hint):
+        ncards, r, t = hint[2:5]
+        if len(r.cards) < ncards:
+            return False
+        pile = r.cards[-ncards:]
+        return r.canMoveCards(pile) and t.acceptsCards(r, pile)
+
+
+_search_hint_classes = {}
+
+
+def searchHintClass(hint_class):
+    # the hint class with SearchHint; other than DefaultHint classes
+    # (the solvers, Mahjongg, ...) are returned as they are
+    if not isinstance(hint_class, type) or \
+            not issubclass(hint_class, DefaultHint):
+        return hint_class
+    try:
+        return _search_hint_classes[hint_class]
+    except KeyError:
+        search_class = type(hint_class.__name__, (SearchHint, hint_class),
+                            {})
+        _search_hint_classes[hint_class] = search_class
+        return search_class
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import mmap
+import struct
+
+from pysollib.mfxutil import Image
+
+
+# ************************************************************************
+# * image pages - PIL images in one binary file:
+# *
+# *   "PySolIMG", version, count      8 bytes, 2 x uint32
+# *   count x (width, height)         2 x uint32
+# *   count x pixels                  width * height * 4 bytes (RGBA)
+# ************************************************************************
+
+IMAGE_PAGES_MAGIC = b"PySolIMG"
+IMAGE_PAGES_VERSION = 1
+
+
+def writeImagePages(filename, images):
+    # images: RGBA images of PIL
+    with open(filename, "wb") as f:
+        f.write(IMAGE_PAGES_MAGIC)
+        f.write(struct.pack("<II", IMAGE_PAGES_VERSION, len(images)))
+        for im in images:
+            f.write(struct.pack("<II", *im.size))
+        for im in images:
+            f.write(im.tobytes())
+
+
+def readImagePages(filename):
+    # the file is mapped, the pixels are copied once into the images;
+    # raises ValueError if the file is damaged
+    with open(filename, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view:
+        if len(mm) < 16 or mm[:8] != IMAGE_PAGES_MAGIC:
+            raise ValueError("not an image pages file: " + filename)
+        version, count = struct.unpack_from("<II", mm, 8)
+        if version != IMAGE_PAGES_VERSION or 16 + count * 8 > len(mm):
+            raise ValueError("invalid image pages file: " + filename)
+        offset = 16 + count * 8
+        images = []
+        for i in range(count):
+            size = struct.unpack_from("<II", mm, 16 + i * 8)
+            end = offset + size[0] * size[1] * 4
+            if end > len(mm):
+                raise ValueError("truncated image pages file: " + filename)
+            images.append(Image.frombytes("RGBA", size, view[offset:end]))
+            offset = end
+    return images
@@ -23,11 +23,13 @@
 
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+from pysollib.imagepages import readImagePages, writeImagePages
 from pysollib.mfxutil import Image, ImageTk, USE_PIL, print_err
 from pysollib.pysoltk import copyImage, createBottom, createImage,\
         createImagePIL, loadImage
-from pysollib.pysoltk import shadowImage
+from pysollib.pysoltk import decodeImage, shadowImage
 from pysollib.resource import CSI
 from pysollib.settings import TOOLKIT
 
@@ -47,6 +49,9 @@ class ImagesCardback:
 
 
 class Images:
+    # threads that decode the card images with PIL
+    DECODE_THREADS = min(8, os.cpu_count() or 1)
+
     def __init__(self, dataloader, cs, r=1):
         self.d = dataloader
         self.cs = cs
@@ -76,6 +81,9 @@ class Images:
         self._highlighted_images = {}   # key: (suit, rank)
 
         self.cardset_bottoms = False
+        self._decoded = {}              # filename -> Future of PIL image
+        # FileCache of the resized images (see resize())
+        self.scaled_cache = None
 
     def destruct(self):
         pass
@@ -86,8 +94,12 @@ class Images:
         if not os.path.exists(f):
             print_err('card image path %s does not exist' % f)
             return None
+        future = self._decoded.pop(f, None)
         try:
-            img = loadImage(file=f)
+            if future is not None:
+                img = loadImage(file=f, decoded=future.result())
+            else:
+                img = loadImage(file=f)
         except Exception:
             return None
 
@@ -175,8 +187,24 @@ class Images:
         else:
             return createImage(width, height, fill=fill, outline=outline)
 
+    def _startDecoding(self, filenames):
+        # decode the image files in threads while the main thread makes
+        # the images of the toolkit (only from the main thread) in
+        # __loadCard()
+        self._decoded = {}
+        if not USE_PIL or TOOLKIT == 'kivy' or self.DECODE_THREADS < 2:
+            return
+        executor = ThreadPoolExecutor(max_workers=self.DECODE_THREADS)
+        for filename in filenames:
+            f = os.path.join(self.cs.dir, filename)
+            self._decoded[f] = executor.submit(decodeImage, f)
+        executor.shutdown(wait=False)
+
     def load(self, app, progress=None):
         ext = self.cs.ext[1:]
+        self._startDecoding(
+            [n + self.cs.ext for n in self.cs.getFaceCardNames()] +
+            [name for name in self.cs.backnames if name])
         pstep = 0
         if progress:
             pstep = self.cs.ncards + len(self.cs.backnames) + \
@@ -254,6 +282,7 @@ class Images:
             self._highlight.append(self.__loadCard("shade." + ext))
         if progress:
             progress.update(step=pstep)
+        self._decoded = {}
         # create missing
         self._createMissingImages()
         #
@@ -442,41 +471,26 @@ class Images:
         self._resampling = resample
         # ???self._setSize(xf, yf)
         self.setOffsets()
-        # cards
-        cards = []
-        for c in self._card:
-            c = c.resize(xf, yf, resample=resample)
-            cards.append(c)
-        self._card = cards
-        # back
-        for b in self._back:
-            b.image = b.image.resize(xf, yf, resample=resample)
-
         # stack bottom image
         neg = self._bottom is self._bottom_negative  # dont know
 
-        bottom_negative = []
-        bottom_positive = []
-        for c in self._bottom_negative:
-            c = c.resize(xf, yf, resample=resample)
-            bottom_negative.append(c)
-        self._bottom_negative = bottom_negative
-        for c in self._bottom_positive:
-            c = c.resize(xf, yf, resample=resample)
-            bottom_positive.append(c)
-        self._bottom_positive = bottom_positive
-
-        # letters
-        letter_negative = []
-        letter_positive = []
-        for c in self._letter_negative:
-            c = c.resize(xf, yf, resample=resample)
-            letter_negative.append(c)
-        self._letter_negative = letter_negative
-        for c in self._letter_positive:
-            c = c.resize(xf, yf, resample=resample)
-            letter_positive.append(c)
-        self._letter_positive = letter_positive
+        # cards, back, stack bottoms, letters
+        images = (self._card,
+                  [b.image for b in self._back],
+                  self._bottom_negative,
+                  self._bottom_positive,
+                  self._letter_negative,
+                  self._letter_positive)
+        key = self._getScaledKey(xf, yf, resample)
+        scaled = self._loadScaled(key, images)
+        if scaled is None:
+            scaled = [[c.resize(xf, yf, resample=resample) for c in lst]
+                      for lst in images]
+            self._saveScaled(key, scaled)
+        (self._card, backs, self._bottom_negative, self._bottom_positive,
+         self._letter_negative, self._letter_positive) = scaled
+        for b, im in zip(self._back, backs):
+            b.image = im
 
         self._createMissingImages()
         self.setNegative(neg)
@@ -487,6 +501,55 @@ class Images:
             self._getHighlight(self._card[0], None, '#3896f8'))
         self._pil_shadow = {}
 
+    #
+    # cache of scaled images
+    #
+
+    def _getScaledKey(self, xf, yf, resample):
+        cs = self.cs
+        return ("scaled", cs.ident, cs.name, cs.version,
+                self._getCardsetMtime(), cs.CARDW, cs.CARDH,
+                self.cardset_bottoms, repr(xf), repr(yf), resample)
+
+    def _getCardsetMtime(self):
+        # a cardset that is reinstalled or updated under the same name
+        # has new files
+        mtimes = []
+        for path in (os.path.join(self.cs.dir, "config.txt"), self.cs.dir):
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(0)
+        return tuple(mtimes)
+
+    def _loadScaled(self, key, images):
+        # the scaled images from the cache or None
+        if self.scaled_cache is None:
+            return None
+        filename = self.scaled_cache.get(key)
+        if filename is None:
+            return None
+        try:
+            pages = readImagePages(filename)
+        except (OSError, ValueError):
+            return None
+        if len(pages) != sum(map(len, images)):
+            return None
+        pages = iter(pages)
+        return [[c.resized(next(pages)) for c in lst] for lst in images]
+
+    def _saveScaled(self, key, scaled):
+        if self.scaled_cache is None:
+            return
+        pages = [getattr(c, '_pil_image', None) for lst in scaled for c in lst]
+        if any(im is None or im.mode != 'RGBA' for im in pages):
+            return
+        try:
+            self.scaled_cache.put(
+                key, lambda filename: writeImagePages(filename, pages))
+        except OSError:
+            self.scaled_cache = None
+
     def reset(self):
         print('Image.reset')
         self.resize(1, 1)
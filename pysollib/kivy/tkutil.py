@@ -231,6 +231,11 @@ def makeImage(file=None, data=None, dither=None, alpha=None):
 loadImage = makeImage
 
 
+def decodeImage(file):
+    # kivy decodes the images itself
+    return None
+
+
 def copyImage(image, x, y, width, height):
 
     # return Image(source=image.source)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import collections
+import threading
+import time
+import urllib.parse
+
+from pysollib.mfxutil import print_err
+
+import requests
+from requests.adapters import HTTPAdapter
+
+LEADERBOARD_SERVER_BASE_URL = \
+    "http://ec2-3-249-19-236.eu-west-1.compute.amazonaws.com"
+
+
+# ************************************************************************
+# * Background leaderboard score uploader.
+# *
+# * Scores are queued with submit() and sent by a worker thread, so the
+# * Tk main loop never waits for the server. Pending updates are merged
+# * per player (only the latest score is sent), the queue is bounded,
+# * one pooled HTTP session is reused and failed uploads back off
+# * exponentially.
+# ************************************************************************
+
+class LeaderboardUploader:
+    def __init__(self, base_url=LEADERBOARD_SERVER_BASE_URL, maxsize=32,
+                 timeout=5.0, min_backoff=1.0, max_backoff=60.0):
+        self.base_url = base_url.rstrip("/")
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.session = None
+        # player -> latest score, oldest first
+        self._pending = collections.OrderedDict()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._busy = False              # an upload is in flight
+        self._flushing = False          # skip the current backoff
+        self._closed = False
+        self._backoff = 0.0
+        # counters (informational)
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def submit(self, player, score):
+        # never blocks; returns False if the uploader has been closed
+        with self._cond:
+            if self._closed:
+                return False
+            if player not in self._pending and \
+                    len(self._pending) >= self.maxsize:
+                # queue full - forget the oldest player's update
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[player] = score
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="LeaderboardUploader")
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + int(self._busy)
+
+    def flush(self, timeout=0):
+        # ask the worker to send everything now (ignoring the backoff);
+        # with a timeout, wait up to timeout seconds for the queue to
+        # drain. Returns True if nothing is left to send.
+        with self._cond:
+            self._flushing = True
+            self._cond.notify_all()
+            if timeout:
+                deadline = time.time() + timeout
+                while self._pending or self._busy:
+                    remaining = deadline - time.time()
+                    if remaining <= 0 or self._thread is None:
+                        break
+                    self._cond.wait(remaining)
+            return not (self._pending or self._busy)
+
+    def close(self, timeout=5.0):
+        # called on application exit: try to send what is left, then
+        # stop the worker thread
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            ok = not (self._pending or self._busy)
+        return ok
+
+    #
+    # worker thread
+    #
+
+    def _getSession(self):
+        if self.session is None:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        return self.session
+
+    def _put(self, player, score):
+        # returns True on success, False if the upload should be retried
+        path = "/api/leaderboard/%s" % urllib.parse.quote(player, safe="")
+        try:
+            r = self._getSession().put(self.base_url + path,
+                                       json={"score": score},
+                                       timeout=self.timeout)
+        except requests.RequestException as ex:
+            print_err("leaderboard: %s" % ex)
+            return False
+        if r.status_code in (200, 204):
+            return True
+        print_err("leaderboard: %s %s" % (r.status_code, r.text))
+        # client errors (except "too many requests") will not go away
+        return 400 <= r.status_code < 500 and r.status_code != 429
+
+    def _waitBackoff(self):
+        # called with self._cond held
+        deadline = time.time() + self._backoff
+        while not self._closed and not self._flushing:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._flushing = False
+                        self._cond.wait()
+                    if not self._pending:
+                        break
+                    player, score = self._pending.popitem(last=False)
+                    self._busy = True
+                ok = self._put(player, score)
+                with self._cond:
+                    self._busy = False
+                    if ok:
+                        self.sent += 1
+                        self._backoff = 0.0
+                    elif self._closed:
+                        # shutting down - do not retry
+                        self.failed += 1
+                    else:
+                        self.failed += 1
+                        if player not in self._pending:
+                            # no newer score was submitted meanwhile
+                            self._pending[player] = score
+                            self._pending.move_to_end(player, last=False)
+                        self._backoff = min(
+                            max(self._backoff * 2, self.min_backoff),
+                            self.max_backoff)
+                        self._waitBackoff()
+                        self._flushing = False
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._thread = None
+                self._busy = False
+                self._cond.notify_all()
+            if self.session is not None:
+                self.session.close()
+                self.session = None
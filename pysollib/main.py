@@ -29,6 +29,7 @@ import traceback
 
 from pysollib.app import Application
 from pysollib.gamedb import GAME_DB
+from pysollib.gamemanifest import loadManifest
 from pysollib.mfxutil import print_err
 from pysollib.mygettext import _
 from pysollib.pysolaudio import AbstractAudioClient
@@ -234,22 +235,30 @@ def pysol_init(app, args):
     def progressCallback(*args):
         app.intro.progress.update(step=1)
     GAME_DB.setCallback(progressCallback)
-    import pysollib.games
-    if not opts['french-only']:
-        import pysollib.games.ultra
-        import pysollib.games.mahjongg
-        import pysollib.games.special
-        pysollib.games.special.no_use()
-
-    # try to load plugins
-    if not opts["noplugins"]:
-        for dir in (os.path.join(app.dataloader.dir, "games"),
-                    os.path.join(app.dataloader.dir, "plugins"),
-                    app.dn.plugins):
-            try:
-                app.loadPlugins(dir)
-            except Exception:
-                pass
+    from pysollib.settings import CHECK_GAMES
+    with GAME_DB.bulkRegistration():
+        try:
+            manifest = app.dataloader.findFile('games.json')
+        except OSError:
+            manifest = None
+        if CHECK_GAMES or not manifest or \
+                not loadManifest(manifest, opts['french-only']):
+            import pysollib.games
+            if not opts['french-only']:
+                import pysollib.games.ultra
+                import pysollib.games.mahjongg
+                import pysollib.games.special
+                pysollib.games.special.no_use()
+
+        # try to load plugins
+        if not opts["noplugins"]:
+            for dir in (os.path.join(app.dataloader.dir, "games"),
+                        os.path.join(app.dataloader.dir, "plugins"),
+                        app.dn.plugins):
+                try:
+                    app.loadPlugins(dir)
+                except Exception:
+                    pass
     GAME_DB.setCallback(None)
 
     # init audio 1)
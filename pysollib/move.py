@@ -94,6 +94,7 @@ class AMoveMove(AtomicMove):
                                 frames=frames, shadow=self.shadow)
         for i in range(ncards):
             from_stack.removeCard()
+        game.snapshot_hash.moveCards(from_stack, to_stack, cards)
         for c in cards:
             to_stack.addCard(c)
         from_stack.updatePositions()
@@ -136,10 +137,14 @@ class AFlipMove(AtomicMove):
             card.showFace()
 
     def redo(self, game):
-        self._doMove(game, game.allstacks[self.stack_id])
+        stack = game.allstacks[self.stack_id]
+        self._doMove(game, stack)
+        game.snapshot_hash.flipCard(stack)
 
     def undo(self, game):
-        self._doMove(game, game.allstacks[self.stack_id])
+        stack = game.allstacks[self.stack_id]
+        self._doMove(game, stack)
+        game.snapshot_hash.flipCard(stack)
 
     def cmpForRedo(self, other):
         return cmp(self.stack_id, other.stack_id)
@@ -183,6 +188,7 @@ class AFlipAndMoveMove(AtomicMove):
             game.animatedMoveTo(from_stack, to_stack, cards, x, y,
                                 frames=self.frames, shadow=0)
         c = from_stack.removeCard(update=False)
+        game.snapshot_hash.flipAndMoveCard(from_stack, to_stack, c)
         to_stack.addCard(c, update=False)
         from_stack.updateText()
         to_stack.updateText()
@@ -215,6 +221,7 @@ class AFlipAllMove(AtomicMove):
                 card.showBack()
             else:
                 card.showFace()
+        game.snapshot_hash.updateStack(stack)
         stack.refreshView()
 
     def undo(self, game):
@@ -224,6 +231,7 @@ class AFlipAllMove(AtomicMove):
                 card.showBack()
             else:
                 card.showFace()
+        game.snapshot_hash.updateStack(stack)
         stack.refreshView()
 
     def cmpForRedo(self, other):
@@ -256,6 +264,8 @@ class ATurnStackMove(AtomicMove):
             to_stack.addCard(card, unhide=unhide, update=0)
             card.showBack(unhide=unhide)
             # print 3, unhide, to_stack.getCard().__dict__
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
         from_stack.updateText()
         to_stack.updateText()
 
@@ -272,6 +282,8 @@ class ATurnStackMove(AtomicMove):
             assert not card.face_up
             card.showFace(unhide=unhide)
             to_stack.addCard(card, unhide=unhide, update=0)
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
         from_stack.updateText()
         to_stack.updateText()
 
@@ -322,6 +334,8 @@ class NEW_ATurnStackMove(AtomicMove):
                 to_stack.max_rounds < 0
             to_stack.round = to_stack.round + 1
         self._doMove(from_stack, to_stack, 0)
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
 
     def undo(self, game):
         from_stack = game.allstacks[self.from_stack_id]
@@ -331,6 +345,8 @@ class NEW_ATurnStackMove(AtomicMove):
             assert to_stack.round > 1
             to_stack.round = to_stack.round - 1
         self._doMove(to_stack, from_stack, 1)
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
 
     def cmpForRedo(self, other):
         return (cmp(self.from_stack_id, other.from_stack_id) or
@@ -353,6 +369,7 @@ class AUpdateStackMove(AtomicMove):
         if self.flags & 64:
             # model
             stack.updateModel(undo, self.flags)
+            game.snapshot_hash.updateStack(stack)
         else:
             # view
             if self.flags & 16:
@@ -465,6 +482,7 @@ class AShuffleStackMove(AtomicMove):
             j = game.random.randint(0, n)
             seq[n], seq[j] = seq[j], seq[n]
             n = n - 1
+        game.snapshot_hash.updateStack(stack)
         stack.refreshView()
 
     def undo(self, game):
@@ -476,6 +494,7 @@ class AShuffleStackMove(AtomicMove):
             assert c.id == id
             cards.append(c)
         stack.cards = cards
+        game.snapshot_hash.updateStack(stack)
         # restore the state
         game.random.setstate(self.state)
         stack.refreshView()
@@ -514,6 +533,8 @@ class ASingleCardMove(AtomicMove):
             game.animatedMoveTo(from_stack, to_stack, [card], x, y,
                                 frames=self.frames, shadow=self.shadow)
         to_stack.addCard(card)
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
         # to_stack.refreshView()
 
     def undo(self, game):
@@ -526,6 +547,8 @@ class ASingleCardMove(AtomicMove):
         #  game.animatedMoveTo(from_stack, to_stack, [card], x, y,
         #                      frames=self.frames, shadow=self.shadow)
         from_stack.insertCard(card, from_pos)
+        game.snapshot_hash.updateStack(from_stack)
+        game.snapshot_hash.updateStack(to_stack)
         # to_stack.refreshView()
 
     def cmpForRedo(self, other):
@@ -73,6 +73,7 @@ undo = boolean
 bookmarks = boolean
 hint = boolean
 free_hint = boolean
+search_hints = boolean
 highlight_piles = boolean
 highlight_cards = boolean
 highlight_samerank = boolean
@@ -133,6 +134,7 @@ solver_show_progress = boolean
 solver_max_iterations = integer
 solver_iterations_output_step = integer
 solver_preset = string
+solver_timeout = integer
 display_win_message = boolean
 language = string
 
@@ -223,6 +225,7 @@ class Options:
         ('bookmarks', 'bool'),
         ('hint', 'bool'),
         ('free_hint', 'bool'),
+        ('search_hints', 'bool'),
         ('highlight_piles', 'bool'),
         ('highlight_cards', 'bool'),
         ('highlight_samerank', 'bool'),
@@ -286,6 +289,7 @@ class Options:
         ('solver_max_iterations', 'int'),
         ('solver_iterations_output_step', 'int'),
         ('solver_preset', 'string'),
+        ('solver_timeout', 'int'),
         ('mouse_button1', 'int'),
         ('mouse_button2', 'int'),
         ('mouse_button3', 'int'),
@@ -315,6 +319,7 @@ class Options:
         self.bookmarks = True
         self.hint = True
         self.free_hint = False
+        self.search_hints = False       # see hintsearch.py
         self.highlight_piles = True
         self.highlight_cards = True
         self.highlight_samerank = True
@@ -499,6 +504,7 @@ class Options:
         self.solver_max_iterations = 100000
         self.solver_iterations_output_step = 100
         self.solver_preset = 'video-editing'
+        self.solver_timeout = 120         # seconds, 0 - no limit
 
     def setDefaults(self, top=None):
         WIN_SYSTEM = pysollib.settings.WIN_SYSTEM
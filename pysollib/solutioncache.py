@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; -*-
+# ---------------------------------------------------------------------------##
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------##
+
+import json
+import os
+from collections import OrderedDict
+
+
+# ************************************************************************
+# * The results of the solvers (see Base_Solver_Hint).
+# *
+# * A result is found by the solver (with the game id and the PySol
+# * version, see Base_Solver_Hint._getSolutionSolver), the board string
+# * and the solver arguments; it is the solver state ('solved',
+# * 'intractable' or
+# * 'unsolved') and the moves, (ncards, from stack id, to stack id or
+# * None) tuples. Only max_size results are kept, the least recently
+# * used ones are dropped. With a filename the cache is read at the
+# * first use and written by save().
+# ************************************************************************
+
+class SolutionCache:
+    FILE_VERSION = 2
+
+    def __init__(self, max_size, filename=None):
+        self.max_size = max_size
+        self.filename = filename
+        self._results = None            # key -> (state, moves)
+        self._changed = False
+        self.hits = self.misses = 0
+
+    def _getResults(self):
+        if self._results is None:
+            self._results = OrderedDict()
+            if self.filename:
+                self._load()
+        return self._results
+
+    def _load(self):
+        try:
+            with open(self.filename) as f:
+                data = json.load(f)
+            if data.get('version') != self.FILE_VERSION:
+                return
+            for solver, board, args, state, moves in data['results']:
+                self._results[(solver, board, tuple(args))] = \
+                    (state, tuple(tuple(m) for m in moves))
+        except (OSError, ValueError, TypeError, KeyError):
+            # missing or damaged file
+            self._results.clear()
+
+    def get(self, solver, board, args):
+        results = self._getResults()
+        key = (solver, board, tuple(args))
+        result = results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        results.move_to_end(key)
+        return result
+
+    def put(self, solver, board, args, state, moves):
+        results = self._getResults()
+        key = (solver, board, tuple(args))
+        result = (state, tuple(moves))
+        if results.get(key) != result:
+            self._changed = True
+        results[key] = result
+        results.move_to_end(key)
+        while len(results) > self.max_size:
+            results.popitem(last=False)
+
+    def clear(self):
+        self._getResults().clear()
+        self._changed = True
+
+    def __len__(self):
+        return len(self._getResults())
+
+    def save(self):
+        if not self.filename or not self._changed:
+            return
+        data = {
+            'version': self.FILE_VERSION,
+            'results': [[solver, board, args, state, moves]
+                        for (solver, board, args), (state, moves)
+                        in self._results.items()],
+            }
+        dirname = os.path.dirname(self.filename)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        tmpname = self.filename + '.tmp'
+        with open(tmpname, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmpname, self.filename)
+        self._changed = False
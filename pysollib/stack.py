@@ -504,7 +504,8 @@ class Stack:
     def updateModel(self, undo, flags):
         pass
 
-    # copy model data - see Hint.AClonedStack
+    # copy model data (the stack views of compactstate.py read it
+    # from the stack itself)
     def copyModel(self, clone):
         clone.id = self.id
         clone.game = self.game
@@ -1871,10 +1872,11 @@ class TalonStack(Stack,
                 if img is not None and img is not self.images.redeal_img:
                     self.images.redeal.config(image=img)
                     self.images.redeal_img = img
-                t = ("", _("Redeal"))[deal]
-            else:
-                t = (_("Stop"), _("Redeal"))[deal]
             if self.texts.redeal is not None and self.game.preview <= 1:
+                if self.images.redeal is not None:
+                    t = ("", _("Redeal"))[deal]
+                else:
+                    t = (_("Stop"), _("Redeal"))[deal]
                 if t != self.texts.redeal_str:
                     self.texts.redeal.config(text=t)
                     self.texts.redeal_str = t
@@ -21,6 +21,7 @@
 #
 # ---------------------------------------------------------------------------##
 
+import itertools
 import time
 
 from pysollib.gamedb import GI
@@ -216,8 +217,12 @@ class FileStatsFormatter(PysolStatsFormatter):
         return played
 
     def writeLog(self, player, header, prev_games):
-        if not player or not prev_games:
+        # prev_games may be an iterator, see writeFullLog
+        prev_games = iter(prev_games or ())
+        first = next(prev_games, None)
+        if not player or first is None:
             return 0
+        prev_games = itertools.chain((first,), prev_games)
         self.writeHeader(header, 71)
         header = self.getLogHeader()
         self.plog(*header)
@@ -233,7 +238,7 @@ class FileStatsFormatter(PysolStatsFormatter):
         if player is None:
             player = _('Demo')
         header = _("Full log for %(player)s") % {'player': player}
-        prev_games = self.app.stats.prev_games.get(player)
+        prev_games = self.app.stats.iterPrevGames(player)
         return self.writeLog(player, header, prev_games)
 
     def writeSessionLog(self, player):
@@ -252,30 +257,10 @@ class ProgressionFormatter:
 
     def __init__(self, app, player, gameid):
 
-        all_results = {}      # key: (year, month, day);  value: [played, won]
-        self.all_results = all_results
-        game_results = {}
-        self.game_results = game_results
-        games = app.stats.prev_games.get(player)
-        if not games:
-            return
-        for g in games:
-            id = g[0]
-            status = g[2]
-            start_time = g[3]
-            t = time.localtime(start_time)[:3]
-            if t not in all_results:
-                all_results[t] = [0, 0]
-            all_results[t][0] += 1
-            if status > 0:
-                all_results[t][1] += 1
-            if id == gameid:
-                if t not in game_results:
-                    game_results[t] = [0, 0]
-                game_results[t][0] += 1
-                if status > 0:
-                    game_results[t][1] += 1
-        # from pprint import pprint; pprint(all_results)
+        # key: (year, month, day);  value: [played, won]
+        gamelog = app.stats.getGameLog(player)
+        self.all_results = gamelog.getDailyResults()
+        self.game_results = gamelog.getDailyResults(gameid)
 
     def norm_time(self, t):
         if len(t) == 3:
@@ -1,29 +1,12 @@
-import traceback
 import sys
 import tempfile
 import os
 
-from typing import List, Optional, Callable
-from types import MethodType
-from enum import Enum
-from pysollib.acard import AbstractCard
+from pysollib.coderunner import CodeRunner
 from pysollib.pysoltk import MfxMessageDialog
 
 from six.moves import tkinter
 
-class Suit(Enum):
-    ANY = -1
-    CLUB = 0
-    SPADE = 1
-    HEART = 2
-    DIAMOND = 3
-
-suite_to_letter = [
-    "c",
-    "s",
-    "h",
-    "d"
-]
 
 def attach_scrollbar(frame: tkinter.Frame, text_area: tkinter.Text, row: int):
     scrollbar = tkinter.Scrollbar(frame, command=text_area.yview)
@@ -140,8 +123,9 @@ function_tutorial_list = [
 ]
 
 
-class CodeRegion:
+class CodeRegion(CodeRunner):
     def __init__(self, top) -> None:
+        CodeRunner.__init__(self)
         self.top = top
 
         # The frame that will vertically align all widgets
@@ -215,93 +199,15 @@ class CodeRegion:
         self.console_log.grid(column=0, row=4)
         attach_scrollbar(self.frame, self.console_log, 4)
 
-        # Represents the Game class
-        # Initialized from the app.py
-        self.game = None
-
         # Creates a temporary file that will be used to write the game save into.
         # We will use it to restore the state.
         self.state_directory = tempfile.TemporaryDirectory()
         self.state_directory.__enter__()
 
-        # A simple step count to prevent infinite loop per player code execution
-        self.step_count = 0
-        self.step_max = 150 # In average, players makes 45 moves in a single game
-
-        self.state_set = set()
-
-    # Calculate a state represented by a single string for the current
-    # top cards of all card stacks in the game
-    def _get_current_state(self):
-        state = ""
-        # adding all top cars from tableau()
-        tableau = self.tableau()
-        for row in tableau:
-            if len(row.cards) > 0:
-                top = row.cards[-1]
-                state += f"{suite_to_letter[top.suit]}{top.rank},"
-            else:
-                state += "-1,"
-        # adding all top cars from foundations()
-        foundations = self.foundation()
-        for row in foundations:
-            if len(row.cards) > 0:
-                top = row.cards[-1]
-                state += f"{suite_to_letter[top.suit]}{top.rank},"
-            else:
-                state += "-1,"
-        # adding top card from waste()
-        if len(self.waste().cards) > 0:
-            top = self.waste().cards[-1]
-            state += f"{suite_to_letter[top.suit]}{top.rank},"
-        else:
-            state += "-1,"
-
-        return state
-
-    # Calculate a state represented by a single string for the future
-    # top cards of all cards after a move is performed
-    def _get_future_state(self, from_stack, ncards, to_stack):
-        # get the state of the top after a move is carried out
-        def get_future_top_state(stack, from_stack, ncards, to_stack):
-            new_top = stack.cards[-1] if len(stack.cards) > 0 else None
-            # current top card comes from from_stack
-            if stack == from_stack:
-                # after moving ncards, from_stack will be empty
-                if len(from_stack.cards) <= ncards:
-                    new_top = None
-                # after moving ncards, there is still card at the from_stack
-                else:
-                    new_top = from_stack.cards[-(ncards + 1)]
-            # current top card comes from to_stack
-            elif stack == to_stack:
-                new_top = from_stack.cards[-1]
-
-            if new_top is None:
-                return "-1,"
-            else:
-                return f"{suite_to_letter[new_top.suit]}{new_top.rank},"
-            
-
-        state = ""
-        # adding all top cars from tableau()
-        tableau = self.tableau()
-        for row in tableau:
-            state += get_future_top_state(row, from_stack, ncards, to_stack)
-        # adding all top cars from foundations()
-        foundations = self.foundation()
-        for row in foundations:
-            state += get_future_top_state(row, from_stack, ncards, to_stack)
-        # adding top card from waste()
-        state += get_future_top_state(self.waste(), from_stack, ncards, to_stack)
-        return state
 
     def finalize(self):
         self.state_directory.__exit__()
 
-    def connectGame(self, game):
-        self.game = game
-
     def get_code(self) -> str:
         return self.text_area.get("1.0", tkinter.END)
     
@@ -311,171 +217,10 @@ class CodeRegion:
     def add_console_log(self, value: str):
         self.console_log.insert(tkinter.END, value)
 
-    def action_deal_cards(self):
-        num_cards = self.game.dealCards()
-        self.add_console_log(f"Dealed {num_cards} cards from Stock\n")
-
     def action_print(self, text: any):
-        self.add_console_log(str(text) + "\n")
+        CodeRunner.action_print(self, text)
         print(str(text))
 
-    # function that returns stack or stacks
-    def waste(self):
-        return self.game.s.waste # single stack (pysollib.stack.WasteStack)
-
-    def foundation(self):
-        return self.game.s.foundations # multiple stacks (tuple)
-
-    def tableau(self):
-        return self.game.s.rows # multiple stacks (tuple)
-
-    def column(self, index: int):
-        if index < 0 or index > 6:
-            raise Exception(f"Index {index} out of range for columns.\n"
-                "Tip: valid column index is from 0 to 6")
-        return self.game.s.rows[index] # single stack (pysollib.stack.KingAC_RowStack)
-
-    def check_move(self, from_stacks, to_stacks):
-        # first convert to_stacks to a tuple list that canDropCards accepts
-        if not isinstance(to_stacks, tuple):
-            to_stacks = (to_stacks,)
-
-        canMove = False
-        # handle from_stacks if it is a tuple list
-        if isinstance(from_stacks, tuple):
-            for s in from_stacks:
-                toStack, ncards = s.canDropCards(to_stacks)
-                if toStack:
-                    # check the state after the move, if future state has occured
-                    # before, it isn't the best strategy
-                    future_state = self._get_future_state(s, ncards, toStack)
-                    if future_state in self.state_set:
-                        continue
-                    canMove = True
-                    break
-        # handle from_stacks if it is a single stack
-        else:
-            toStack, ncards = from_stacks.canDropCards(to_stacks)
-            if toStack:
-                canMove = True
-        return canMove
-
-    def action_move(self, from_stacks, to_stacks):
-        # First check if we have reached the maximum steps
-        if self.step_count >= self.step_max:
-            raise Exception(f"You have made more moves than allowed {self.step_max}\n"
-                "Is there an infinite loop in your code?")
-
-        # first convert to_stacks to a tuple list that canDropCards accepts
-        if not isinstance(to_stacks, tuple):
-            to_stacks = (to_stacks,)
-
-        # handle from_stacks if it is a tuple list
-        if isinstance(from_stacks, tuple):
-            moved = False
-            for s in from_stacks:
-                to_stack, ncards = s.canDropCards(to_stacks)
-                if to_stack:
-                    # check the state after the move, if future state has occured
-                    # before, it isn't the best strategy
-                    future_state = self._get_future_state(s, ncards, to_stack)
-                    print(future_state)
-                    if future_state in self.state_set:
-                        continue
-
-                    # each single drop is undo-able (note that this call
-                    # is before the actual move)
-                    self.game.finishMove()
-                    self.game.update_moves_by_code(1)
-                    s.moveMove(ncards, to_stack)
-                    self.game.checkForWin()
-                    if s.canFlipCard():
-                        s.flipMove(animation=True)
-
-                    self.add_console_log(f"Move {ncards} cards from {s} to {to_stack}\n")
-                    moved = True
-                    self.step_count += 1
-                    break
-            # raise an exception if we end up not moving. It forces
-            # the player to check before move
-            if not moved:
-                raise Exception(f"Can't move from {s} to {to_stack}\n")
-            else:
-                new_state = self._get_current_state()
-                if new_state not in self.state_set:
-                    self.state_set.add(new_state)
-                    print(new_state)
-        # handle from_stacks if it is a single stack
-        else:
-            # note: we don't check state duplication if moving from a single stack
-            to_stack, ncards = from_stacks.canDropCards(to_stacks)
-            if to_stack:
-                # each single drop is undo-able (note that this call
-                # is before the actual move)
-                self.game.finishMove()
-                self.game.update_moves_by_code(1)
-                from_stacks.moveMove(ncards, to_stack)
-                self.game.checkForWin()
-                if from_stacks.canFlipCard():
-                    from_stacks.flipMove(animation=True)
-                self.add_console_log(f"Move {ncards} cards from {from_stacks} to {to_stack}\n")
-                self.step_count += 1
-
-                new_state = self._get_current_state()
-                if new_state not in self.state_set:
-                    self.state_set.add(new_state)
-            # raise an exception if we end up not moving. It forces
-            # the player to check before move
-            else:
-                raise Exception(f"Can't move from {from_stacks} to {to_stack}\n")
-
-    def action_undo(self):
-        self.game.finishMove()
-        self.game.undo()
-    
-    def check_size(self, index: int):
-        return len(self.column(index).cards)
-
-    def check_face_up_size(self, index: int):
-        num_face_up = len([c for c in self.column(index).cards if c.face_up])
-        return num_face_up
-
-    def check_face_down_size(self, index: int):
-        num_face_down = self.check_size(index) - self.check_face_up_size(index)
-        return num_face_down
-    
-    def check_face_up_exists(self, index: int, rank: int, suit: Suit):
-        """
-        Returns true if any of the cards facing up in the column match the criteria.
-        """
-        
-        if not isinstance(suit, Suit):
-            raise Exception("suit must be one of the following: ANY, SPADE, HEART, DIAMOND, CLUB")
-
-        # convert from 1-based index to 0-based index
-        rank -= 1
-
-        def predicate(card: AbstractCard) -> bool:
-            return card.rank == rank and (card.suit == suit.value or suit == Suit.ANY) and card.face_up
-        
-        return any([predicate(card) for card in self.column(index).cards])
-    
-    def check_top(self, index: int, rank: int, suit: Suit):
-        """
-        Returns true if the top card in the column matches the criteria.
-        """
-        
-        if not isinstance(suit, Suit):
-            raise Exception("suit must be one of the following: ANY, SPADE, HEART, DIAMOND, CLUB")
-
-        # convert from 1-based index to 0-based index
-        rank -= 1
-
-        def predicate(card: AbstractCard) -> bool:
-            return card.rank == rank and (card.suit == suit.value or suit == Suit.ANY)
-        
-        return len(self.column(index).cards) > 0 and predicate(self.column(index).cards[-1])
-
     # callback function when tutorial button is invoked
     # tutorial_info has the format [function signature, instruction, usage]
     def callback_python_button(self, name):
@@ -501,67 +246,4 @@ class CodeRegion:
         self.game.saveGame(os.path.join(self.state_directory.name, "state.data"))
         
         self.reset_console_log()
-
-        code = self.get_code()
-
-        # A function decorator to check if the game has finished before
-        # executing the function.
-        def check_for_win_wrapper(func: Callable) -> Callable:
-            def wrapper(*args, **kwargs):
-                if self.game.finished:
-                    raise Exception("Execution stop, the game has finished!")
-                return func(*args, **kwargs)
-            return wrapper
-
-
-        exec_globals = {
-            "waste": self.waste,
-            "foundation": self.foundation,
-            "tableau": self.tableau,
-            "column": self.column,
-            "deal_cards": self.action_deal_cards,
-            "print": self.action_print,
-            "check_move": self.check_move,
-            "check_size": self.check_size,
-            "check_face_up_size": self.check_face_up_size,
-            "check_face_down_size": self.check_face_down_size,
-            "check_face_up_exists": self.check_face_up_exists,
-            "check_top": self.check_top,
-            "move": self.action_move,
-            "undo": self.action_undo,
-            "ANY": Suit.ANY,
-            "SPADE": Suit.SPADE,
-            "HEART": Suit.HEART,
-            "DIAMOND": Suit.DIAMOND,
-            "CLUB": Suit.CLUB,
-        }
-        
-        # Wraps all functions in the exec_globals with the function decorator
-        for key, item in exec_globals.items():
-            if isinstance(item, MethodType):
-                exec_globals[key] = check_for_win_wrapper(item)
-
-        # Reset step count every time we execute the code
-        self.step_count = 0
-        
-        try:
-            exec(code, exec_globals)
-        except SyntaxError as e:
-            self.add_console_log(f"Error at line {e.lineno}: {str(e.msg)}")
-        except Exception as e:
-            print(e, type(e))
-
-            # Find the correct traceback frame for the "exec"
-            # and print the error for that line.
-            frames = traceback.extract_tb(e.__traceback__)
-            lineno: int = None
-            for frame in frames:
-                print(f"Error at: {frame.filename}:{frame.lineno} {frame.name}")
-                if frame.filename == "<string>":
-                    lineno = frame.lineno
-            
-
-            if lineno is not None:
-                self.add_console_log(f"Error at line {lineno}: {str(e)}")
-            else:
-                self.add_console_log(str(e))
+        self.run_code(self.get_code())
@@ -23,13 +23,19 @@
 
 import os
 
+from pysollib.filecache import FileCache
 from pysollib.gamedb import GI
+from pysollib.gamesearch import GameSearchIndex, SearchCriteria
 from pysollib.mfxutil import KwStruct, Struct, destruct
 from pysollib.mfxutil import format_time
 from pysollib.mygettext import _
+from pysollib.pysolrandom import construct_random
 from pysollib.resource import CSI
+from pysollib.settings import VERSION
 from pysollib.ui.tktile.selecttree import SelectDialogTreeData
-from pysollib.ui.tktile.tkutil import bind, unbind_destroy
+from pysollib.ui.tktile.tkcanvas import MfxCanvasImage
+from pysollib.ui.tktile.tkutil import after, after_cancel
+from pysollib.ui.tktile.tkutil import bind, canvasImage, unbind_destroy
 
 from six.moves import UserList
 from six.moves import tkinter
@@ -77,11 +83,17 @@ class SelectGameNode(SelectDialogTreeNode):
 # ************************************************************************
 
 class SelectGameData(SelectDialogTreeData):
+    PREVIEW_CACHE_SIZE = 64 * 1024 * 1024
+
     def __init__(self, app):
         SelectDialogTreeData.__init__(self)
         self.all_games_gi = list(map(
             app.gdb.get,
             app.gdb.getGamesIdSortedByName()))
+        self.search_index = GameSearchIndex(app.gdb.getAllGames())
+        self.preview_cache = FileCache(
+            os.path.join(app.dn.cache, "previews"),
+            self.PREVIEW_CACHE_SIZE, ".png")
         self.no_games = [SelectGameLeaf(None, None, _("(no games)"), None), ]
         #
         s_by_type = s_oriental = s_special = s_original = s_contrib = \
@@ -343,6 +355,7 @@ class SelectGameDialog(MfxDialog):
 
 class SelectGameDialogWithPreview(SelectGameDialog):
     Tree_Class = SelectGameTreeWithPreview
+    SEARCH_DELAY = 150              # milliseconds after the last keystroke
 
     def __init__(self, parent, title, app, gameid, bookmark=None, **kw):
         kw = self.initKw(kw)
@@ -355,6 +368,7 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.gameid = gameid
         self.bookmark = bookmark
         self.criteria = SearchCriteria()
+        self.search_timer = None
         self.random = None
         if self.TreeDataHolder_Class.data is None:
             self.TreeDataHolder_Class.data = self.TreeData_Class(app)
@@ -483,6 +497,7 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         self.preview_key = -1
         self.preview_game = None
         self.preview_app = None
+        self.preview_cache = self.TreeDataHolder_Class.data.preview_cache
         self.updatePreview(gameid, animations=0)
         # focus = self.tree.frame
         self.mainloop(focus, kw.timeout, geometry=geometry)
@@ -496,6 +511,8 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         return SelectGameDialog.initKw(self, kw)
 
     def destroy(self):
+        after_cancel(self.search_timer)
+        self.search_timer = None
         self.deletePreview(destroy=1)
         self.preview.unbind_all()
         SelectGameDialog.destroy(self)
@@ -524,6 +541,13 @@ class SelectGameDialogWithPreview(SelectGameDialog):
             self.preview_app = None
 
     def basicSearch(self, *args):
+        # search when the user stops typing
+        after_cancel(self.search_timer)
+        self.search_timer = after(self.top, self.SEARCH_DELAY,
+                                  self._basicSearch)
+
+    def _basicSearch(self):
+        self.search_timer = None
         self.updateSearchList(self.list_searchtext.get())
 
     def updateSearchList(self, searchString):
@@ -533,110 +557,10 @@ class SelectGameDialogWithPreview(SelectGameDialog):
     def performSearch(self):
         self.list.delete(0, "end")
         self.list.vbar_show = True
-        games = self.app.gdb.getAllGames()
-
-        results = []
-        for game in games:
-            if (self.criteria.category != "" and
-                    self.criteria.categoryOptions[self.criteria.category]
-                    != game.category):
-                continue
-            if (self.criteria.type != ""
-                    and self.criteria.typeOptions[self.criteria.type]
-                    != game.si.game_type):
-                continue
-            if (self.criteria.skill != ""
-                    and self.criteria.skillOptions[self.criteria.skill]
-                    != game.skill_level):
-                continue
-            if (self.criteria.decks != ""
-                    and self.criteria.deckOptions[self.criteria.decks]
-                    != game.decks):
-                continue
-            if (self.criteria.redeals != "" and
-                    self.criteria.redeals != "Other number of redeals"
-                    and self.criteria.redealOptions[self.criteria.redeals]
-                    != game.redeals):
-                continue
-            if self.criteria.redeals == "Other number of redeals"\
-                    and game.redeals < 4:
-                continue
-
-            compat_okay = True
-            for name, games in GI.GAMES_BY_COMPATIBILITY:
-                if self.criteria.compat == name:
-                    if game.id not in games:
-                        compat_okay = False
-                        break
-
-            if not compat_okay:
-                continue
-
-            invent_okay = True
-            for name, games in GI.GAMES_BY_INVENTORS:
-                if self.criteria.inventor == name:
-                    if game.id not in games:
-                        invent_okay = False
-                        break
-
-            if not invent_okay:
-                continue
-
-            if self.criteria.version != "":
-                version_okay = False
-                version_found = False
-                for name, games in GI.GAMES_BY_PYSOL_VERSION:
-                    if self.criteria.version == name:
-                        version_found = True
-                        if game.id in games:
-                            version_okay = True
-                            break
-                    elif ((not version_found and
-                           self.criteria.versioncompare == "Present in")
-                          or (version_found and
-                              self.criteria.versioncompare == "New since")):
-                        if game.id in games:
-                            version_okay = True
-                            break
-
-                if not version_okay:
-                    continue
-
-            if (self.criteria.popular and
-                    not (game.si.game_flags & GI.GT_POPULAR)):
-                continue
-            if (self.criteria.children and
-                    not (game.si.game_flags & GI.GT_CHILDREN)):
-                continue
-            if (self.criteria.scoring and
-                    not (game.si.game_flags & GI.GT_SCORE)):
-                continue
-            if (self.criteria.stripped and
-                    not (game.si.game_flags & GI.GT_STRIPPED)):
-                continue
-            if (self.criteria.separate and
-                    not (game.si.game_flags & GI.GT_SEPARATE_DECKS)):
-                continue
-            if (self.criteria.open and not (game.si.game_flags & GI.GT_OPEN)):
-                continue
-            if (self.criteria.relaxed and
-                    not (game.si.game_flags & GI.GT_RELAXED)):
-                continue
-            if (self.criteria.original and
-                    not (game.si.game_flags & GI.GT_ORIGINAL)):
-                continue
-
-            if self.app.checkSearchString(self.criteria.name, game.name):
-                results.append(game.name)
-            if self.criteria.usealt:
-                for altname in game.altnames:
-                    if self.app.checkSearchString(self.criteria.name, altname):
-                        results.append(altname)
-        results.sort(key=lambda x: x.lower())
-        pos = 0
-        for result in results:
-            self.list.insert(pos, result)
-            pos += 1
+        index = self.TreeDataHolder_Class.data.search_index
+        results = index.search(self.criteria)
+        if results:
+            self.list.insert(0, *results)
 
     def advancedSearch(self):
         d = SelectGameAdvancedSearch(self.top, _("Advanced search"),
@@ -685,12 +609,89 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         if gameid == self.preview_key:
             return
         self.deletePreview()
-        canvas = self.preview.canvas
         #
         gi = self.app.gdb.get(gameid)
         if not gi:
             self.preview_key = -1
             return
+        # self.top.wm_title("Select Game - " +
+        #   self.app.getGameTitleName(gameid))
+        title = self.app.getGameTitleName(gameid)
+        self.top.wm_title(_("Select Game - %(game)s") % {'game': title})
+        #
+        if not self.showCachedPreview(gi):
+            self.showLivePreview(gi, animations)
+        self.preview_key = gameid
+        #
+        self.updateInfo(gameid)
+        #
+        rules_button = self.buttons[0]
+        if self.app.getGameRulesFilename(gameid):
+            rules_button.config(state="normal")
+        else:
+            rules_button.config(state="disabled")
+
+    def getPreviewCacheKey(self, gi):
+        name, backname = self.app.opt.cardset[gi.category]
+        cardset = self.app.cardset_manager.getByName(name)
+        if cardset is None:
+            return None
+        return (VERSION, gi.id, cardset.name, backname,
+                cardset.CARDW, cardset.CARDH, self.preview.canvas.preview)
+
+    def showCachedPreview(self, gi):
+        # show the image of the game's first deal, the game is only
+        # created when the image is clicked
+        if self.preview_cache is None or gi.id == self.gameid:
+            return False
+        key = self.getPreviewCacheKey(gi)
+        filename = key and self.preview_cache.get(key)
+        if not filename:
+            return False
+        # the deal of the image is played when this game is selected
+        seed = self.preview_cache.getInfo(key)
+        try:
+            random = construct_random(seed) if seed else None
+        except ValueError:
+            random = None
+        if random is None:
+            return False
+        try:
+            image = tkinter.PhotoImage(file=filename)
+        except tkinter.TclError:
+            return False
+        canvas = self.preview.canvas
+        item = MfxCanvasImage(canvas, 0, 0, image=image, anchor='nw')
+        bind(item, '<1>', lambda e: self.showLivePreview(gi))
+        canvas.config(scrollregion=(0, 0, image.width(), image.height()))
+        canvas.xview_moveto(0)
+        canvas.yview_moveto(0)
+        self.random = random
+        self.random.origin = self.random.ORIGIN_PREVIEW
+        return True
+
+    def savePreview(self, gi):
+        if self.preview_cache is None:
+            return
+        key = self.getPreviewCacheKey(gi)
+        if key is None:
+            return
+        image = canvasImage(self.preview.canvas,
+                            self.preview_game.width, self.preview_game.height)
+        seed = self.preview_game.random.getSeedAsStr()
+        try:
+            self.preview_cache.put(
+                key, lambda filename: image.write(filename, format='png'),
+                info=seed)
+        except (OSError, tkinter.TclError):
+            # no preview cache
+            self.preview_cache = None
+
+    def showLivePreview(self, gi, animations=10):
+        canvas = self.preview.canvas
+        if self.preview_game is None:
+            # the cached image
+            canvas.deleteAllItems()
         #
         if self.preview_app is None:
             self.preview_app = Struct(
@@ -737,18 +738,14 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         if self.preview_game:
             self.preview_game.endGame()
             self.preview_game.destruct()
-        # self.top.wm_title("Select Game - " +
-        #   self.app.getGameTitleName(gameid))
-        title = self.app.getGameTitleName(gameid)
-        self.top.wm_title(_("Select Game - %(game)s") % {'game': title})
         #
         self.preview_game = gi.gameclass(gi)
         self.preview_game.createPreview(self.preview_app)
         #
         random = None
-        if gameid == self.gameid:
+        if gi.id == self.gameid:
             random = self.app.game.random.copy()
-        if gameid == self.gameid and self.bookmark:
+        if gi.id == self.gameid and self.bookmark:
             self.preview_game.restoreGameFromBookmark(self.bookmark)
         else:
             self.preview_game.newGame(random=random, autoplay=1)
@@ -756,6 +753,8 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         canvas.config(scrollregion=(0, 0, gw, gh))
         canvas.xview_moveto(0)
         canvas.yview_moveto(0)
+        if gi.id != self.gameid:
+            self.savePreview(gi)
         #
         self.preview_app.audio = self.app.audio
         if self.app.opt.animations:
@@ -765,15 +764,6 @@ class SelectGameDialogWithPreview(SelectGameDialog):
         # save seed
         self.random = self.preview_game.random.copy()
         self.random.origin = self.random.ORIGIN_PREVIEW
-        self.preview_key = gameid
-        #
-        self.updateInfo(gameid)
-        #
-        rules_button = self.buttons[0]
-        if self.app.getGameRulesFilename(gameid):
-            rules_button.config(state="normal")
-        else:
-            rules_button.config(state="disabled")
 
     def updateInfo(self, gameid):
         gi = self.app.gdb.get(gameid)
@@ -825,61 +815,6 @@ class SelectGameDialogWithPreview(SelectGameDialog):
             text_label.config(text=t)
 
 
-class SearchCriteria:
-    def __init__(self):
-        self.name = ""
-        self.usealt = True
-        self.category = ""
-        self.type = ""
-        self.skill = ""
-        self.decks = ""
-        self.redeals = ""
-        self.compat = ""
-        self.inventor = ""
-        self.versioncompare = "New in"
-        self.version = ""
-
-        self.popular = False
-        self.children = False
-        self.scoring = False
-        self.stripped = False
-        self.separate = False
-        self.open = False
-        self.relaxed = False
-        self.original = False
-
-        categoryOptions = {-1: ""}
-        categoryOptions.update(CSI.TYPE_NAME)
-        del categoryOptions[7]  # Navagraha Ganjifa is unused.
-        self.categoryOptions = dict((v, k) for k, v in categoryOptions.items())
-
-        typeOptions = {-1: ""}
-        typeOptions.update(GI.TYPE_NAMES)
-        del typeOptions[29]  # Simple games type is unused.
-        self.typeOptions = dict((v, k) for k, v in typeOptions.items())
-
-        skillOptions = {-1: ""}
-        skillOptions.update(GI.SKILL_LEVELS)
-        self.skillOptions = dict((v, k) for k, v in skillOptions.items())
-
-        self.deckOptions = {"": 0,
-                            "1 deck games": 1,
-                            "2 deck games": 2,
-                            "3 deck games": 3,
-                            "4 deck games": 4}
-
-        self.redealOptions = {"": -3,
-                              "No redeal": 0,
-                              "1 redeal": 1,
-                              "2 redeals": 2,
-                              "3 redeals": 3,
-                              "Unlimited redeals": -1,
-                              "Variable redeals": -2,
-                              "Other number of redeals": 4}
-
-        self.versionCompareOptions = ("New in", "Present in", "New since")
-
-
 class SelectGameAdvancedSearch(MfxDialog):
     def __init__(self, parent, title, criteria, **kw):
         kw = self.initKw(kw)
@@ -1,69 +1,111 @@
-import os
-import time
-
 from pysollib.mfxutil import KwStruct
-from pysollib.mfxutil import format_time
 from pysollib.mygettext import _
-from pysollib.settings import TOP_TITLE
-from pysollib.stats import ProgressionFormatter, PysolStatsFormatter
-from pysollib.ui.tktile.tkutil import bind, loadImage
 
 from six.moves import tkinter
 from six.moves import tkinter_font
 from six.moves import tkinter_ttk as ttk
 
-from .tkwidget import MfxDialog, MfxMessageDialog
+from .tkwidget import MfxDialog
 
 
 # ************************************************************************
-# *
+# * Global leaderboard.
+# * Only one page is requested from the server at a time, and the same
+# * rows of widgets are reused for every page, so the dialog does not
+# * grow with the number of players.
 # ************************************************************************
 class Leaderboard(MfxDialog):
+    PAGE_SIZE = 20
+
     def __init__(self, parent, app, game, player, **kw):
-        try:
-            player_scores = game.get_leaderboard()
-            player_scores = sorted(player_scores, key=lambda p: p["score"], reverse=True)
-        except Exception as e:
-            player_scores = None
-            print(e)
-        
+        self.game = game
+        self.player = player
+        self.offset = 0
+        self.has_next = False
+
         kw = self.initKw(kw)
         title = _('Leaderboard')
         MfxDialog.__init__(self, parent, title, kw.resizable, kw.default)
 
-        self.font = app.getFont('default')
-        self.tkfont = tkinter_font.Font(parent, self.font)
-        self.font_metrics = self.tkfont.metrics()
         style = ttk.Style(parent)
         heading_font = style.lookup('Heading', 'font')  # treeview heading
         heading_tkfont = tkinter_font.Font(parent, heading_font)
 
         top_frame, bottom_frame = self.createFrames(kw)
-        tkinter.Label(top_frame, text="Global leaderboard scores").grid(column=0, row=0)
+        tkinter.Label(top_frame, text="Global leaderboard scores").grid(
+            column=0, row=0)
 
         table_frame = tkinter.Frame(top_frame)
         table_frame.grid(column=0, row=1, padx=10, pady=10)
 
-        e = tkinter.Entry(table_frame, width=40, font=heading_tkfont)
-        e.grid(row=0, column=0)
-        e.insert(tkinter.END, "Player Name")
+        widths = (8, 40, 20)
+        for column, (text, width) in enumerate(
+                zip(("Rank", "Player Name", "Score"), widths)):
+            e = tkinter.Entry(table_frame, width=width, font=heading_tkfont)
+            e.grid(row=0, column=column)
+            e.insert(tkinter.END, text)
 
-        e = tkinter.Entry(table_frame, width=20, font=heading_tkfont)
-        e.grid(row=0, column=1)
-        e.insert(tkinter.END, "Score")
+        self.rows = []
+        for idx in range(self.PAGE_SIZE):
+            row = []
+            for column, width in enumerate(widths):
+                e = tkinter.Entry(table_frame, width=width)
+                e.grid(row=idx + 1, column=column)
+                row.append(e)
+            self.rows.append(row)
 
-        for idx, player in enumerate(player_scores):
-            e = tkinter.Entry(table_frame, width=40)
-            e.grid(row=idx + 1, column=0)
-            e.insert(tkinter.END, player["player"])
+        nav_frame = tkinter.Frame(top_frame)
+        nav_frame.grid(column=0, row=2, pady=5)
+        self.prev_button = ttk.Button(nav_frame, text=_("Previous"),
+                                      command=self.prevPage)
+        self.prev_button.grid(column=0, row=0, padx=5)
+        ttk.Button(nav_frame, text=_("My rank"),
+                   command=self.playerPage).grid(column=1, row=0, padx=5)
+        self.next_button = ttk.Button(nav_frame, text=_("Next"),
+                                      command=self.nextPage)
+        self.next_button.grid(column=2, row=0, padx=5)
 
-            e = tkinter.Entry(table_frame, width=20)
-            e.grid(row=idx + 1, column=1)
-            e.insert(tkinter.END, player["score"])
+        self.showPage(0)
 
         focus = self.createButtons(bottom_frame, kw)
         self.mainloop(focus, kw.timeout)
 
+    def showPage(self, offset, around=None):
+        try:
+            # ask for one extra row to know if there is a next page
+            scores = self.game.get_leaderboard(
+                limit=self.PAGE_SIZE + 1, offset=offset, around=around)
+        except Exception as e:
+            print(e)
+            return
+        if around is not None and scores:
+            offset = scores[0]["position"]
+        self.offset = offset
+        self.has_next = len(scores) > self.PAGE_SIZE
+        scores = scores[:self.PAGE_SIZE]
+        for idx, row in enumerate(self.rows):
+            values = ("", "", "")
+            if idx < len(scores):
+                p = scores[idx]
+                values = (p["rank"], p["player"], p["score"])
+            for e, v in zip(row, values):
+                e.delete(0, tkinter.END)
+                e.insert(tkinter.END, v)
+        self.prev_button.config(
+            state='normal' if self.offset > 0 else 'disabled')
+        self.next_button.config(
+            state='normal' if self.has_next else 'disabled')
+
+    def prevPage(self):
+        self.showPage(max(0, self.offset - self.PAGE_SIZE))
+
+    def nextPage(self):
+        if self.has_next:
+            self.showPage(self.offset + self.PAGE_SIZE)
+
+    def playerPage(self):
+        self.showPage(0, around=self.player)
+
     def initKw(self, kw):
         kw = KwStruct(
             kw,
@@ -220,6 +220,7 @@ class PysolMenubarTkCommon:
             bookmarks=tkinter.BooleanVar(),
             hint=tkinter.BooleanVar(),
             free_hint=tkinter.BooleanVar(),
+            search_hints=tkinter.BooleanVar(),
             shuffle=tkinter.BooleanVar(),
             highlight_piles=tkinter.BooleanVar(),
             highlight_cards=tkinter.BooleanVar(),
@@ -283,6 +284,7 @@ class PysolMenubarTkCommon:
         tkopt.undo.set(opt.undo)
         tkopt.hint.set(opt.hint)
         tkopt.free_hint.set(opt.free_hint)
+        tkopt.search_hints.set(opt.search_hints)
         tkopt.shuffle.set(opt.shuffle)
         tkopt.bookmarks.set(opt.bookmarks)
         tkopt.highlight_piles.set(opt.highlight_piles)
@@ -587,6 +589,9 @@ class PysolMenubarTkCommon:
         submenu.add_checkbutton(
             label=n_("Free hin&ts"), variable=self.tkopt.free_hint,
             command=self.mOptFreeHints)
+        submenu.add_checkbutton(
+            label=n_("S&earch hints"), variable=self.tkopt.search_hints,
+            command=self.mOptSearchHints)
         submenu.add_checkbutton(
             label=n_("Enable highlight p&iles"),
             variable=self.tkopt.highlight_piles,
@@ -1424,6 +1429,12 @@ Unsupported game for import.
         self.app.opt.free_hint = self.tkopt.free_hint.get()
         self.game.updateMenus()
 
+    def mOptSearchHints(self, *args):
+        if self._cancelDrag(break_pause=False):
+            return
+        self.app.opt.search_hints = self.tkopt.search_hints.get()
+        self.game.hints.list = None
+
     def mOptEnableShuffle(self, *args):
         if self._cancelDrag(break_pause=False):
             return
@@ -6,6 +6,9 @@ from six.moves import tkinter
 
 
 class BaseSolverDialog:
+    # the output of a running solver is read every SOLVER_POLL_DELAY ms
+    SOLVER_POLL_DELAY = 50
+
     def _ToggleShowProgressButton(self, *args):
         self.app.opt.solver_show_progress = self.progress_var.get()
 
@@ -32,6 +35,8 @@ class BaseSolverDialog:
         top_frame, bottom_frame = self.createFrames(kw)
         self.createBitmaps(top_frame, kw)
         self.games = {}                 # key: gamename; value: gameid
+        self.solver = None              # the running solver
+        self.solver_timer = None
 
         #
         frame = self._calcToolkit().Frame(top_frame)
@@ -122,18 +127,25 @@ class BaseSolverDialog:
         focus = self.createButtons(bottom_frame, kw)
         self.start_button = self.buttons[0]
         self.play_button = self.buttons[1]
+        self.start_button_text = self.start_button.cget('text')
+        self.start_button_underline = self.start_button.cget('underline')
         self._reset()
         self.connectGame(self.app.game)
         self.mainloop(focus, kw.timeout, transient=False)
 
     def mDone(self, button):
         if button == 0:
-            self.startSolving()
+            if self.solver:
+                self.cancelSolving()
+            else:
+                self.startSolving()
         elif button == 1:
             self.startPlay()
         elif button == 2:
+            self.cancelSolving()
             self.app.menubar.mNewGame()
         elif button == 3:
+            self.cancelSolving()
             global solver_dialog
             solver_dialog = None
             self.destroy()
@@ -159,11 +171,11 @@ class BaseSolverDialog:
         self.top.update_idletasks()
 
     def reset(self):
+        # the game has changed
+        self.cancelSolving()
         self.play_button.config(state='disabled')
 
     def startSolving(self):
-        from pysollib.mygettext import ungettext
-
         self._reset()
         game = self.app.game
         solver = game.Solver_Class(game, self)  # create solver instance
@@ -172,13 +184,62 @@ class BaseSolverDialog:
         max_iters = self._getMaxIters()
         progress = self.app.opt.solver_show_progress
         iters_step = self.app.opt.solver_iterations_output_step
+        timeout = self.app.opt.solver_timeout
         solver.config(preset=preset, max_iters=max_iters, progress=progress,
-                      iters_step=iters_step)
+                      iters_step=iters_step, timeout=timeout)
         try:
-            solver.computeHints()
+            running = solver.startHints()
         except RuntimeError:
             self.result_label['text'] = _('Solver not found in the PATH')
             return
+        if running:
+            # the solver runs in the background, see _pollSolver()
+            self.solver = solver
+            self.start_button.config(text=_('Cancel'), underline=-1)
+            self.result_label['text'] = _('Solving...')
+            self.solver_timer = self.top.after(self.SOLVER_POLL_DELAY,
+                                               self._pollSolver)
+        else:
+            self._showSolverResult(solver)
+
+    def _pollSolver(self):
+        self.solver_timer = None
+        solver = self.solver
+        try:
+            done = solver.pollHints()
+        except RuntimeError:
+            done = True
+            solver = None
+        if not done:
+            self.solver_timer = self.top.after(self.SOLVER_POLL_DELAY,
+                                               self._pollSolver)
+            return
+        self._stopSolving()
+        if solver is None:
+            self.result_label['text'] = _('Solver not found in the PATH')
+        else:
+            self._showSolverResult(solver)
+
+    def _stopSolving(self):
+        if self.solver_timer:
+            self.top.after_cancel(self.solver_timer)
+            self.solver_timer = None
+        self.solver = None
+        self.start_button.config(text=self.start_button_text,
+                                 underline=self.start_button_underline)
+
+    def cancelSolving(self):
+        solver = self.solver
+        if solver is None:
+            return
+        # kill the solver first, the widgets may be gone at exit
+        solver.cancelHints()
+        self._stopSolving()
+        self.result_label['text'] = _('Solving cancelled')
+
+    def _showSolverResult(self, solver):
+        from pysollib.mygettext import ungettext
+
         hints_len = len(solver.hints)-1
         if hints_len > 0:
             if solver.solver_state == 'intractable':
@@ -192,6 +253,9 @@ class BaseSolverDialog:
             t = t % hints_len
             self.result_label['text'] = t
             self.play_button.config(state='normal')
+        elif solver.solver_state == 'timeout':
+            self.result_label['text'] = _('Time limit exceeded (Intractable)')
+            self.play_button.config(state='disabled')
         else:
             self.result_label['text'] = \
                 (_('I could not solve this game.')
@@ -232,6 +296,12 @@ def connect_game_solver_dialog(game):
 
 def destroy_solver_dialog():
     global solver_dialog
+    try:
+        # a running solver is in a session of its own and would outlive
+        # us, and its poll timer would fire on a destroyed dialog
+        solver_dialog.cancelSolving()
+    except Exception:
+        pass
     try:
         solver_dialog.destroy()
     except Exception:
@@ -251,17 +251,7 @@ if Image:
         def __init__(self, file=None, image=None, pil_image_orig=None):
 
             if file:
-                image = Image.open(file).convert('RGBA')
-
-                basename = os.path.basename(file)
-                file_name = os.path.splitext(basename)[0]
-
-                findsum = findfile(file_name)
-
-                if findsum != -3:  # -1 for every check
-                    image = masking(image)
-
-                    image.filename = file_name
+                image = decodeImage(file)
 
             ImageTk.PhotoImage.__init__(self, image)
             self._pil_image = image
@@ -310,6 +300,11 @@ if Image:
 
             return PIL_Image(image=im, pil_image_orig=self._pil_image_orig)
 
+        def resized(self, image):
+            # the result of resize() with the pixels of image (from the
+            # cache of scaled images)
+            return PIL_Image(image=image, pil_image_orig=self._pil_image_orig)
+
 
 def masking(image):
 
@@ -339,7 +334,26 @@ def findfile(file_name):
     return findsum
 
 
-def makeImage(file=None, data=None, dither=None, alpha=None):
+def decodeImage(file):
+    # the PIL part of loading an image file, which can run in a thread
+    # (see Images.load); the result is passed to makeImage(decoded=...)
+    image = Image.open(file).convert('RGBA')
+
+    basename = os.path.basename(file)
+    file_name = os.path.splitext(basename)[0]
+
+    findsum = findfile(file_name)
+
+    if findsum != -3:  # -1 for every check
+        image = masking(image)
+
+        image.filename = file_name
+    return image
+
+
+def makeImage(file=None, data=None, dither=None, alpha=None, decoded=None):
+    if decoded is not None:
+        return PIL_Image(image=decoded)
     kw = {}
     if data is None:
         assert file is not None
@@ -376,6 +390,39 @@ def copyImage(image, x, y, width, height):
     return dest
 
 
+def canvasImage(canvas, width, height):
+    # the image items of an MfxCanvas (cards, stack bottoms, ...) drawn
+    # into a transparent image, without the help of the screen; the
+    # background tiles are not in canvas.items
+    dest = tkinter.PhotoImage(width=width, height=height)
+    dest.blank()
+    for item in canvas.find_all():
+        if item not in canvas.items or canvas.type(item) != "image" or \
+                canvas.itemcget(item, "state") == "hidden":
+            continue
+        name = canvas.itemcget(item, "image")
+        if not name:
+            continue
+        x, y = canvas.coords(item)[:2]
+        w = int(canvas.tk.call("image", "width", name))
+        h = int(canvas.tk.call("image", "height", name))
+        anchor = canvas.itemcget(item, "anchor")
+        if anchor == "center":
+            anchor = ""
+        if "w" not in anchor:
+            x -= w if "e" in anchor else w // 2
+        if "n" not in anchor:
+            y -= h if "s" in anchor else h // 2
+        x, y = int(x), int(y)
+        # the part of the image at x >= 0, y >= 0
+        fx, fy = max(0, -x), max(0, -y)
+        if fx >= w or fy >= h or x >= width or y >= height:
+            continue
+        canvas.tk.call(dest, "copy", name, "-from", fx, fy, w, h,
+                       "-to", x + fx, y + fy)
+    return dest
+
+
 def fillImage(image, fill, outline=None):
     if not fill and not outline:
         return
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Decoding time of the card images of the largest cardsets, one file
+# after another as Images.load used to and with the threads of
+# Images.load (Images.DECODE_THREADS, which is 1 on a single CPU: then
+# Images.load decodes on the main thread):
+#
+#     python3 scripts/bench_cardset_load.py [--largest 3] [DIR ...]
+#
+# DIR is a directory with cardset-* subdirectories (default: the data
+# directory, $PYSOL_CARDSETS and ~/.PySolFC/cardsets). With a display
+# the whole Images.load() is timed too, which includes making the Tk
+# images on the main thread. Needs PIL.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.cardsetparser import read_cardset_config  # noqa: E402
+from pysollib.images import Images  # noqa: E402
+from pysollib.mfxutil import Image  # noqa: E402
+from pysollib.pysoltk import decodeImage  # noqa: E402
+from pysollib.resource import CardsetManager  # noqa: E402
+from pysollib.util import DataLoader  # noqa: E402
+
+from six.moves import tkinter  # noqa: E402
+
+
+def findCardsets(dirs):
+    manager = CardsetManager()
+    for dirname in dirs:
+        try:
+            subdirs = [os.path.join(dirname, d) for d in os.listdir(dirname)
+                       if d.startswith('cardset-')]
+        except OSError:
+            continue
+        for d in sorted(subdirs):
+            config = os.path.join(d, "config.txt")
+            if os.path.isfile(config):
+                cs = read_cardset_config(d, config)
+                if cs and not manager.getByName(cs.name):
+                    manager.register(cs)
+    return list(manager.getAll())
+
+
+THREADS = max(2, Images.DECODE_THREADS)
+
+
+def getFiles(cs):
+    return [os.path.join(cs.dir, n + cs.ext)
+            for n in cs.getFaceCardNames()] + \
+        [os.path.join(cs.dir, n) for n in cs.backnames if n]
+
+
+def decodeSerial(files):
+    for f in files:
+        decodeImage(f)
+
+
+def decodeThreaded(files):
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(decodeImage, files))
+
+
+def loadImages(cs, dataloader):
+    Images(dataloader, cs).load(app=None)
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cardset load benchmark")
+    parser.add_argument("dirs", nargs="*")
+    parser.add_argument("--largest", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    if not Image:
+        sys.exit("PIL is needed")
+    dirs = args.dirs or [
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                     'data'),
+        os.environ.get("PYSOL_CARDSETS", ""),
+        os.path.expanduser(os.path.join("~", ".PySolFC", "cardsets"))]
+    cardsets = findCardsets(dirs)
+    if not cardsets:
+        sys.exit("no cardsets found in " + ", ".join(d for d in dirs if d))
+    cardsets.sort(key=lambda cs: -cs.ncards * cs.CARDW * cs.CARDH)
+    try:
+        root = tkinter.Tk()
+        root.withdraw()
+        dataloader = DataLoader(__file__, "pysolfc.glade")
+    except tkinter.TclError:
+        root = None
+    print("%d decoding threads, %d in Images.load" % (
+        THREADS, Images.DECODE_THREADS))
+    for cs in cardsets[:args.largest]:
+        files = getFiles(cs)
+        print("%s: %d files, %dx%d" % (cs.name, len(files), cs.CARDW,
+                                       cs.CARDH))
+        tests = [("decode serial", decodeSerial, files),
+                 ("decode threads", decodeThreaded, files)]
+        if root is not None:
+            tests.append(("Images.load", loadImages, cs, dataloader))
+        for test in tests:
+            t = min(timeit(*test[1:]) for i in range(args.repeat))
+            print("    %-16s %7.1f ms" % (test[0], t * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Micro-benchmark of the code region state tracking: the comma-joined
+# string of all stack tops that used to be rebuilt for every candidate
+# move, against the incremental Zobrist hash of pysollib/codestate.py.
+#
+# A simple player script is run over many Klondike deals on a minimal
+# card model, once with each kind of state:
+#
+#     python3 scripts/bench_code_state.py --games 500
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.acard import AbstractCard  # noqa: E402
+from pysollib.codestate import TopCardsHash  # noqa: E402
+
+suite_to_letter = "cshd"
+
+
+class Stack:
+    def __init__(self, id, kind):
+        self.id = id
+        self.kind = kind
+        self.cards = []
+
+    def accepts(self, card, ncards):
+        if self.kind == "foundation":
+            if ncards != 1:
+                return False
+            if not self.cards:
+                return card.rank == 0
+            top = self.cards[-1]
+            return top.suit == card.suit and top.rank + 1 == card.rank
+        if self.kind == "row":
+            if not self.cards:
+                return card.rank == 12
+            top = self.cards[-1]
+            return top.color != card.color and top.rank == card.rank + 1
+        return False
+
+    def canDropCards(self, stacks):
+        # like Stack.canDropCards(), but also moves face-up piles
+        # between rows
+        if not self.cards:
+            return None, 0
+        nup = 1
+        if self.kind == "row":
+            while nup < len(self.cards) and self.cards[-nup-1].face_up:
+                nup += 1
+        for to_stack in stacks:
+            if to_stack is self:
+                continue
+            for n in range(1, nup + 1):
+                card = self.cards[-n]
+                if to_stack.accepts(card, n):
+                    if n == len(self.cards) and not to_stack.cards \
+                            and card.rank == 12:
+                        continue
+                    return to_stack, n
+        return None, 0
+
+
+class Klondike:
+    def __init__(self, seed):
+        cards = [AbstractCard(s * 13 + r, 0, s, r, None)
+                 for s in range(4) for r in range(13)]
+        random.Random(seed).shuffle(cards)
+        self.rows = tuple(Stack(i, "row") for i in range(7))
+        self.foundations = tuple(Stack(7 + i, "foundation") for i in range(4))
+        self.waste = Stack(11, "waste")
+        self.talon = Stack(12, "talon")
+        for i in range(7):
+            for j in range(i, 7):
+                self.rows[j].cards.append(cards.pop())
+            self.rows[i].cards[-1].face_up = 1
+        self.talon.cards = cards
+        self.rounds = 0
+
+    def move(self, from_stack, ncards, to_stack):
+        to_stack.cards.extend(from_stack.cards[-ncards:])
+        del from_stack.cards[-ncards:]
+        if from_stack.cards and not from_stack.cards[-1].face_up:
+            from_stack.cards[-1].face_up = 1
+
+    def dealCards(self):
+        if self.talon.cards:
+            card = self.talon.cards.pop()
+            card.face_up = 1
+            self.waste.cards.append(card)
+            return True
+        if self.rounds < 2 and self.waste.cards:
+            self.talon.cards = self.waste.cards[::-1]
+            self.waste.cards = []
+            self.rounds += 1
+            return True
+        return False
+
+    def won(self):
+        return sum(len(s.cards) for s in self.foundations) == 52
+
+
+class StringState:
+    # the string state of the code region before the Zobrist hash
+
+    def __init__(self, game):
+        self.stacks = game.rows + game.foundations + (game.waste,)
+
+    def _top(self, card):
+        if card is None:
+            return "-1,"
+        return f"{suite_to_letter[card.suit]}{card.rank},"
+
+    def current(self):
+        state = ""
+        for s in self.stacks:
+            state += self._top(s.cards[-1] if s.cards else None)
+        return state
+
+    def future(self, from_stack, ncards, to_stack):
+        state = ""
+        for s in self.stacks:
+            new_top = s.cards[-1] if s.cards else None
+            if s == from_stack:
+                if len(from_stack.cards) <= ncards:
+                    new_top = None
+                else:
+                    new_top = from_stack.cards[-(ncards + 1)]
+            elif s == to_stack:
+                new_top = from_stack.cards[-1]
+            state += self._top(new_top)
+        return state
+
+    def moved(self, from_stack, to_stack):
+        return self.current()
+
+    def resync(self):
+        pass
+
+
+class HashState:
+    def __init__(self, game):
+        self.hash = TopCardsHash(game.rows + game.foundations + (game.waste,))
+
+    def current(self):
+        return self.hash.value
+
+    def future(self, from_stack, ncards, to_stack):
+        return self.hash.probe(from_stack, ncards, to_stack)
+
+    def moved(self, from_stack, to_stack):
+        self.hash.update(from_stack)
+        return self.hash.update(to_stack)
+
+    def resync(self):
+        self.hash.resync()
+
+
+def play(game, state, step_max=150):
+    # the code region's move(tableau(), ...) loop, with its state_set;
+    # returns the time spent on states too
+    state_set = set()
+    steps = 0
+    state_time = [0.0]
+    clock = time.perf_counter
+
+    def try_move(from_stacks, to_stacks):
+        for s in from_stacks:
+            to_stack, ncards = s.canDropCards(to_stacks)
+            if to_stack:
+                t = clock()
+                seen = state.future(s, ncards, to_stack) in state_set
+                state_time[0] += clock() - t
+                if seen:
+                    continue
+                game.move(s, ncards, to_stack)
+                t = clock()
+                state_set.add(state.moved(s, to_stack))
+                state_time[0] += clock() - t
+                return True
+        return False
+
+    while steps < step_max and not game.won():
+        if (try_move(game.rows + (game.waste,), game.foundations) or
+                try_move(game.rows, game.rows) or
+                try_move((game.waste,), game.rows)):
+            steps += 1
+        elif game.dealCards():
+            state.resync()
+        else:
+            break
+    return game.won(), steps, state_time[0]
+
+
+def run(state_class, ngames):
+    wins = moves = 0
+    state_time = 0.0
+    start = time.perf_counter()
+    for seed in range(ngames):
+        game = Klondike(seed)
+        won, steps, t = play(game, state_class(game))
+        wins += won
+        moves += steps
+        state_time += t
+    return time.perf_counter() - start, state_time, wins, moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=500)
+    args = parser.parse_args()
+    results = {}
+    for name, state_class in (("string", StringState), ("zobrist", HashState)):
+        elapsed, state_time, wins, moves = run(state_class, args.games)
+        results[name] = state_time
+        print("%-8s total %7.3f s  states %7.3f s  %5d won  %6d moves" % (
+            name, elapsed, state_time, wins, moves))
+    print("state tracking speedup: %.1fx" % (
+        results["string"] / results["zobrist"]))
+
+
+if __name__ == "__main__":
+    main()
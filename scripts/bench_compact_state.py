@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Memory per cloned position and hint speed of the compact position
+# model (pysollib/compactstate.py), on Klondike positions built from
+# the real stack classes:
+#
+#     python3 scripts/bench_compact_state.py --positions 10000
+#
+# "stack clones" copies every stack the way AbstractHint.ClonedStack
+# used to (a copy of the stack object with its model data and card
+# list), "positions" keeps Position objects (arrays of card codes) and
+# "position keys" their bytes (Position.key()).
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'tests', 'lib'))
+
+from pysol_tests.test_compactstate import MockGame  # noqa: E402
+
+from pysollib.compactstate import CardTable  # noqa: E402
+from pysollib.compactstate import GameView, Position  # noqa: E402
+from pysollib.hint import DefaultHint  # noqa: E402
+
+
+class OldClonedStack:
+    def __init__(self, stack, stackcards):
+        self.__class__ = stack.__class__
+        stack.copyModel(self)
+        self.cards = stackcards[:]
+
+
+def cloneStacks(game):
+    return [OldClonedStack(s, s.cards) for s in game.allstacks]
+
+
+def measure(func, game, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [func(game) for i in range(n)]
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for i in range(n):
+        func(game)
+    elapsed = time.perf_counter() - start
+    del kept
+    return size / n, elapsed / n
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact position model benchmark")
+    parser.add_argument("--positions", type=int, default=10000)
+    parser.add_argument("--hints", type=int, default=300)
+    args = parser.parse_args()
+
+    game = MockGame(1)
+    game.play(random.Random(1), 40)
+    for name, func in (("stack clones", cloneStacks),
+                       ("positions", Position.fromGame),
+                       ("position keys",
+                        lambda g: Position.fromGame(g).key())):
+        size, t = measure(func, game, args.positions)
+        print("%-14s %6.0f bytes %6.1f us per position" % (
+            name, size, t * 1e6))
+
+    table = CardTable(game.cards)
+    for name, target in (
+            ("hints on game", lambda: game),
+            ("hints on view",
+             lambda: GameView(game, Position.fromGame(game), table))):
+        start = time.perf_counter()
+        for i in range(args.hints):
+            DefaultHint(target(), 2).getHints()
+        elapsed = time.perf_counter() - start
+        print("%-14s %6.0f us per getHints()" % (
+            name, elapsed / args.hints * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Startup time of the games database:
+#
+#     python3 scripts/bench_game_registration.py --runs 3
+#
+# "import" imports all game modules (pysollib.games, ultra, mahjongg and
+# special) in a new interpreter, as main.py does, including the sorted
+# lists built at the end of GameManager.bulkRegistration(). "checks"
+# registers the same games again in an empty GameManager with the
+# duplicate checks of CHECK_GAMES; some games share their class on
+# purpose (Matrix 3x3 ... 10x10), these are rejected by the checks.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+TOP = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, TOP)
+
+from pysollib.gamedb import GAME_DB  # noqa: E402
+from pysollib.gamedb import GameInfoException, GameManager  # noqa: E402
+
+IMPORT = '''
+import time
+from pysollib.gamedb import GAME_DB
+start = time.perf_counter()
+with GAME_DB.bulkRegistration():
+    import pysollib.games
+    import pysollib.games.ultra
+    import pysollib.games.mahjongg
+    import pysollib.games.special
+print(len(GAME_DB.getAllGames()), time.perf_counter() - start)
+'''
+
+
+def runImport():
+    out = subprocess.check_output([sys.executable, '-c', IMPORT], cwd=TOP)
+    ngames, elapsed = out.split()
+    return int(ngames), float(elapsed)
+
+
+def runChecks(gameinfos):
+    import pysollib.settings
+    check_games = pysollib.settings.CHECK_GAMES
+    pysollib.settings.CHECK_GAMES = True
+    try:
+        gdb = GameManager()
+        rejected = 0
+        start = time.perf_counter()
+        with gdb.bulkRegistration():
+            for gi in gameinfos:
+                try:
+                    gdb.register(gi)
+                except GameInfoException:
+                    rejected += 1
+        return rejected, time.perf_counter() - start
+    finally:
+        pysollib.settings.CHECK_GAMES = check_games
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Game registration benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [runImport() for i in range(args.runs)]
+    print("import  %d games: %.3f s" % (results[0][0],
+                                        min(r[1] for r in results)))
+
+    with GAME_DB.bulkRegistration():
+        import pysollib.games  # noqa: F401
+        import pysollib.games.ultra  # noqa: F401
+        import pysollib.games.mahjongg  # noqa: F401
+        import pysollib.games.special  # noqa: F401
+    gameinfos = [GAME_DB.get(gameid)
+                 for gameid in range(1, 1000000) if GAME_DB.get(gameid)]
+    results = [runChecks(gameinfos) for i in range(args.runs)]
+    print("checks  %d games, %d rejected: %.1f ms" % (
+        len(gameinfos), results[0][0], min(r[1] for r in results) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
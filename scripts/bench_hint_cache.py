@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Hit rate of the hint cache of a game (pysollib/game/hintcache.py) in
+# games played without a GUI (pysollib/headless.py), without the cache
+# (--size 0) and with it:
+#
+#     python3 scripts/bench_hint_cache.py --deals 20 --game 2
+#
+# "player" asks for a hint before every move and plays it, then lets
+# autoplay flip and drop cards; every few moves it undoes two moves and
+# redoes them. "demo" is the demo (Game.playOneDemoMove). The stuck
+# check runs after every move in both, like in the game.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.headless import createGame, dealGame, playDemo  # noqa: E402
+
+
+def playPlayer(game, max_moves=300, undo_every=5):
+    for i in range(max_moves):
+        h = game.showHint(0, sleep=0)
+        if h:
+            ncards, from_stack, to_stack = h[2:5]
+            from_stack.moveMove(ncards, to_stack)
+        elif game.canDealCards():
+            game.dealCards()
+        else:
+            break
+        game.finishMove()
+        game.autoPlay()
+        if game.isGameWon():
+            break
+        if i % undo_every == undo_every - 1 and game.moves.index >= 2:
+            game.undo()
+            game.undo()
+            game.redo()
+            game.redo()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hint cache benchmark")
+    parser.add_argument("--deals", type=int, default=20)
+    parser.add_argument("--game", type=int, default=2,
+                        help="game id (default: Klondike)")
+    parser.add_argument("--size", type=int, default=100,
+                        help="positions kept by the cache")
+    args = parser.parse_args()
+
+    game = createGame(args.game)
+    for name, play in (("player", playPlayer), ("demo", playDemo)):
+        for size in (0, args.size):
+            game.HINT_CACHE_SIZE = size
+            hits = misses = 0
+            start = time.perf_counter()
+            for seed in range(1, args.deals + 1):
+                dealGame(game, seed)
+                play(game)
+                hits += game.hint_cache.hits
+                misses += game.hint_cache.misses
+            elapsed = time.perf_counter() - start
+            print("%-7s cache %4d: %6d hint computations, %6d hits "
+                  "(%4.1f%%) %7.1f ms per deal" % (
+                      name, size, misses, hits,
+                      100.0 * hits / max(1, hits + misses),
+                      elapsed * 1000 / args.deals), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Demo win rate with the hints of the game (DefaultHint and subclasses)
+# and with the search hints (pysollib/hintsearch.py), on many deals of
+# Klondike, Yukon and Gypsy played by the demo without a GUI
+# (pysollib/headless.py):
+#
+#     python3 scripts/bench_search_hints.py --deals 30 --nodes 500
+#
+# The same game numbers are played both ways. "nodes/s" is the number
+# of positions expanded by the search per second.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.headless import createGame, dealGame, playDemo  # noqa: E402
+from pysollib.hintsearch import SearchHint, search_stats  # noqa: E402
+
+
+def playDeals(game, deals, search):
+    game.app.opt.search_hints = search
+    search_stats.reset()
+    wins = moves = 0
+    start = time.perf_counter()
+    for seed in deals:
+        dealGame(game, seed)
+        wins += playDemo(game)
+        moves += game.moves.index
+    elapsed = time.perf_counter() - start
+    return wins, moves, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search hints benchmark")
+    parser.add_argument("--deals", type=int, default=30)
+    parser.add_argument("--first", type=int, default=1,
+                        help="first game number")
+    parser.add_argument("--nodes", type=int, default=SearchHint.MAX_NODES,
+                        help="node budget of a search")
+    parser.add_argument("--games", default="2,19,1",
+                        help="game ids (default: Klondike, Yukon, Gypsy)")
+    args = parser.parse_args()
+
+    SearchHint.MAX_NODES = args.nodes
+    deals = range(args.first, args.first + args.deals)
+    for gameid in [int(i) for i in args.games.split(",")]:
+        game = createGame(gameid)
+        name = game.gameinfo.short_name
+        for search in (False, True):
+            wins, moves, elapsed = playDeals(game, deals, search)
+            line = "%-10s %-7s won %3d of %d (%3.0f%%) %6.1f moves %6.1f ms" \
+                % (name, search and "search" or "hints", wins, args.deals,
+                   100.0 * wins / args.deals, moves / args.deals,
+                   elapsed * 1000 / args.deals)
+            if search and search_stats.time:
+                line += " %6d searches %6.0f nodes/s" % (
+                    search_stats.searches,
+                    search_stats.nodes / search_stats.time)
+            print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
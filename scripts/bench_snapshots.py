@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Benchmark of the snapshot bookkeeping of long games: the plain list
+# that Game.snapshots used to be, against SnapshotStore
+# (pysollib/game/snapshots.py). Each move checks and records one
+# snapshot hash, like Game.updateSnapshots(), and the game is saved and
+# loaded again at the end:
+#
+#     python3 scripts/bench_snapshots.py --moves 10000 --games 5
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.game.snapshots import SnapshotStore  # noqa: E402
+
+
+def game_snapshots(seed, nmoves):
+    # about one move in five goes back to a position seen before
+    rnd = random.Random(seed)
+    seen = []
+    for i in range(nmoves):
+        if seen and rnd.random() < 0.2:
+            yield rnd.choice(seen)
+        else:
+            sn = hash(str(rnd.getrandbits(64)))
+            seen.append(sn)
+            yield sn
+
+
+def play_list(snapshots):
+    store = []
+    for sn in snapshots:
+        if sn not in store:
+            store.append(sn)
+    data = pickle.dumps(store, -1)
+    return pickle.loads(data)
+
+
+def play_store(snapshots, maxlen=None):
+    store = SnapshotStore(maxlen=maxlen)
+    for sn in snapshots:
+        store.visit(sn)
+    data = pickle.dumps(store.toList(), -1)
+    return SnapshotStore(pickle.loads(data), maxlen=maxlen)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Snapshot bookkeeping benchmark")
+    parser.add_argument("--moves", type=int, default=10000)
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--maxlen", type=int, default=2000,
+                        help="limit for the capped store")
+    args = parser.parse_args()
+
+    games = [list(game_snapshots(seed, args.moves))
+             for seed in range(args.games)]
+    results = {}
+    for name, func in (
+            ("list", play_list),
+            ("store", play_store),
+            ("capped store", lambda g: play_store(g, args.maxlen))):
+        start = time.perf_counter()
+        for snapshots in games:
+            loaded = func(snapshots)
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        print("%-14s %8.3f s for %d games of %d moves, %d snapshots kept" % (
+            name, elapsed, args.games, args.moves, len(loaded)))
+    print("speedup: %.0fx" % (results["list"] / results["store"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Memory and pickle size of a large synthetic statistics file with the
+# heap-based GameStatResult and with the list of Struct of older
+# versions:
+#
+#     python3 scripts/bench_stat_result.py --players 5 --games 1000
+#
+# Every game of every player gets --plays results (random status,
+# time and moves), as Statistics.updateGameStat does.
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'tests', 'lib'))
+
+from pysol_tests.test_stat_result import LegacyGameStatResult  # noqa: E402
+from pysol_tests.test_statstore import MockGame  # noqa: E402
+
+import pysollib.app_stat  # noqa: E402
+from pysollib.app_stat_result import GameStatResult  # noqa: E402
+from pysollib.app_statistics import Statistics  # noqa: E402
+
+
+def build(args):
+    rnd = random.Random(1)
+    stats = Statistics()
+    for player in range(args.players):
+        for gameid in range(1, args.games + 1):
+            for i in range(args.plays):
+                game = MockGame(gameid, i, rnd.randrange(50, 500))
+                game.stats.elapsed_time = rnd.uniform(30, 900)
+                stats.updateGameStat(str(player), game, rnd.randrange(3))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="GameStatResult memory benchmark")
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--plays", type=int, default=30)
+    args = parser.parse_args()
+
+    for name, result_class in (("Struct list", LegacyGameStatResult),
+                               ("heap", GameStatResult)):
+        pysollib.app_stat.GameStatResult = result_class
+        start = time.perf_counter()
+        tracemalloc.start()
+        stats = build(args)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        elapsed = time.perf_counter() - start
+        data = pickle.dumps(stats.games_stats, -1)
+        del stats
+        tracemalloc.start()
+        loaded = pickle.loads(data)
+        loaded_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del loaded
+        print("%-12s %7.1f MB in memory, %7.1f MB loaded, %6.1f MB "
+              "pickled, %5.2f s" % (name, size / 1e6, loaded_size / 1e6,
+                                    len(data) / 1e6, elapsed))
+
+
+if __name__ == "__main__":
+    main()
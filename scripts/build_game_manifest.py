@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Write the game manifest (see pysollib/gamemanifest.py), so that
+# PySol registers the games at startup without importing every game
+# module:
+#
+#     python3 scripts/build_game_manifest.py [data/games.json]
+#
+# Run it again after changing a game module; a stale manifest is
+# ignored.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.gamemanifest import writeManifest  # noqa: E402
+
+
+def main():
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+    else:
+        filename = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            '..', 'data', 'games.json')
+    n = writeManifest(filename)
+    print("%s: %d games" % (filename, n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Runs a code region player script on many Klondike deals without the
+# GUI and reports its win rate and move counts:
+#
+#     python3 scripts/run_code_script.py my_strategy.py --deals 10000 -j 4
+#
+# Deal numbers are the game numbers of PySol (1 to 31999 are the
+# Microsoft deals).
+#
+# The deals are real Klondike games without the GUI: expect about 100
+# deals per second and core for a script of 60 steps (300 for the deal
+# alone), use -j to run on more cores.
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.coderunner import runDeals  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark a code region script over many deals",
+        epilog="The deals are real Klondike games: about 100 deals per "
+        "second and process for a script of 60 steps, at most about "
+        "300 for the deal alone.")
+    parser.add_argument("script", help="file with the player code")
+    parser.add_argument("--first", type=int, default=1,
+                        help="first deal number")
+    parser.add_argument("--deals", type=int, default=1000,
+                        help="number of deals")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    with open(args.script) as f:
+        code = f.read()
+    report = runDeals(code, range(args.first, args.first + args.deals),
+                      processes=args.processes)
+    print("games:        %d" % report["games"])
+    print("won:          %d (%.1f%%)" % (report["wins"],
+                                         100 * report["win_rate"]))
+    print("moves:        %.1f mean, %d min, %d max" % (
+        report["moves_mean"], report["moves_min"], report["moves_max"]))
+    print("moves to win: %.1f mean" % report["won_moves_mean"])
+    print("errors:       %d" % report["errors"])
+    if report["first_error"]:
+        print("first error:  %s" % report["first_error"].splitlines()[0])
+    print("speed:        %.0f deals/s (%.2f s)" % (
+        report["deals_per_second"], report["elapsed"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- mode: python; coding: utf-8; -*-
+#
+# Solves a range of deals of a game without the GUI and writes which
+# ones are solvable, the solver iterations and the solution lengths to
+# a deal index (pysollib/dealscan.py):
+#
+#     python3 scripts/scan_deals.py 8 --first 1 --deals 1000000 -j 4
+#
+# The game is given by its id (8 is FreeCell) and needs a solver, the
+# freecell_solver / black_hole_solver modules or the fc-solve /
+# black-hole-solve commands. Deals already in the index are skipped,
+# so an interrupted scan can be continued.
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from pysollib.dealscan import DEAL_RESULTS, DealIndex  # noqa: E402
+from pysollib.dealscan import scanDeals  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find the solvable deals of a game")
+    parser.add_argument("gameid", type=int, help="game id")
+    parser.add_argument("--first", type=int, default=1,
+                        help="first deal number")
+    parser.add_argument("--deals", type=int, default=1000,
+                        help="number of deals")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="number of worker processes")
+    parser.add_argument("--max-iters", type=int, default=100000,
+                        help="iterations of the solver per deal")
+    parser.add_argument("--preset", default=None,
+                        help="preset of fc-solve (--load-config)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="seconds per deal of the external solvers")
+    parser.add_argument("--rescan", action="store_true",
+                        help="solve the deals already in the index again")
+    parser.add_argument("-o", "--output", default=None,
+                        help="deal index file (default: deals-GAMEID.idx)")
+    args = parser.parse_args()
+
+    filename = args.output or "deals-%d.idx" % args.gameid
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            sys.stderr.write("\r%d/%d" % (done, total))
+            if done == total:
+                sys.stderr.write("\n")
+
+    report = scanDeals(
+        args.gameid, range(args.first, args.first + args.deals), filename,
+        processes=args.processes, max_iters=args.max_iters,
+        preset=args.preset, timeout=args.timeout, rescan=args.rescan,
+        progress=progress)
+    print("scanned:  %d deals, %.1f deals/s" % (
+        report["deals"], report["deals_per_second"]))
+    for result in DEAL_RESULTS:
+        print("%-9s %d" % (result + ":", report[result]))
+    index = DealIndex(filename, args.gameid)
+    print("index:    %s, %d deals, %d solvable" % (
+        filename, len(index), len(index.getSeeds())))
+
+
+if __name__ == "__main__":
+    main()
@@ -53,6 +53,10 @@ if os.name == 'posix':
     data_files.append((data_dir, ['data/pysolfc.glade']))
     data_files.append(('share/applications', ['data/pysol.desktop']))
 
+# the game manifest, see scripts/build_game_manifest.py
+if os.path.exists('data/games.json'):
+    data_files.append((data_dir, ['data/games.json']))
+
 # from pprint import pprint; pprint(data_files)
 # import sys; sys.exit()
 
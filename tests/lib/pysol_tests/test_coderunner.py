@@ -0,0 +1,94 @@
+# Released under the MIT Expat License.
+
+import unittest
+
+from pysollib.coderunner import HeadlessCodeRunner, runDeals
+from pysollib.games.klondike import Klondike
+from pysollib.headless import createGame, dealGame
+
+from .test_dealscan import _patchCanvasGroup
+
+
+SCRIPT = """
+for i in range(60):
+    if check_move(tableau(), foundation()):
+        move(tableau(), foundation())
+    elif check_move(waste(), foundation()):
+        move(waste(), foundation())
+    else:
+        deal_cards()
+"""
+
+
+class CodeRunnerTests(unittest.TestCase):
+    def setUp(self):
+        _patchCanvasGroup(self)
+
+    def test_same_game(self):
+        # the runner plays the real Klondike, with the same deals
+        runner = HeadlessCodeRunner()
+        game = runner.game
+        # TEST
+        self.assertIsInstance(game, Klondike)
+        real = createGame(2)
+        for seed in (1, 42):
+            runner.play("", seed)
+            dealGame(real, seed)
+            # TEST
+            self.assertEqual(
+                [[(c.id, c.face_up) for c in s.cards]
+                 for s in game.allstacks],
+                [[(c.id, c.face_up) for c in s.cards]
+                 for s in real.allstacks])
+        won, moves, error = runner.play(SCRIPT, 1)
+        # TEST
+        self.assertIsNone(error)
+        # TEST
+        self.assertTrue(moves > 0)
+        # the moves of the script are moves of the game
+        # TEST
+        self.assertTrue(len(game.moves.history) > moves)
+
+    def test_deal_autoplay(self):
+        runner = HeadlessCodeRunner()
+        game = runner.game
+        game.app.opt.autodrop = True
+        game.app.opt.autofaceup = True
+        for seed in (1, 2, 3):
+            runner.play("", seed)
+            for i in range(60):
+                runner.action_deal_cards()
+                value = runner.state_hash.value
+                # TEST
+                self.assertEqual(value, runner.state_hash.resync())
+
+    def test_undo(self):
+        runner = HeadlessCodeRunner()
+        game = runner.game
+        runner.play("", 42)
+        before = [s.cards[:] for s in game.allstacks]
+        faces = [c.face_up for c in game.cards]
+        runner.action_deal_cards()
+        runner.action_deal_cards()
+        runner.action_undo()
+        runner.action_undo()
+        # TEST
+        self.assertEqual([s.cards for s in game.allstacks], before)
+        # TEST
+        self.assertEqual([c.face_up for c in game.cards], faces)
+
+    def test_run_deals(self):
+        report = runDeals(SCRIPT, range(1, 51))
+        # TEST
+        self.assertEqual(report["games"], 50)
+        # TEST
+        self.assertEqual(report["wins"], 0)
+        # TEST
+        self.assertEqual(report["errors"], 0)
+        # TEST
+        self.assertTrue(0 < report["moves_mean"] < 60)
+        pooled = runDeals(SCRIPT, range(1, 51), processes=2)
+        for key in ("elapsed", "deals_per_second"):
+            del report[key], pooled[key]
+        # TEST
+        self.assertEqual(pooled, report)
@@ -0,0 +1,58 @@
+# Released under the MIT Expat License.
+
+import unittest
+
+from pysollib.acard import AbstractCard
+from pysollib.codestate import TopCardsHash
+
+
+class MockStack:
+    def __init__(self, id, cards):
+        self.id = id
+        self.cards = cards
+
+
+def _card(suit, rank):
+    return AbstractCard(suit * 13 + rank, 0, suit, rank, None)
+
+
+class TopCardsHashTests(unittest.TestCase):
+    def _stacks(self):
+        return [
+            MockStack(0, [_card(0, 12), _card(2, 11)]),
+            MockStack(1, [_card(1, 4)]),
+            MockStack(2, []),
+            MockStack(3, [_card(3, 0)]),
+        ]
+
+    def test_probe_matches_move(self):
+        stacks = self._stacks()
+        h = TopCardsHash(stacks)
+        for from_stack, ncards, to_stack in ((stacks[0], 1, stacks[2]),
+                                             (stacks[1], 1, stacks[0]),
+                                             (stacks[3], 1, stacks[2])):
+            expected = h.probe(from_stack, ncards, to_stack)
+            to_stack.cards.extend(from_stack.cards[-ncards:])
+            del from_stack.cards[-ncards:]
+            h.update(from_stack)
+            # TEST
+            self.assertEqual(h.update(to_stack), expected)
+            # TEST
+            self.assertEqual(h.value, TopCardsHash(stacks).value)
+
+    def test_same_tops_same_hash(self):
+        stacks = self._stacks()
+        h = TopCardsHash(stacks)
+        start = h.value
+        stacks[0].cards.append(stacks[1].cards.pop())
+        h.update(stacks[0])
+        h.update(stacks[1])
+        # TEST
+        self.assertNotEqual(h.value, start)
+        stacks[1].cards.append(stacks[0].cards.pop())
+        h.update(stacks[0])
+        h.update(stacks[1])
+        # TEST
+        self.assertEqual(h.value, start)
+        # TEST
+        self.assertEqual(h.resync(), start)
@@ -0,0 +1,151 @@
+# Released under the MIT Expat License.
+
+import random
+import unittest
+
+import pysollib.stack
+from pysollib.acard import AbstractCard
+from pysollib.compactstate import CardTable, GameView, Position
+from pysollib.game import Game, GameStacks, StackGroups
+from pysollib.hint import DefaultHint, YukonType_Hint
+
+from .common_mocks import MockApp, MockCanvas
+
+
+class MockCard(AbstractCard):
+    def showFace(self, unhide=1):
+        self.face_up = 1
+
+    def showBack(self, unhide=1):
+        self.face_up = 0
+
+
+class MockGame:
+    # a Klondike position built from the real stack classes
+
+    canDealCards = Game.canDealCards
+
+    def __init__(self, seed):
+        self.app = MockApp()
+        self.allstacks = []
+        self.stackmap = {}
+        self.canvas = MockCanvas()
+        self.s = GameStacks()
+        self.sg = StackGroups()
+        s = self.s
+        s.talon = pysollib.stack.WasteTalonStack(0, 0, self, max_rounds=-1)
+        s.waste = s.talon.waste = pysollib.stack.WasteStack(1, 0, self)
+        s.foundations = tuple(
+            pysollib.stack.SS_FoundationStack(2 + i, 0, self, i)
+            for i in range(4))
+        s.rows = tuple(
+            pysollib.stack.KingAC_RowStack(i, 1, self) for i in range(7))
+        self.sg.talonstacks = (s.talon, s.waste)
+        self.sg.dropstacks = s.rows + (s.waste,)
+        self.sg.openstacks = s.foundations + s.rows
+        self.cards = [MockCard(i, 0, i // 13, i % 13, self)
+                      for i in range(52)]
+        cards = self.cards[:]
+        random.Random(seed).shuffle(cards)
+        for i, r in enumerate(s.rows):
+            for j in range(i + 1):
+                r.cards.append(cards.pop())
+            r.cards[-1].face_up = 1
+        s.talon.cards = cards
+
+    def play(self, rnd, nmoves):
+        # random moves, so that some cards reach the foundations
+        s = self.s
+        for i in range(nmoves):
+            stacks = s.rows + (s.waste,)
+            moves = []
+            for r in stacks:
+                t, ncards = r.canDropCards(s.foundations + s.rows)
+                if t:
+                    moves.append((r, ncards, t))
+            if moves and rnd.random() < 0.8:
+                r, ncards, t = rnd.choice(moves)
+                t.cards.extend(r.cards[-ncards:])
+                del r.cards[-ncards:]
+                if r.cards:
+                    r.cards[-1].face_up = 1
+            elif s.talon.cards:
+                s.waste.cards.append(s.talon.cards.pop())
+                s.waste.cards[-1].face_up = 1
+
+
+def hintIds(hints):
+    def ids(h):
+        return h[:3] + tuple(s and s.id for s in h[3:5]) + h[5:6] + (
+            h[6] and ids(h[6]),)
+    return [ids(h) for h in hints]
+
+
+class CompactStateTests(unittest.TestCase):
+    def test_same_hints(self):
+        rnd = random.Random(3)
+        for seed in range(10):
+            game = MockGame(seed)
+            table = CardTable(game.cards)
+            game.play(rnd, rnd.randrange(60))
+            view = GameView(game, Position.fromGame(game), table)
+            for hint_class in (DefaultHint, YukonType_Hint):
+                for level in (0, 1, 2):
+                    hints = hint_class(game, level).getHints()
+                    compact = hint_class(view, level).getHints()
+                    # TEST
+                    self.assertEqual(hintIds(compact), hintIds(hints))
+
+    def test_position(self):
+        game = MockGame(1)
+        table = CardTable(game.cards)
+        pos = Position.fromGame(game)
+        copy = pos.copy()
+        view = GameView(game, copy, table)
+        row = view.s.rows[6]
+        view.flipCard(row)
+        view.moveCards(1, row, view.s.rows[0])
+        # TEST
+        self.assertEqual([c.id for c in view.s.rows[0].cards],
+                         [game.s.rows[0].cards[0].id,
+                          game.s.rows[6].cards[-1].id])
+        # TEST
+        self.assertEqual(table.decode(copy.stacks[row.id]), row.cards)
+        # TEST
+        self.assertFalse(view.s.rows[0].cards[-1].face_up)
+        # TEST
+        self.assertEqual(pos.key(), Position.fromGame(game).key())
+        # TEST
+        self.assertNotEqual(copy.key(), pos.key())
+        # TEST
+        self.assertEqual(Position.fromKey(copy.key()).stacks, copy.stacks)
+        # TEST
+        self.assertTrue(isinstance(row, pysollib.stack.KingAC_RowStack))
+
+    def test_stack_view(self):
+        game = MockGame(1)
+        row = game.s.rows[0]
+        row.getBottomImage = row._getNoneBottomImage
+        row.CARD_YOFFSET = 7
+        view = GameView(game, Position.fromGame(game), CardTable(game.cards))
+        # the attributes of the stacks are read from the stacks
+        # TEST
+        self.assertIs(view.s.rows[0].__dict__, row.__dict__)
+        # TEST
+        self.assertIs(view.s.rows[0].cap, row.cap)
+        # TEST
+        self.assertEqual(view.s.rows[0].CARD_YOFFSET, 7)
+        # TEST
+        self.assertIs(view.s.rows[0].getBottomImage, row.getBottomImage)
+        # the other rows have the one of the class
+        # TEST
+        self.assertEqual(view.s.rows[1].getBottomImage.__func__,
+                         type(row).getBottomImage)
+        # a view does not change its stack
+        view.s.rows[0].CARD_YOFFSET = 3
+        # TEST
+        self.assertEqual(row.CARD_YOFFSET, 7)
+        # TEST
+        self.assertEqual(view.s.rows[0].CARD_YOFFSET, 3)
+        # TEST
+        self.assertIs(view.s.rows[0].cap, row.cap)
@@ -0,0 +1,107 @@
+# Released under the MIT Expat License.
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pysollib.hint
+import pysollib.stack
+from pysollib.dealscan import DealIndex, scanDeals
+from pysollib.headless import createGame, dealGame
+from pysollib.pysoltk import MfxCanvasGroup
+from pysollib.solutioncache import SolutionCache
+
+
+def _patchCanvasGroup(test):
+    # common_mocks replaces the canvas groups of the stacks
+    patch = mock.patch.object(pysollib.stack, 'MfxCanvasGroup',
+                              MfxCanvasGroup)
+    patch.start()
+    test.addCleanup(patch.stop)
+
+
+class HeadlessGameTests(unittest.TestCase):
+    def setUp(self):
+        _patchCanvasGroup(self)
+
+    def test_deal(self):
+        game = createGame(8)                # FreeCell
+        for seed in (1, 2, 1):
+            dealGame(game, seed)
+        board = game.Solver_Class(game, None).calcBoardString()
+        # Microsoft deal #1
+        # TEST
+        self.assertEqual(board.splitlines()[:2],
+                         ['FC: - - - -', 'JD KD 2S 4C 3S 6D 6S'])
+        # TEST
+        self.assertEqual(sum(len(s.cards) for s in game.s.rows), 52)
+
+
+class DealIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "deals", "8.idx")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_add(self):
+        big = 123456789012345678901
+        index = DealIndex(self.filename, 8)
+        index.add(1, 'solved', 1200, 85)
+        index.add(2, 'unsolved', 100000, 0)
+        index.add(big, 'solved', 5, 90)
+        index.add(2, 'intractable', 100000, 0)
+        index.close()
+        with open(self.filename, "ab") as f:
+            f.write(b"\0\0\0")
+        index = DealIndex(self.filename, 8)
+        # TEST
+        self.assertEqual(len(index), 3)
+        # TEST
+        self.assertEqual(index.get(1), ('solved', 1200, 85))
+        # TEST
+        self.assertEqual(index.get(2), ('intractable', 100000, 0))
+        # TEST
+        self.assertEqual(index.getSeeds(), [1, big])
+        # TEST
+        self.assertIn(index.chooseDeal(random.Random(1)), (1, big))
+        # TEST
+        self.assertRaises(ValueError, len, DealIndex(self.filename, 9))
+
+
+class ScanDealsTests(unittest.TestCase):
+    def setUp(self):
+        _patchCanvasGroup(self)
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "8.idx")
+        script = os.path.join('tests', 'unit', 'data', 'fake-fc-solve.py')
+        for name, value in (
+                ('FCS_COMMAND', '"%s" "%s" 0 3' % (sys.executable, script)),
+                ('FCS_VERSION', (5, 0, 0)),
+                ('use_fc_solve_lib', False),
+                ('solution_cache', SolutionCache(10))):
+            patch = mock.patch.object(pysollib.hint, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_scan(self):
+        report = scanDeals(8, range(1, 4), self.filename)
+        # TEST
+        self.assertEqual((report['deals'], report['solved']), (3, 3))
+        index = DealIndex(self.filename, 8)
+        # the fake solver: 300 iterations, 2 moves
+        # TEST
+        self.assertEqual(index.get(2), ('solved', 300, 2))
+        report = scanDeals(8, range(1, 5), self.filename)
+        # TEST
+        self.assertEqual(report['deals'], 1)
+        # TEST
+        self.assertEqual(len(DealIndex(self.filename, 8)), 4)
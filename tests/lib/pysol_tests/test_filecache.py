@@ -0,0 +1,93 @@
+# Released under the MIT Expat License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.filecache import FileCache
+
+
+def writer(size):
+    def write(filename):
+        with open(filename, 'wb') as f:
+            f.write(b'x' * size)
+    return write
+
+
+class FileCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.dirname = os.path.join(self.dir, "previews")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_get_put(self):
+        cache = FileCache(self.dirname, 1000, ".png")
+        # TEST
+        self.assertIsNone(cache.get((1, "Standard")))
+        filename = cache.put((1, "Standard"), writer(10))
+        # TEST
+        self.assertEqual(cache.get((1, "Standard")), filename)
+        # TEST
+        self.assertTrue(filename.endswith(".png"))
+        # TEST
+        self.assertIsNone(cache.get((1, "Other")))
+        cache.put((1, "Standard"), writer(20))
+        # TEST
+        self.assertEqual(cache.getSize(), 20)
+
+    def test_info(self):
+        cache = FileCache(self.dirname, 100, ".png")
+        cache.put((1,), writer(30), info="12345")
+        # TEST
+        self.assertEqual(cache.getInfo((1,)), "12345")
+        # TEST
+        self.assertEqual(cache.getSize(), 30)
+        cache.put((1,), writer(30))
+        # TEST
+        self.assertIsNone(cache.getInfo((1,)))
+        cache.put((2,), writer(30), info="2")
+        for i in range(3, 6):
+            cache.put((i,), writer(30))
+        # evicted with its file
+        # TEST
+        self.assertIsNone(cache.getInfo((2,)))
+        cache.clear()
+        # TEST
+        self.assertEqual(os.listdir(self.dirname), [])
+
+    def test_evict(self):
+        cache = FileCache(self.dirname, 100, ".png")
+        for i in range(4):
+            cache.put((i,), writer(30))
+        # TEST
+        self.assertEqual(cache.getSize(), 90)
+        # TEST
+        self.assertIsNone(cache.get((0,)))
+        cache.get((1,))
+        cache.put((4,), writer(30))
+        # the least recently used
+        # TEST
+        self.assertIsNone(cache.get((2,)))
+        # TEST
+        self.assertIsNotNone(cache.get((1,)))
+
+    def test_reopen(self):
+        cache = FileCache(self.dirname, 100, ".png")
+        for i in range(3):
+            cache.put((i,), writer(30))
+            os.utime(cache.get((i,)), (1000 + i, 1000 + i))
+        os.utime(cache.get((0,)), (2000, 2000))
+        cache = FileCache(self.dirname, 100, ".png")
+        # TEST
+        self.assertEqual(cache.getSize(), 90)
+        cache.put((3,), writer(30))
+        # TEST
+        self.assertIsNone(cache.get((1,)))
+        # TEST
+        self.assertIsNotNone(cache.get((0,)))
+        cache.clear()
+        # TEST
+        self.assertEqual(os.listdir(self.dirname), [])
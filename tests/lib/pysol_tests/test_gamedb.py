@@ -0,0 +1,65 @@
+# Released under the MIT Expat License.
+
+import unittest
+
+import pysollib.settings
+from pysollib.gamedb import GI, GameInfo, GameInfoException, GameManager
+
+
+def gameClass():
+    class Game:
+        pass
+    return Game
+
+
+def gameInfo(id, name, gameclass=None, altnames=()):
+    return GameInfo(id, gameclass or gameClass(), name,
+                    GI.GT_KLONDIKE, 1, 0, GI.SL_BALANCED, altnames=altnames)
+
+
+class GameManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.check_games = pysollib.settings.CHECK_GAMES
+        pysollib.settings.CHECK_GAMES = True
+
+    def tearDown(self):
+        pysollib.settings.CHECK_GAMES = self.check_games
+
+    def test_duplicates(self):
+        gdb = GameManager()
+        klondike = gameInfo(2, "Klondike", altnames=("Patience",))
+        gdb.register(klondike)
+        for gi in (gameInfo(2, "Other"),
+                   gameInfo(3, "Klondike"),
+                   gameInfo(3, "Other", altnames=("Patience",)),
+                   gameInfo(3, "Other", gameclass=klondike.gameclass)):
+            with self.assertRaises(GameInfoException):
+                # TEST
+                gdb.register(gi)
+        gdb.register(gameInfo(3, "Other"))
+        # TEST
+        self.assertEqual(gdb.getGameByName("Patience"), 2)
+
+    def test_register_again(self):
+        # a custom game saved with the wizard
+        gdb = GameManager()
+        gi = gameInfo(200001, "Custom")
+        gdb.register(gi)
+        gdb.check_game = False
+        gdb.register(gameInfo(200001, "Custom"))
+        gdb.check_game = True
+        # TEST
+        gdb.register(gameInfo(3, "Other", gameclass=gi.gameclass))
+
+    def test_bulk_registration(self):
+        gdb = GameManager()
+        with gdb.bulkRegistration():
+            for id, name in ((5, "b"), (3, "c"), (4, "a")):
+                gdb.register(gameInfo(id, name))
+        # TEST
+        self.assertEqual(gdb.getGamesIdSortedById(), (3, 4, 5))
+        # TEST
+        self.assertEqual(gdb.getGamesIdSortedByName(), (4, 5, 3))
+        gdb.register(gameInfo(1, "d"))
+        # TEST
+        self.assertEqual(gdb.getGamesIdSortedByName(), (4, 5, 3, 1))
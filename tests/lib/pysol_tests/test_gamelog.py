@@ -0,0 +1,91 @@
+# Released under the MIT Expat License.
+
+import io
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+
+import pysollib.app_gamelog
+from pysollib.app_gamelog import GameLog
+from pysollib.app_statistics import Statistics
+from pysollib.app_statstore import StatisticsStore
+from pysollib.stats import FileStatsFormatter
+
+from .common_mocks import MockApp
+
+
+def makeLogs(n):
+    rnd = random.Random(5)
+    logs = []
+    t = time.mktime((2019, 3, 1, 12, 0, 0, 0, 0, -1))
+    for i in range(n):
+        t += rnd.randrange(20000)
+        log = (rnd.choice((2, 7, 11)), '%020d' % i, rnd.randrange(3), t,
+               60.0, (2, 0), None, None, 1)
+        logs.append(log[:rnd.choice((5, 7, 9))])
+    return logs
+
+
+def dailyResults(logs, gameid=None):
+    # the old ProgressionFormatter loop
+    results = {}
+    for g in logs:
+        if gameid is not None and g[0] != gameid:
+            continue
+        t = time.localtime(g[3])[:3]
+        if t not in results:
+            results[t] = [0, 0]
+        results[t][0] += 1
+        if g[2] > 0:
+            results[t][1] += 1
+    return results
+
+
+class GameLogTests(unittest.TestCase):
+    def test_daily_results(self):
+        logs = makeLogs(3000)
+        gamelog = GameLog.fromLogs(logs)
+        numpy = pysollib.app_gamelog.numpy
+        try:
+            for use_numpy in (False, True):
+                if use_numpy and numpy is None:
+                    continue
+                pysollib.app_gamelog.numpy = numpy if use_numpy else None
+                for gameid in (None, 7, 3):
+                    # TEST
+                    self.assertEqual(gamelog.getDailyResults(gameid),
+                                     dailyResults(logs, gameid))
+        finally:
+            pysollib.app_gamelog.numpy = numpy
+        # TEST
+        self.assertEqual(GameLog().getDailyResults(), {})
+
+    def test_store(self):
+        dir = tempfile.mkdtemp()
+        try:
+            logs = makeLogs(50)
+            store = StatisticsStore(os.path.join(dir, "statistics.db"))
+            for log in logs:
+                store.appendLog('joe', log)
+            stats = Statistics()
+            stats.setStore(store)
+            gamelog = stats.getGameLog('joe')
+            # TEST
+            self.assertEqual(list(gamelog.start_time), [g[3] for g in logs])
+            app = MockApp()
+            app.stats = stats
+            app.getGameInfo = lambda gameid: None
+            plain = io.StringIO()
+            FileStatsFormatter(app, plain).writeLog(
+                'joe', "Full log for joe", logs)
+            streamed = io.StringIO()
+            FileStatsFormatter(app, streamed).writeFullLog('joe')
+            # TEST (the first line has the current time)
+            self.assertEqual(streamed.getvalue().split('\n')[1:],
+                             plain.getvalue().split('\n')[1:])
+            store.close()
+        finally:
+            shutil.rmtree(dir)
@@ -0,0 +1,70 @@
+# Released under the MIT Expat License.
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from pysollib.gamemanifest import loadManifest
+
+# the games database in a new interpreter, from the manifest or by
+# importing the game modules
+DUMP = '''
+import sys
+from pysollib.gamedb import GAME_DB
+if sys.argv[1]:
+    from pysollib.gamemanifest import loadManifest
+    assert loadManifest(sys.argv[1])
+else:
+    import pysollib.games, pysollib.games.ultra
+    import pysollib.games.mahjongg, pysollib.games.special
+for gi in GAME_DB.getAllGameInfos():
+    print(gi.id, repr(gi.name), sorted(gi.altnames),
+          sorted(gi.si.__dict__.items()))
+print(GAME_DB.getGamesIdSortedByName(), GAME_DB.getGamesForSolver())
+gi = GAME_DB.get(int(sys.argv[2]))
+print(gi.gameclass.__name__, type(gi.gameclass(gi)).__name__)
+from pysollib.gamemanifest import GAME_PACKAGES
+print(len([m for m in sys.modules if m.startswith('pysollib.games.') and
+           m not in GAME_PACKAGES]))
+'''
+
+
+def run(*args):
+    return subprocess.check_output(
+        [sys.executable, '-c'] + list(args), universal_newlines=True,
+        env=dict(os.environ, PYTHONPATH=os.getcwd()))
+
+
+class GameManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, 'games.json')
+        run('from pysollib.gamemanifest import writeManifest; '
+            'writeManifest(%r)' % self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_same_games(self):
+        for gameid in ('2', '22225'):
+            eager = run(DUMP, '', gameid).split('\n')
+            lazy = run(DUMP, self.filename, gameid).split('\n')
+            # TEST
+            self.assertEqual(lazy[:-2], eager[:-2])
+            # TEST: only the module of the game (and its imports)
+            self.assertTrue(0 < int(lazy[-2]) <= 3)
+
+    def test_stale(self):
+        with open(self.filename) as f:
+            manifest = json.load(f)
+        manifest['files']['pysollib.games.klondike'][0] += 1
+        with open(self.filename, 'w') as f:
+            json.dump(manifest, f)
+        # TEST
+        self.assertFalse(loadManifest(self.filename))
+        # TEST
+        self.assertFalse(loadManifest(os.path.join(self.dir, 'missing')))
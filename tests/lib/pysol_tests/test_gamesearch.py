@@ -0,0 +1,84 @@
+# Released under the MIT Expat License.
+
+import unittest
+
+from pysollib.gamedb import GI, GameInfo
+from pysollib.gamesearch import GameSearchIndex, SearchCriteria
+
+
+def gameInfo(id, name, game_type=GI.GT_KLONDIKE, decks=1, redeals=0,
+             altnames=(), game_flags=0):
+    return GameInfo(id, object, name, game_type | game_flags, decks,
+                    redeals, GI.SL_BALANCED, altnames=altnames)
+
+
+GAMES = (
+    gameInfo(2, "Klondike", altnames=("Patience", "Fascination"),
+             game_flags=GI.GT_SCORE),
+    gameInfo(8, "FreeCell", GI.GT_FREECELL, redeals=0, game_flags=GI.GT_OPEN),
+    gameInfo(11, "Spider", GI.GT_SPIDER, decks=2, redeals=-1),
+    gameInfo(12, "Braid", GI.GT_NAPOLEON, decks=2, redeals=5),
+    gameInfo(14, "Cruel", redeals=-1, altnames=("Unkind",)),
+)
+
+
+class GameSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = GameSearchIndex(GAMES)
+
+    def _search(self, **kw):
+        criteria = SearchCriteria()
+        for key, value in kw.items():
+            setattr(criteria, key, value)
+        return self.index.search(criteria)
+
+    def test_name(self):
+        # TEST
+        self.assertEqual(self._search(),
+                         ["Braid", "Cruel", "Fascination", "FreeCell",
+                          "Klondike", "Patience", "Spider", "Unkind"])
+        # TEST
+        self.assertEqual(self._search(name="ce"), ["FreeCell", "Patience"])
+        # TEST
+        self.assertEqual(self._search(name="KIND"), ["Unkind"])
+        # TEST
+        self.assertEqual(self._search(name="kind", usealt=False), [])
+        # TEST
+        self.assertEqual(self._search(name=" ion  fasc"), ["Fascination"])
+        # TEST
+        self.assertEqual(self._search(name="spiders"), [])
+
+    def test_criteria(self):
+        # TEST
+        self.assertEqual(self._search(decks="2 deck games"),
+                         ["Braid", "Spider"])
+        # TEST
+        self.assertEqual(self._search(redeals="Other number of redeals"),
+                         ["Braid"])
+        # TEST
+        self.assertEqual(self._search(redeals="Unlimited redeals",
+                                      name="r"), ["Cruel", "Spider"])
+        # TEST
+        self.assertEqual(self._search(scoring=True, usealt=False),
+                         ["Klondike"])
+        # TEST
+        self.assertEqual(self._search(open=True), ["FreeCell"])
+
+    def test_groups(self):
+        # TEST
+        self.assertEqual(self._search(compat="Atari ST Patience",
+                                      usealt=False),
+                         ["Braid", "Cruel"])
+        # TEST
+        self.assertEqual(self._search(inventor="Paul Alfille"),
+                         ["FreeCell"])
+        # TEST
+        self.assertEqual(self._search(version="1.02"), ["FreeCell"])
+        # TEST
+        self.assertEqual(self._search(version="1.02", usealt=False,
+                                      versioncompare="Present in"),
+                         ["FreeCell", "Klondike"])
+        # TEST
+        self.assertEqual(self._search(version="1.02", usealt=False,
+                                      versioncompare="New since"),
+                         ["Braid", "Cruel", "FreeCell", "Spider"])
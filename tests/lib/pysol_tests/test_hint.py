@@ -1,9 +1,17 @@
 # Written by Shlomi Fish, under the MIT Expat License.
 
+import os
+import sys
+import time
 import unittest
+from unittest import mock
 
+import pysollib.hint
 from pysollib.acard import AbstractCard
-from pysollib.hint import Base_Solver_Hint
+from pysollib.hint import Base_Solver_Hint, FreeCellSolver_Hint, \
+    SolverProcess
+from pysollib.mfxutil import Struct
+from pysollib.solutioncache import SolutionCache
 
 
 class HintTests(unittest.TestCase):
@@ -20,3 +28,172 @@ class HintTests(unittest.TestCase):
         # TEST
         self.assertEqual(got, '8D', 'card2str2 works')
         # diag('got == ' + got)
+
+
+class MockDialog:
+    def __init__(self):
+        self.texts = []
+
+    def setText(self, **kw):  # noqa: N802
+        self.texts.append(kw)
+
+
+class SolverProcessTests(unittest.TestCase):
+    def setUp(self):
+        from .test_import_file import Mock_S_Game
+        self.game = Mock_S_Game()
+        self.game.gameinfo = Struct(decks=1, id=8)
+        self.game.allstacks = self.game.s.allstacks
+        self.dialog = MockDialog()
+        self._patch('FCS_VERSION', (5, 0, 0))
+        self._patch('use_fc_solve_lib', False)
+        self.cache = SolutionCache(10)
+        self._patch('solution_cache', self.cache)
+
+    def _patch(self, name, value):
+        patch = mock.patch.object(pysollib.hint, name, value)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _startSolver(self, delay, count, timeout=None):  # noqa: N802
+        script = os.path.join('tests', 'unit', 'data', 'fake-fc-solve.py')
+        command = '"%s" "%s" %s %d' % (sys.executable, script, delay, count)
+        self._patch('FCS_COMMAND', command)
+        h = FreeCellSolver_Hint(self.game, self.dialog, base_rank=0)
+        h.config(progress=True, timeout=timeout)
+        # TEST
+        self.assertTrue(h.startHints())
+        return h
+
+    def test_progress(self):
+        h = self._startSolver(0.05, 10)
+        # an event loop: the progress is shown while the solver runs
+        events = 0
+        events_after_progress = 0
+        while not h.pollHints(timeout=0.01):
+            events += 1
+            if self.dialog.texts:
+                events_after_progress += 1
+        # TEST
+        self.assertGreater(events_after_progress, 5)
+        # TEST
+        self.assertEqual(self.dialog.texts[0],
+                         {'iter': 100, 'depth': 1, 'states': 50})
+        # TEST
+        self.assertEqual(h.solver_state, 'solved')
+        rows = self.game.s.rows
+        # TEST
+        self.assertEqual(h.hints, [[1, rows[3], None],
+                                   [2, rows[0], rows[1]], None])
+
+    def test_cancel(self):
+        h = self._startSolver(1, 60)
+        start = time.time()
+        while not self.dialog.texts:
+            # TEST
+            self.assertFalse(h.pollHints(timeout=0.01))
+        process = h.process
+        h.cancelHints()
+        # TEST
+        self.assertLess(time.time() - start, 10)
+        # TEST
+        self.assertIsNotNone(process.process.poll())
+        # TEST
+        self.assertEqual(h.solver_state, 'cancelled')
+        # TEST
+        self.assertEqual(h.hints, [None])
+        # TEST
+        self.assertTrue(h.pollHints())
+
+    def test_destroy_dialog(self):
+        from pysollib.ui.tktile import solverdialog
+
+        class Dialog(solverdialog.BaseSolverDialog):
+            def __init__(self, solver):
+                self.solver = solver
+                self.solver_timer = 'timer'
+                self.top = mock.Mock()
+                self.start_button = mock.Mock()
+                self.start_button_text = 'Start'
+                self.start_button_underline = 0
+                self.result_label = {}
+                self.destroy = mock.Mock()
+
+        h = self._startSolver(1, 60)
+        process = h.process
+        dialog = Dialog(h)
+        self.addCleanup(setattr, solverdialog, 'solver_dialog', None)
+        solverdialog.solver_dialog = dialog
+        # at exit
+        solverdialog.destroy_solver_dialog()
+        # TEST
+        self.assertIsNotNone(process.process.poll())
+        # TEST
+        self.assertEqual(h.solver_state, 'cancelled')
+        # TEST
+        dialog.top.after_cancel.assert_called_once_with('timer')
+        # TEST
+        dialog.destroy.assert_called_once_with()
+
+    def test_timeout(self):
+        h = self._startSolver(1, 60, timeout=0.5)
+        start = time.time()
+        while not h.pollHints(timeout=0.05):
+            pass
+        # TEST
+        self.assertLess(time.time() - start, 10)
+        # TEST
+        self.assertEqual(h.solver_state, 'timeout')
+        # TEST
+        self.assertEqual(h.hints, [None])
+
+    @unittest.skipIf(os.name == 'nt', "POSIX shell exit code")
+    def test_not_found(self):
+        process = SolverProcess('pysol-no-such-solver', '')
+        # TEST
+        self.assertRaises(RuntimeError, process.communicate)
+
+    def test_solution_cache(self):
+        h = self._startSolver(0, 3)
+        while not h.pollHints(timeout=0.1):
+            pass
+        rows = self.game.s.rows
+        # the same position
+        h = FreeCellSolver_Hint(self.game, self.dialog, base_rank=0)
+        h.config(progress=True)
+        # TEST
+        self.assertFalse(h.startHints())
+        # TEST
+        self.assertEqual(h.hints, [[1, rows[3], None],
+                                   [2, rows[0], rows[1]], None])
+        # TEST
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        # the player follows the solution
+        self.game.moveMove(1, self.game.s.talon, rows[2])
+        h.hints_index = 1
+        h._saveSolutionSuffix()
+        h = FreeCellSolver_Hint(self.game, self.dialog, base_rank=0)
+        h.config(progress=True)
+        # TEST
+        self.assertFalse(h.startHints())
+        # TEST
+        self.assertEqual(h.hints, [[2, rows[0], rows[1]], None])
+        # TEST
+        self.assertEqual(h.solver_state, 'solved')
+
+    def test_solution_cache_key(self):
+        h = self._startSolver(0, 3)
+        while not h.pollHints(timeout=0.1):
+            pass
+        board, args = h.solution_board, h.solution_args
+        # another game with the same board
+        self.game.gameinfo = Struct(decks=1, id=9)
+        h = FreeCellSolver_Hint(self.game, self.dialog, base_rank=0)
+        # TEST
+        self.assertFalse(h._loadSolution(board, args))
+        # a cached solution that is not of this layout
+        self.game.gameinfo = Struct(decks=1, id=8)
+        self.cache.put(h._getSolutionSolver(), board, args, 'solved',
+                       [(1, 0, len(self.game.allstacks))])
+        # TEST
+        self.assertFalse(h._loadSolution(board, args))
@@ -0,0 +1,55 @@
+# Released under the MIT Expat License.
+
+import unittest
+
+from pysollib.game.hintcache import HintCache
+from pysollib.headless import createGame, dealGame
+
+from .test_dealscan import _patchCanvasGroup
+
+
+class HintCacheTests(unittest.TestCase):
+    def test_cache(self):
+        cache = HintCache(2)
+        cache.put('a', [1])
+        cache.put('b', [])
+        # TEST
+        self.assertEqual(cache.get('a'), [1])
+        cache.put('c', [3])
+        # 'b' was the least recently used
+        # TEST
+        self.assertIsNone(cache.get('b'))
+        # TEST
+        self.assertEqual(cache.get('c'), [3])
+        # TEST
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        # TEST
+        self.assertAlmostEqual(cache.getHitRate(), 2 / 3)
+        cache = HintCache(0)
+        cache.put('a', [1])
+        # TEST
+        self.assertEqual(len(cache), 0)
+
+    def test_game(self):
+        _patchCanvasGroup(self)
+        game = createGame(2)                # Klondike
+        dealGame(game, 1)
+        cache = game.hint_cache
+        hints = game.getHints(0)
+        # TEST
+        self.assertIs(game.getHints(0), hints)
+        # the stuck check shares the hints of level 0
+        # TEST
+        self.assertTrue(game.getStuck())
+        # TEST
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        # TEST
+        self.assertIsNot(game.getHints(1), hints)
+        ncards, from_stack, to_stack = hints[0][2:5]
+        from_stack.moveMove(ncards, to_stack)
+        game.finishMove()
+        # TEST
+        self.assertIsNot(game.getHints(0), hints)
+        game.undo()
+        # TEST
+        self.assertIs(game.getHints(0), hints)
@@ -0,0 +1,87 @@
+# Released under the MIT Expat License.
+
+import random
+import unittest
+from unittest import mock
+
+from pysollib.compactstate import Position
+from pysollib.headless import HeadlessApp, createGame, dealGame
+from pysollib.hint import BlackHoleSolverWrapper, KlondikeType_Hint
+from pysollib.hintsearch import PositionSearch, SearchHint, searchHintClass
+
+from .test_compactstate import MockGame
+from .test_dealscan import _patchCanvasGroup
+
+
+class HintSearchTests(unittest.TestCase):
+    def _game(self, seed):
+        game = MockGame(seed)
+        game.play(random.Random(seed), 30)
+        return game
+
+    def test_search_hint_class(self):
+        search_class = searchHintClass(KlondikeType_Hint)
+        # TEST
+        self.assertTrue(issubclass(search_class, SearchHint))
+        # TEST
+        self.assertTrue(issubclass(search_class, KlondikeType_Hint))
+        # TEST
+        self.assertIs(searchHintClass(KlondikeType_Hint), search_class)
+        wrapper = BlackHoleSolverWrapper()
+        # TEST
+        self.assertIs(searchHintClass(wrapper), wrapper)
+
+    def test_search(self):
+        for seed in range(1, 8):
+            game = self._game(seed)
+            key = Position.fromGame(game).key()
+            moves = PositionSearch(game).search()
+            # the game is not changed
+            # TEST
+            self.assertEqual(Position.fromGame(game).key(), key)
+            # TEST
+            self.assertEqual(moves == [], seed not in (1, 4))
+
+    def test_hints(self):
+        game = self._game(1)
+        hints = searchHintClass(KlondikeType_Hint)(game, 0).getHints()
+
+        def move(h):
+            return (h[2], h[3].id, h[4].id)
+        # the other hints follow
+        # TEST
+        self.assertEqual(
+            [move(h) for h in hints[1:]],
+            [move(h) for h in KlondikeType_Hint(game, 0).getHints()
+             if move(h) != move(hints[0])])
+        hint = hints[0]
+        # TEST
+        self.assertEqual(hint[0], SearchHint.SCORE_SEARCH)
+        # the line, the rest are forced moves
+        while hint:
+            ncards, r, t = hint[2:5]
+            pile = r.cards[-ncards:]
+            # TEST
+            self.assertTrue(r.canMoveCards(pile))
+            # TEST
+            self.assertTrue(t.acceptsCards(r, pile))
+            t.cards.extend(pile)
+            del r.cards[-ncards:]
+            hint = hint[6]
+
+    def test_stuck(self):
+        # the stuck check after every move does not search
+        _patchCanvasGroup(self)
+        app = HeadlessApp()
+        app.opt.search_hints = True
+        game = createGame(14, app)          # Grounds for a Divorce
+        dealGame(game, 1)
+        # TEST
+        self.assertIsInstance(game.getHintClass()(game, 0), SearchHint)
+        # TEST
+        self.assertNotIsInstance(game.Stuck_Class, SearchHint)
+        with mock.patch.object(PositionSearch, 'search') as search:
+            # TEST
+            self.assertTrue(game.getStuck())
+        # TEST
+        search.assert_not_called()
@@ -0,0 +1,41 @@
+# Released under the MIT Expat License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.imagepages import readImagePages, writeImagePages
+from pysollib.mfxutil import Image
+
+
+@unittest.skipUnless(Image, "needs PIL")
+class ImagePagesTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "images.rgba")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_roundtrip(self):
+        images = [Image.new("RGBA", (3, 2), (255, 0, 0, 128)),
+                  Image.new("RGBA", (1, 5), (0, 10, 20, 255))]
+        writeImagePages(self.filename, images)
+        pages = readImagePages(self.filename)
+        # TEST
+        self.assertEqual([im.size for im in pages], [(3, 2), (1, 5)])
+        # TEST
+        self.assertEqual([im.tobytes() for im in pages],
+                         [im.tobytes() for im in images])
+
+    def test_damaged(self):
+        writeImagePages(self.filename, [Image.new("RGBA", (4, 4))])
+        with open(self.filename, "r+b") as f:
+            f.truncate(30)
+        # TEST
+        self.assertRaises(ValueError, readImagePages, self.filename)
+        with open(self.filename, "wb") as f:
+            f.write(b"PNG")
+        # TEST
+        self.assertRaises(ValueError, readImagePages, self.filename)
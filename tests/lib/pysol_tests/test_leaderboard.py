@@ -0,0 +1,111 @@
+# Released under the MIT Expat License.
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from pysollib.leaderboard import LeaderboardUploader
+
+
+class FakeLeaderboardServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0, fail=0):
+        HTTPServer.__init__(self, ("127.0.0.1", 0), FakeLeaderboardHandler)
+        self.delay = delay
+        self.fail = fail
+        self.received = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeLeaderboardHandler(BaseHTTPRequestHandler):
+    def do_PUT(self):  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            if self.server.fail > 0:
+                self.server.fail -= 1
+                status = 500
+            else:
+                status = 200
+                self.server.received.append(
+                    (self.path, json.loads(body)["score"]))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class LeaderboardUploaderTests(unittest.TestCase):
+    def test_submit_never_blocks(self):
+        server = FakeLeaderboardServer(delay=0.2)
+        up = LeaderboardUploader(server.url)
+        try:
+            start = time.time()
+            worst = 0.0
+            for score in range(1, 151):
+                t = time.time()
+                self.assertTrue(up.submit("player one", score))
+                worst = max(worst, time.time() - t)
+            elapsed = time.time() - start
+            # 150 blocking PUTs would take 30 seconds
+            self.assertLess(elapsed, 0.5)
+            self.assertLess(worst, 0.1)
+            self.assertTrue(up.flush(timeout=5))
+            # pending updates were merged: far fewer than 150 requests,
+            # and the last one carries the latest score
+            self.assertLess(len(server.received), 10)
+            self.assertEqual(server.received[-1],
+                             ("/api/leaderboard/player%20one", 150))
+        finally:
+            up.close()
+            server.stop()
+
+    def test_retry_with_backoff(self):
+        server = FakeLeaderboardServer(fail=2)
+        up = LeaderboardUploader(server.url, min_backoff=0.05)
+        try:
+            up.submit("p", 7)
+            self.assertTrue(up.flush(timeout=5))
+            self.assertEqual(server.received, [("/api/leaderboard/p", 7)])
+            self.assertEqual(up.failed, 2)
+        finally:
+            up.close()
+            server.stop()
+
+    def test_bounded_queue(self):
+        up = LeaderboardUploader("http://127.0.0.1:9", maxsize=3)
+        up._thread = threading.current_thread()  # do not start the worker
+        for i in range(5):
+            up.submit("p%d" % i, i)
+        self.assertEqual(list(up._pending.items()),
+                         [("p2", 2), ("p3", 3), ("p4", 4)])
+        self.assertEqual(up.dropped, 2)
+
+    def test_close_flushes(self):
+        server = FakeLeaderboardServer(delay=0.05)
+        up = LeaderboardUploader(server.url)
+        try:
+            up.submit("a", 1)
+            up.submit("b", 2)
+            self.assertTrue(up.close(timeout=5))
+            self.assertEqual(sorted(s for p, s in server.received), [1, 2])
+            self.assertFalse(up.submit("a", 3))
+        finally:
+            server.stop()
@@ -0,0 +1,186 @@
+# Released under the MIT Expat License.
+
+import pickle
+import random
+import unittest
+from unittest import mock
+
+from pysollib.acard import AbstractCard
+from pysollib.game.snapshots import SnapshotHash, SnapshotStore
+from pysollib.headless import createGame, dealGame, playDemo
+from pysollib.move import AFlipAndMoveMove, AFlipMove, AMoveMove
+from pysollib.move import ASingleCardMove, ATurnStackMove
+
+from .test_dealscan import _patchCanvasGroup
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    def test_insertion_order(self):
+        store = SnapshotStore()
+        for sn in (5, 3, 5, 9, 3):
+            store.add(sn)
+        # TEST
+        self.assertEqual(store.toList(), [5, 3, 9])
+        # TEST
+        self.assertTrue(store.visit(9))
+        # TEST
+        self.assertFalse(store.visit(1))
+        # TEST
+        self.assertEqual(len(store), 4)
+
+    def test_lru_limit(self):
+        store = SnapshotStore(maxlen=3)
+        for sn in (1, 2, 3):
+            store.add(sn)
+        # 1 is seen again, so 2 is the least recently seen one
+        store.visit(1)
+        store.visit(4)
+        # TEST
+        self.assertEqual(store.toList(), [3, 1, 4])
+        # TEST
+        self.assertNotIn(2, store)
+
+    def test_savegame_list(self):
+        # savegames store (and old ones contain) a plain list
+        old = pickle.loads(pickle.dumps([7, -2, 11], -1))
+        store = SnapshotStore(old)
+        # TEST
+        self.assertIn(-2, store)
+        # TEST
+        self.assertEqual(pickle.loads(pickle.dumps(store.toList())), old)
+
+
+class MockCard(AbstractCard):
+    def showFace(self, unhide=1):
+        self.face_up = 1
+
+    def showBack(self, unhide=1):
+        self.face_up = 0
+
+
+class MockStack:
+    def __init__(self, id):
+        self.id = id
+        self.cards = []
+
+    def addCard(self, card, unhide=1, update=1):
+        self.cards.append(card)
+
+    def insertCard(self, card, position):
+        self.cards.insert(position, card)
+
+    def removeCard(self, card=None, unhide=1, update=1,
+                   update_positions=0):
+        if card is None:
+            card = self.cards[-1]
+        self.cards.remove(card)
+        return card
+
+    def updatePositions(self):
+        pass
+
+    def updateText(self):
+        pass
+
+
+class MockMoves:
+    state = 0
+
+
+class MockGame:
+    S_PLAY = S_UNDO = S_REDO = 0x40
+
+    def __init__(self, nstacks):
+        self.moves = MockMoves()
+        self.allstacks = [MockStack(i) for i in range(nstacks)]
+        for i in range(104):
+            self.allstacks[0].addCard(
+                MockCard(i, i // 52, i // 13 % 4, i % 13, self))
+        self.snapshot_hash = SnapshotHash(self.allstacks)
+
+    def getSnapshotHash(self):
+        return '-'.join(''.join('%d%03d%d' % (c.suit, c.rank, c.face_up)
+                                for c in s.cards)
+                        for s in self.allstacks)
+
+
+class SnapshotHashTests(unittest.TestCase):
+    def _randomMove(self, game, rnd):
+        stacks = [s for s in game.allstacks if s.cards]
+        from_stack = rnd.choice(stacks)
+        to_stack = rnd.choice([s for s in game.allstacks
+                               if s is not from_stack])
+        kind = rnd.randrange(5)
+        if kind == 0:
+            ncards = rnd.randint(1, len(from_stack.cards))
+            return AMoveMove(ncards, from_stack, to_stack, frames=0)
+        elif kind == 1:
+            return AFlipMove(from_stack)
+        elif kind == 2:
+            return AFlipAndMoveMove(from_stack, to_stack, frames=0)
+        elif kind == 3 and not to_stack.cards and \
+                all(c.face_up for c in from_stack.cards):
+            return ATurnStackMove(from_stack, to_stack)
+        pos = rnd.randrange(len(from_stack.cards))
+        return ASingleCardMove(from_stack, to_stack, pos, frames=0)
+
+    def test_atomic_moves(self):
+        game = MockGame(8)
+        sh = game.snapshot_hash
+        rnd = random.Random(1)
+        history = []
+        seen = {}
+        for i in range(500):
+            am = self._randomMove(game, rnd)
+            am.redo(game)
+            history.append(am)
+            # TEST
+            self.assertEqual(sh.value, sh.compute())
+            sn = game.getSnapshotHash()
+            # TEST
+            self.assertEqual(seen.setdefault(sh.value, sn), sn)
+        values = []
+        while history:
+            values.append(sh.value)
+            history.pop().undo(game)
+            # TEST
+            self.assertEqual(sh.value, sh.compute())
+        # TEST
+        self.assertEqual(len(game.allstacks[0].cards), 104)
+        # TEST
+        self.assertEqual(sh.value, sh.resync())
+
+    def test_same_position(self):
+        game = MockGame(3)
+        sh = game.snapshot_hash
+        start = sh.value
+        talon, a, b = game.allstacks
+        AMoveMove(2, talon, a, frames=0).redo(game)
+        AMoveMove(1, a, b, frames=0).redo(game)
+        # TEST
+        self.assertNotEqual(sh.value, start)
+        AMoveMove(1, b, a, frames=0).redo(game)
+        AMoveMove(2, a, talon, frames=0).redo(game)
+        # TEST
+        self.assertEqual(sh.value, start)
+        AFlipMove(talon).redo(game)
+        # TEST
+        self.assertNotEqual(sh.value, start)
+
+
+class GameSnapshotHashTests(unittest.TestCase):
+    def test_close_stack(self):
+        # games that flip a stack when it is closed (a move within a
+        # move, see Stack.closeStack); every getSnapshot() compares the
+        # hash with a full recomputation and reports a difference
+        _patchCanvasGroup(self)
+        for gameid in (41, 289, 793, 7, 546):
+            game = createGame(gameid)
+            game.CHECK_SNAPSHOT_HASH = True
+            for seed in range(1, 6):
+                dealGame(game, seed)
+                with mock.patch('pysollib.game.print_err') as print_err:
+                    playDemo(game)
+                # TEST
+                self.assertEqual(print_err.call_args_list, [],
+                                 (game.gameinfo.name, seed))
@@ -0,0 +1,54 @@
+# Released under the MIT Expat License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.solutioncache import SolutionCache
+
+
+MOVES = ((1, 4, None), (2, 5, 6))
+
+
+class SolutionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "cache", "solutions.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_lru(self):
+        cache = SolutionCache(2)
+        cache.put("FreeCell", "board1", ["-opt"], "solved", MOVES)
+        cache.put("FreeCell", "board2", ["-opt"], "unsolved", ())
+        # TEST
+        self.assertEqual(cache.get("FreeCell", "board1", ["-opt"]),
+                         ("solved", MOVES))
+        # TEST
+        self.assertIsNone(cache.get("FreeCell", "board1", ["--preset"]))
+        cache.put("FreeCell", "board3", ["-opt"], "solved", MOVES)
+        # the least recently used
+        # TEST
+        self.assertIsNone(cache.get("FreeCell", "board2", ["-opt"]))
+        # TEST
+        self.assertEqual(len(cache), 2)
+        # TEST
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_save(self):
+        cache = SolutionCache(10, self.filename)
+        cache.put("BlackHole", "board1", ["--game", "black_hole"],
+                  "solved", MOVES)
+        cache.save()
+        cache = SolutionCache(10, self.filename)
+        # TEST
+        self.assertEqual(
+            cache.get("BlackHole", "board1", ("--game", "black_hole")),
+            ("solved", MOVES))
+        with open(self.filename, "w") as f:
+            f.write("{")
+        cache = SolutionCache(10, self.filename)
+        # TEST
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,102 @@
+# Released under the MIT Expat License.
+
+import pickle
+import random
+import unittest
+
+import pysollib.app_stat_result
+from pysollib.app_stat_result import GameStatResult
+from pysollib.mfxutil import Struct
+from pysollib.settings import TOP_SIZE
+
+
+class LegacyGameStatResult:
+    # GameStatResult of older versions, with a list of Struct
+    def __init__(self):
+        self.min = 0
+        self.max = 0
+        self.top = []
+        self.num = 0
+        self.total = 0
+        self.average = 0
+
+    def update(self, gameid, value, game_number, game_start_time):
+        if not self.min or value < self.min:
+            self.min = value
+        if not self.max or value > self.max:
+            self.max = value
+        position = None
+        n = 0
+        for i in self.top:
+            if value < i.value:
+                position = n+1
+                self.top.insert(n, Struct(gameid=gameid, value=value,
+                                          game_number=game_number,
+                                          game_start_time=game_start_time))
+                del self.top[TOP_SIZE:]
+                break
+            n += 1
+        if not position and len(self.top) < TOP_SIZE:
+            self.top.append(Struct(gameid=gameid, value=value,
+                                   game_number=game_number,
+                                   game_start_time=game_start_time))
+            position = len(self.top)
+        self.total += value
+        self.num += 1
+        self.average = float(self.total)/self.num
+        return position
+
+
+def topList(result):
+    return [(e.gameid, e.value, e.game_number, e.game_start_time)
+            for e in result.top]
+
+
+def dumpsLegacy(result):
+    # pickle as an object of the old class
+    LegacyGameStatResult.__module__ = GameStatResult.__module__
+    LegacyGameStatResult.__qualname__ = GameStatResult.__qualname__
+    pysollib.app_stat_result.GameStatResult = LegacyGameStatResult
+    try:
+        return pickle.dumps(result, 2)
+    finally:
+        pysollib.app_stat_result.GameStatResult = GameStatResult
+
+
+class GameStatResultTests(unittest.TestCase):
+    def test_same_as_legacy(self):
+        rnd = random.Random(7)
+        old, new = LegacyGameStatResult(), GameStatResult()
+        for i in range(500):
+            value = rnd.randrange(1, 40)
+            # TEST
+            self.assertEqual(new.update(2, value, str(i), 1000.0 + i),
+                             old.update(2, value, str(i), 1000.0 + i))
+            # TEST
+            self.assertEqual(topList(new), topList(old))
+        # TEST
+        self.assertEqual((new.min, new.max, new.num, new.total, new.average),
+                         (old.min, old.max, old.num, old.total, old.average))
+
+    def test_pickle(self):
+        rnd = random.Random(8)
+        old = LegacyGameStatResult()
+        for i in range(30):
+            old.update(2, rnd.randrange(1, 5), str(i), 1000.0 + i)
+        result = pickle.loads(dumpsLegacy(old))
+        # TEST
+        self.assertTrue(isinstance(result, GameStatResult))
+        # TEST
+        self.assertEqual(topList(result), topList(old))
+        for i in range(30, 60):
+            value = rnd.randrange(1, 5)
+            # TEST
+            self.assertEqual(result.update(2, value, str(i), 1000.0 + i),
+                             old.update(2, value, str(i), 1000.0 + i))
+        # TEST
+        self.assertEqual(topList(result), topList(old))
+        copy = pickle.loads(pickle.dumps(result, -1))
+        # TEST
+        self.assertEqual(topList(copy), topList(old))
+        # TEST
+        self.assertEqual(copy.average, old.average)
@@ -0,0 +1,148 @@
+# Released under the MIT Expat License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pysollib.app_statistics import Statistics
+from pysollib.app_statstore import StatisticsStore
+from pysollib.mfxutil import Struct
+
+
+class MockGame:
+    GAME_VERSION = 1
+
+    def __init__(self, id, number, moves):
+        self.id = id
+        self.number = number
+        self.gstats = Struct(start_time=1000.0 + number,
+                             total_elapsed_time=60.0)
+        self.stats = Struct(elapsed_time=60.0, total_moves=moves)
+        self.moves = Struct(index=moves)
+
+    def getGameNumber(self, format):
+        return str(self.number)
+
+    def getGameScore(self):
+        return None
+
+    def getGameScoreCasino(self):
+        return None
+
+    def updateTime(self):
+        pass
+
+
+def play(stats, player, games):
+    for i, (gameid, status) in enumerate(games):
+        stats.updateStats(player, MockGame(gameid, i, 100 + i), status)
+
+
+GAMES = [(2, 1), (2, 0), (7, 2), (2, 1), (7, 0)]
+
+
+class StatisticsStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "statistics.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _open(self):
+        stats = Statistics()
+        stats.setStore(StatisticsStore(self.filename))
+        return stats
+
+    def test_same_as_pickle(self):
+        plain = Statistics()
+        play(plain, 'joe', GAMES)
+        play(plain, None, GAMES[:2])
+        stats = self._open()
+        play(stats, 'joe', GAMES)
+        play(stats, None, GAMES[:2])
+        stats.total_balance[2] = 5
+        stats.save()
+        stats.store.close()
+        stats = self._open()
+        for gameid in (2, 7, 'all', 3):
+            # TEST
+            self.assertEqual(stats.getFullStats('joe', gameid),
+                             plain.getFullStats('joe', gameid))
+        # TEST
+        self.assertEqual(stats.getFullStats(None, 2),
+                         plain.getFullStats(None, 2))
+        # TEST
+        self.assertEqual(stats.prev_games.get('joe'), plain.prev_games['joe'])
+        # TEST
+        self.assertEqual(sorted(stats.games_stats, key=str), [None, 'joe'])
+        # TEST
+        self.assertEqual(stats.total_balance, {2: 5})
+
+    def test_reset(self):
+        stats = self._open()
+        play(stats, 'joe', GAMES)
+        stats.resetStats('joe', 2)
+        # TEST
+        self.assertEqual([g[0] for g in stats.prev_games['joe']], [7, 7])
+        # TEST
+        self.assertEqual(len(stats.all_prev_games['joe']), 5)
+        # TEST
+        self.assertEqual(stats.getFullStats('joe', 2), (0, 0, 0, 0))
+        stats.resetStats('joe', 0)
+        # TEST
+        self.assertNotIn('joe', stats.games_stats)
+        # TEST
+        self.assertEqual(stats.prev_games.get('joe'), [])
+
+    def test_import(self):
+        old = Statistics()
+        play(old, 'joe', GAMES)
+        old.resetStats('joe', 7)
+        play(old, 'joe', GAMES[:1])
+        store = StatisticsStore(self.filename)
+        # TEST
+        self.assertFalse(store.isImported())
+        store.importStatistics(old)
+        stats = Statistics()
+        stats.setStore(store)
+        # TEST
+        self.assertTrue(store.isImported())
+        # TEST
+        self.assertEqual(stats.prev_games['joe'], old.prev_games['joe'])
+        # TEST
+        self.assertEqual(stats.all_prev_games['joe'],
+                         old.all_prev_games['joe'])
+        # TEST
+        self.assertEqual(stats.getFullStats('joe', 2),
+                         old.getFullStats('joe', 2))
+
+    def test_sorted_index(self):
+        games = (2, 3, 7)
+        for stats in (Statistics(), self._open()):
+            play(stats, 'joe', GAMES)
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('joe', 'played', games),
+                             [2, 7, 3])
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('joe', 'lost', games),
+                             [7, 2, 3])
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('mary', 'won', games),
+                             [7, 3, 2])
+            play(stats, 'mary', [(3, 1)])
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('mary', 'won', games),
+                             [3, 7, 2])
+            play(stats, 'joe', [(3, 1), (3, 1), (3, 1)])
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('joe', 'played', games),
+                             [3, 2, 7])
+            # TEST
+            self.assertEqual(stats.getFullStats('joe', 'all'),
+                             stats.getIndex('joe').getFullStats('all'))
+            stats.resetStats('joe', 3)
+            # TEST
+            self.assertEqual(stats.getGamesIdSorted('joe', 'played', games),
+                             [2, 7, 3])
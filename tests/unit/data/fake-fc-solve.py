@@ -0,0 +1,27 @@
+# Released under the MIT Expat License.
+#
+# A slow fc-solve for the solver tests:
+#
+#     python3 fake-fc-solve.py DELAY COUNT [fc-solve options]
+#
+# prints COUNT --iter-output records, one every DELAY seconds, and then
+# a solution of two moves.
+
+import sys
+import time
+
+delay = float(sys.argv[1])
+count = int(sys.argv[2])
+sys.stdin.read()
+for i in range(1, count + 1):
+    print("Iteration: %d" % (i * 100))
+    print("Depth: %d" % i)
+    print("Stored-States: %d" % (i * 50))
+    sys.stdout.flush()
+    time.sleep(delay)
+print("-=-=-=-=-=-=-=-=-=-=-=-")
+print("Move a card from stack 3 to the foundations")
+print("Move 2 cards from stack 0 to stack 1")
+print("This game is solveable.")
+print("Total number of states checked is %d." % (count * 100))
+print("This scan generated %d states." % (count * 50))